@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark the blocked correlation engine used by MultiCorrFilter against
+# ``pd.DataFrame.corr`` on wide frames.
+#
+# Usage: python benchmarks/bench_correlation.py [n_jobs]
+
+from __future__ import print_function, division
+
+from time import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+from skoot.feature_selection._corr import correlation_matrix
+
+# (n_samples, n_features, method)
+SHAPES = [
+    (5000, 2000, 'pearson'),
+    (5000, 2000, 'spearman'),
+    (2000, 8000, 'pearson'),
+    (2000, 8000, 'spearman'),
+    (1000, 100, 'kendall'),
+]
+
+
+def bench(n_samples, n_features, method, n_jobs, random_state):
+    X = pd.DataFrame(random_state.randn(n_samples, n_features))
+
+    t0 = time()
+    corr = correlation_matrix(X.values, method=method, n_jobs=n_jobs)
+    engine = time() - t0
+
+    t0 = time()
+    expected = X.corr(method=method).values
+    pandas = time() - t0
+
+    assert np.allclose(corr, expected)
+    print("%-9s %6i x %-6i  engine %8.2fs  pandas %8.2fs  (%5.1fx)"
+          % (method, n_samples, n_features, engine, pandas, pandas / engine))
+
+
+if __name__ == '__main__':
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    rs = np.random.RandomState(42)
+    for shape in SHAPES:
+        bench(*shape, n_jobs=n_jobs, random_state=rs)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark LinearCombinationFilter.fit on matrices with many nested linear
+# combinations against the cost of a single QR factorization, and against
+# re-factoring the matrix from scratch after every round of deletions.
+#
+# Usage: python benchmarks/bench_linear_combos.py
+
+from __future__ import print_function, division
+
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from skoot.decomposition import QRDecomposition
+from skoot.feature_selection import LinearCombinationFilter
+from skoot.feature_selection.combos import _enum_lc
+
+# (n_samples, n_independent, n_combos)
+SHAPES = [
+    (100000, 20, 20),
+    (100000, 50, 50),
+    (500000, 20, 40),
+]
+
+
+def make_nested(n_samples, n_independent, n_combos, random_state):
+    """Each combination is built from the columns before it, including
+    other combinations, and they're interleaved with the independent
+    columns."""
+    columns = [random_state.rand(n_samples) for _ in range(n_independent)]
+    for i in range(n_combos):
+        a, b = random_state.choice(len(columns), 2, replace=False)
+        position = random_state.randint(1, len(columns) + 1)
+        columns.insert(position, columns[a] - 2 * columns[b])
+    return pd.DataFrame.from_records(np.column_stack(columns))
+
+
+def refactor_fit(x):
+    """Drop dependent columns, re-factoring the whole matrix each round"""
+    n_rounds = 0
+    lc_list = _enum_lc(QRDecomposition(x))
+    while lc_list is not None:
+        bad = sorted(set(v[0] for v in lc_list.values()))
+        x = np.delete(x, bad, axis=1)
+        lc_list = _enum_lc(QRDecomposition(x))
+        n_rounds += 1
+    return n_rounds
+
+
+def bench(n_samples, n_independent, n_combos, random_state):
+    X = make_nested(n_samples, n_independent, n_combos, random_state)
+    x = X.values
+
+    t0 = time()
+    QRDecomposition(x)
+    single = time() - t0
+
+    t0 = time()
+    n_rounds = refactor_fit(x)
+    refactor = time() - t0
+
+    t0 = time()
+    lcf = LinearCombinationFilter().fit(X)
+    fit = time() - t0
+    assert len(lcf.drop_) == n_combos
+
+    print("%7i x %3i (%2i combos): one QR %6.3fs  re-factoring (%i rounds) "
+          "%6.3fs  fit %6.3fs (%.2fx one QR)"
+          % (n_samples, X.shape[1], n_combos, single, n_rounds, refactor,
+             fit, fit / single))
+
+
+if __name__ == '__main__':
+    rs = np.random.RandomState(42)
+    for shape in SHAPES:
+        bench(*shape, random_state=rs)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark NearZeroVarianceFilter.fit on frames of discrete and continuous
+# columns against counting every column with a sorted pd.Series.value_counts.
+#
+# Usage: python benchmarks/bench_near_zero_variance.py
+
+from __future__ import print_function, division
+
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from skoot.feature_selection import NearZeroVarianceFilter
+
+N_SAMPLES = 1000000
+N_FEATURES = 10
+
+# name -> function of (random_state, shape) that makes the columns
+COLUMNS = [
+    ("ints in [0, 20)", lambda rs, shape: rs.randint(20, size=shape)),
+    ("discrete floats (rounded)",
+     lambda rs, shape: np.round(rs.randn(*shape), 1)),
+    ("discrete floats (0/1)",
+     lambda rs, shape: (rs.rand(*shape) < 0.3).astype(np.double)),
+    ("continuous floats", lambda rs, shape: rs.randn(*shape)),
+    ("strings",
+     lambda rs, shape: rs.choice(list("abcde"), size=shape).astype(object)),
+]
+
+
+def value_counts_fit(X):
+    """Count every column with a sorted value_counts"""
+    for c in X.columns:
+        X[c].value_counts()
+
+
+def bench(name, make, random_state):
+    X = pd.DataFrame(make(random_state, (N_SAMPLES, N_FEATURES)))
+
+    t0 = time()
+    value_counts_fit(X)
+    reference = time() - t0
+
+    t0 = time()
+    NearZeroVarianceFilter().fit(X)
+    fit = time() - t0
+
+    print("%-26s value_counts %6.3fs  fit %6.3fs (%.2fx)"
+          % (name, reference, fit, fit / reference))
+
+
+if __name__ == '__main__':
+    rs = np.random.RandomState(42)
+    for name, make in COLUMNS:
+        bench(name, make, random_state=rs)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark the LINPACK and LAPACK QR decomposition backends across
+# matrix shapes.
+#
+# Usage: python benchmarks/bench_qr_backends.py
+
+from __future__ import print_function, division
+
+from time import time
+
+import numpy as np
+
+from skoot.decomposition._dqrutl import _QR_BACKENDS
+
+SHAPES = [
+    (1000, 10),
+    (10000, 50),
+    (100000, 50),
+    (100000, 200),
+    (1000000, 20),
+    (2000, 2000)
+]
+
+
+def bench(X, backend, n_iter=3):
+    # time only the factorization (each backend factors in place, so give
+    # it a fresh Fortran-ordered copy each time)
+    factor = _QR_BACKENDS[backend]
+    times = []
+    for _ in range(n_iter):
+        x = np.asfortranarray(X).copy(order='F')
+        t0 = time()
+        factor(x, 1)
+        times.append(time() - t0)
+    return min(times)
+
+
+if __name__ == '__main__':
+    rs = np.random.RandomState(42)
+
+    print("%-18s %12s %12s %9s" % ("shape", "linpack", "lapack", "speedup"))
+    for shape in SHAPES:
+        X = rs.rand(*shape)
+        linpack = bench(X, 'linpack')
+        lapack = bench(X, 'lapack')
+        print("%-18s %11.3fs %11.3fs %8.1fx"
+              % (shape, linpack, lapack, linpack / lapack))
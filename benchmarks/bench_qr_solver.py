@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark repeated least-squares solves against a single design matrix:
+# QRDecomposition.get_coef vs. a reusable QRSolver.
+#
+# Usage: python benchmarks/bench_qr_solver.py
+
+from __future__ import print_function, division
+
+from time import time
+
+import numpy as np
+
+from skoot.decomposition import QRDecomposition
+
+# (n_samples, n_features, n_targets)
+SHAPES = [
+    (10000, 10, 1000),
+    (10000, 50, 1000),
+    (100000, 20, 200),
+]
+
+# the number of repeated solves (i.e., bootstrap iterations)
+N_REPEATS = 5
+
+
+def bench(n_samples, n_features, n_targets, random_state):
+    X = random_state.rand(n_samples, n_features)
+    Y = random_state.rand(n_samples, n_targets)
+    decomp = QRDecomposition(X)
+
+    t0 = time()
+    for _ in range(N_REPEATS):
+        decomp.get_coef(Y)
+    get_coef = time() - t0
+
+    t0 = time()
+    solver = decomp.get_solver()
+    out = np.empty((decomp.rank, n_targets), order='F')
+    for _ in range(N_REPEATS):
+        solver.solve(Y, out=out)
+    solve = time() - t0
+
+    print("%7i x %3i, %5i targets: get_coef %7.3fs  solver %7.3fs  (%.1fx)"
+          % (n_samples, n_features, n_targets, get_coef, solve,
+             get_coef / solve))
+
+
+if __name__ == '__main__':
+    rs = np.random.RandomState(42)
+    print("%i repeated solves" % N_REPEATS)
+    for shape in SHAPES:
+        bench(*shape, random_state=rs)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark SelectivePCA's solvers and dtypes on wide and tall frames.
+# The baseline is the float64 'full' SVD, which is what sklearn's 'auto'
+# policy falls back to whenever n_components is not much smaller than the
+# number of features (or is a float or None).
+#
+# Usage: python benchmarks/bench_selective_pca.py
+
+from __future__ import print_function, division
+
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from skoot.decomposition import SelectivePCA
+
+# (name, n_samples, n_features, n_components)
+FRAMES = [
+    ('wide', 2000, 4000, 50),
+    ('wide', 5000, 2000, 100),
+    ('tall', 500000, 50, 10),
+    ('tall', 100000, 300, 20),
+]
+
+CONFIGS = [
+    ('full/float64', dict(svd_solver='full')),
+    ('auto/float64', dict()),
+    ('randomized/float32', dict(svd_solver='randomized', dtype=np.float32)),
+    ('auto/float32', dict(dtype=np.float32)),
+]
+
+
+def bench(name, n_samples, n_features, n_components, random_state):
+    # low-rank signal plus noise
+    X = random_state.randn(n_samples, n_components).dot(
+        random_state.randn(n_components, n_features))
+    X += random_state.randn(n_samples, n_features) * 0.1
+    X = pd.DataFrame.from_records(X)
+
+    baseline = None
+    for label, kwargs in CONFIGS:
+        pca = SelectivePCA(n_components=n_components, random_state=42,
+                           **kwargs)
+        t0 = time()
+        pca.fit(X)
+        elapsed = time() - t0
+        baseline = baseline or elapsed
+
+        print("%-5s %7i x %5i (k=%3i)  %-20s %-16s %8.3fs  (%.1fx)"
+              % (name, n_samples, n_features, n_components, label,
+                 pca.svd_solver_, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    rs = np.random.RandomState(42)
+    for frame in FRAMES:
+        bench(*frame, random_state=rs)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Benchmark the throughput of the skewness transformers' vectorized
+# inverse_transform against a per-element inverse on large outputs.
+#
+# Usage: python benchmarks/bench_skewness_inverse.py [n_rows]
+
+from __future__ import print_function, division
+
+from time import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+from skoot.preprocessing import BoxCoxTransformer, YeoJohnsonTransformer
+
+N_FEATURES = 4
+
+# the per-element inverse is far too slow to run on the whole output, so
+# it's timed on a sample and extrapolated
+N_NAIVE = 100000
+
+
+def _naive_bc_inverse(t, lam):
+    if lam > 1e-16:
+        return (t * lam + 1.) ** (1. / lam)
+    return np.exp(t)
+
+
+def _naive_yj_inverse(t, lam):
+    if t >= 0:
+        if lam > 1e-16:
+            return (t * lam + 1.) ** (1. / lam) - 1.
+        return np.expm1(t)
+    if lam != 2.:
+        return 1. - (1. - t * (2. - lam)) ** (1. / (2. - lam))
+    return 1. - np.exp(-t)
+
+
+def bench(est, naive, n_rows, random_state, positive):
+    X = random_state.randn(n_rows, N_FEATURES)
+    if positive:  # box-cox can only handle positive values
+        X = np.abs(X) + 0.1
+    X = pd.DataFrame.from_records(X)
+
+    # fit on a sample, since we only care about the inverse here
+    trans = est.fit(X.iloc[:10000])
+    X_trans = trans.transform(X)
+
+    t0 = time()
+    trans.inverse_transform(X_trans)
+    vectorized = time() - t0
+
+    sample = X_trans.values[:N_NAIVE]
+    t0 = time()
+    for j, lam in enumerate(trans.lambda_):
+        [naive(t, lam) for t in sample[:, j]]
+    per_element = (time() - t0) * n_rows / sample.shape[0]
+
+    name = est.__class__.__name__
+    if est.chunksize:
+        name += '(chunksize=%i)' % est.chunksize
+    print("%-42s %8.3fs  %12.0f rows/s  (per-element est. %8.1fs)"
+          % (name, vectorized, n_rows / vectorized, per_element))
+
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    rs = np.random.RandomState(42)
+
+    print("inverse_transform on %i rows x %i features" % (n_rows, N_FEATURES))
+    for chunksize in (None, 1000000):
+        bench(BoxCoxTransformer(chunksize=chunksize),
+              _naive_bc_inverse, n_rows, rs, positive=True)
+        bench(YeoJohnsonTransformer(chunksize=chunksize),
+              _naive_yj_inverse, n_rows, rs, positive=False)
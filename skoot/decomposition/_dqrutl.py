@@ -5,7 +5,9 @@
 from __future__ import print_function, division, absolute_import
 
 import numpy as np
+import warnings
 
+from scipy.linalg import lapack
 from sklearn.utils import check_array
 from numpy.linalg import matrix_rank
 
@@ -20,9 +22,22 @@ __all__ = [
 ]
 
 
+# the bundled LINPACK routines (and scipy's LAPACK) use 32-bit integers, and
+# can't address matrices with more elements than this
+_MAX_FORTRAN_ELEMENTS = 2147483647
+
+
+def _exceeds_fortran_size(n, p):
+    """Whether an (n x p) matrix is too large for the Fortran routines"""
+    return n * p > _MAX_FORTRAN_ELEMENTS
+
+
 def _validate_matrix_size(n, p):
-    if n * p > 2147483647:
-        raise ValueError('too many elements for Fortran LINPACK routine')
+    if _exceeds_fortran_size(n, p):
+        raise ValueError("too many elements for Fortran LINPACK routine "
+                         "(%i > %i). Use backend='tsqr' to factor larger "
+                         "matrices in chunks."
+                         % (n * p, _MAX_FORTRAN_ELEMENTS))
 
 
 def _safecall(fun, *args, **kwargs):
@@ -32,12 +47,212 @@ def _safecall(fun, *args, **kwargs):
     fun(*args, **kwargs)
 
 
-def qr_decomposition(X, job=1):
+def _linpack_qr(X, job):
+    """Factor ``X`` in place with the LINPACK ``dqrdc`` subroutine.
+
+    Every column is flagged as an "initial" column in the pivot array, so
+    when ``job`` is 1, ``dqrdc`` moves them all to the front in their
+    original order (i.e., the column order is preserved).
+    """
+    n, p = X.shape
+
+    qraux, pivot, work = (np.zeros(p, dtype=np.double, order='F'),
+                          # can't use arange, because need fortran
+                          # order ('order' not kw in arange)
+                          np.array([i for i in range(1, p + 1)],
+                                   dtype=np.int, order='F'),
+                          np.zeros(p, dtype=np.double, order='F'))
+
+    # sanity checks
+    assert qraux.shape[0] == p, 'expected qraux to be of length %i' % p
+    assert pivot.shape[0] == p, 'expected pivot to be of length %i' % p
+    assert work.shape[0] == p, 'expected work to be of length %i' % p
+
+    # call the fortran module IN PLACE
+    _safecall(dqrsl.dqrdc, X, n, n, p, qraux, pivot, work, job)
+
+    # subtract one because pivot started at 1 for the fortran
+    return X, qraux, pivot - 1
+
+
+def _lapack_qr(X, job):
+    """Factor ``X`` in place with the blocked LAPACK ``dgeqrf`` routine.
+
+    LAPACK uses level-3 BLAS for the bulk of the factorization, which is
+    much faster than LINPACK for large matrices. The result is translated
+    into LINPACK's storage scheme so it's interchangeable with the output
+    of ``_linpack_qr``: the Householder vectors are normalized to a unit
+    leading element in LAPACK, but scaled by their leading element (which
+    is equal to ``tau``, and stored in ``qraux``) in LINPACK.
+
+    Since the pivot array passed to ``dqrdc`` preserves the column order,
+    so does this (i.e., ``dgeqp3`` is not used, since it would freely
+    permute the columns).
+    """
+    p = X.shape[1]
+
+    # query the optimal workspace size for the blocked algorithm
+    X = np.asarray(X, dtype=np.double, order='F')
+    work = lapack.dgeqrf(X, lwork=-1, overwrite_a=True)[2]
+    lwork = int(work[0])
+
+    qr, tau, _, info = lapack.dgeqrf(X, lwork=lwork, overwrite_a=True)
+    if info < 0:
+        raise ValueError('illegal value in %i-th argument of internal '
+                         'dgeqrf' % -info)
+
+    # translate into the LINPACK storage scheme
+    qraux = np.zeros(p, dtype=np.double, order='F')
+    qraux[:tau.shape[0]] = tau
+    for j, t in enumerate(tau):
+        qr[j + 1:, j] *= t
+
+    return qr, qraux, np.arange(p)
+
+
+# the available QR factorization routines
+_QR_BACKENDS = {
+    'lapack': _lapack_qr,
+    'linpack': _linpack_qr
+}
+
+
+def _diag_rank(qr, norms, tol):
+    """Find the linearly dependent columns of a factored matrix.
+
+    Following R's ``qr``, a column is considered linearly dependent on
+    the columns preceding it if the magnitude of its diagonal element in
+    R (i.e., the norm of what remains of the column once those columns
+    are projected out) is less than ``tol`` times its original norm.
+    Columns that fall beyond the diagonal of a wide matrix cannot be
+    judged, and are never flagged.
+
+    Returns
+    -------
+    rank : int
+        The number of columns on the diagonal that are not dependent.
+
+    order : np.ndarray, shape=(n_features,)
+        A stable permutation that moves the dependent columns to the end.
+    """
+    k = min(qr.shape)
+    dependent = np.zeros(norms.shape[0], dtype=bool)
+    dependent[:k] = np.abs(np.diag(qr)) <= tol * norms[:k]
+    order = np.concatenate([np.flatnonzero(~dependent),
+                            np.flatnonzero(dependent)])
+    return k - int(dependent.sum()), order
+
+
+def _r_factor(X):
+    """Compute the R factor of a (small) matrix with LAPACK's dgeqrf.
+
+    ``X`` is copied into Fortran order, so it may be a read-only slice of
+    a memory map. Only the upper triangle is returned (without any of the
+    Householder vectors stored below the diagonal).
+    """
+    X = check_array(X, dtype=np.double, order='F', copy=True)
+    qr, _, _, info = lapack.dgeqrf(X, overwrite_a=True)
+    if info < 0:
+        raise ValueError('illegal value in %i-th argument of internal '
+                         'dgeqrf' % -info)
+    return np.triu(qr[:min(qr.shape)])
+
+
+def _pivot_R(R, tol=1e-7):
+    """Find the rank of a matrix, and pivot its dependent columns to the end,
+    given only its (upper-triangular) R factor.
+
+    The columns of R have the same norms as the columns of the matrix, and
+    the R factor of the pivoted matrix is the R factor of the pivoted R, so
+    this never touches the matrix itself. See ``qr_decomposition`` for the
+    pivoting strategy.
+
+    Returns
+    -------
+    R : np.ndarray
+        The R factor of the pivoted matrix.
+
+    rank : int
+        The rank of the matrix.
+
+    pivot : np.ndarray, shape=(n_features,)
+        The pivots, relative to the columns of the input R.
+    """
+    p = R.shape[1]
+    norms = np.sqrt(np.einsum('ij,ij->j', R, R))
+    pivot = np.arange(p)
+    rank, order = _diag_rank(R, norms, tol)
+
+    for _ in range(p):
+        if np.array_equal(order, np.arange(p)):
+            break
+        pivot, norms = pivot[order], norms[order]
+        R = _r_factor(R[:, order])
+        rank, order = _diag_rank(R, norms, tol)
+
+    return R, rank, pivot
+
+
+def _qr_delete_columns(R, positions):
+    """Delete columns from an upper-triangular R factor.
+
+    Removing a column from R leaves the columns after it in upper Hessenberg
+    form, which is restored to upper-triangular form with one Givens
+    rotation per sub-diagonal element. The result is the R factor of the
+    matrix without those columns (up to the signs of its rows), for
+    O(p^2) work per deleted column rather than the O(n p^2) of a new
+    factorization.
+
+    Parameters
+    ----------
+    R : np.ndarray, shape=(k, n_features)
+        The upper-triangular R factor. It's not modified.
+
+    positions : array-like
+        The positions (in R) of the columns to delete.
+
+    Returns
+    -------
+    R : np.ndarray, shape=(min(k, n_features - len(positions)), ...)
+        The upper-triangular R factor without the deleted columns.
+    """
+    R = np.array(R, dtype=np.double)
+
+    # delete from the right, so the remaining positions are unaffected
+    for j in sorted(set(positions), reverse=True):
+        R = np.delete(R, j, axis=1)
+        m, p = R.shape
+        for i in range(j, min(m - 1, p)):
+            a, b = R[i, i], R[i + 1, i]
+            if b == 0.:
+                continue
+            r = np.hypot(a, b)
+            c, s = a / r, b / r
+            upper, lower = R[i, i:].copy(), R[i + 1, i:]
+            R[i, i:] = c * upper + s * lower
+            R[i + 1, i:] = c * lower - s * upper
+            R[i + 1, i] = 0.
+
+        # a tall R loses its last (now zero) row along with the column
+        R = R[:min(m, p)]
+
+    return R
+
+
+def qr_decomposition(X, job=1, backend='linpack', tol=1e-7,
+                     verify_rank=False):
     """Perform the QR decomposition on a matrix.
 
     Performs the QR decomposition using LINPACK, BLAS and LAPACK
     Fortran subroutines.
 
+    The rank is determined from the magnitude of the diagonal of R, the
+    same way R's ``qr`` does it, so no separate SVD is required. When
+    pivoting, the linearly dependent columns are moved to the end (see
+    ``pivot``), so that the first ``rank`` columns of R correspond to
+    linearly independent columns. This is a limited form of pivoting: the
+    independent columns are never reordered among themselves.
+
     Parameters
     ----------
     X : array-like, shape (n_samples, n_features)
@@ -47,6 +262,23 @@ def qr_decomposition(X, job=1):
         Whether to perform pivoting. 0 is False, any other value
         will be coerced to 1 (True).
 
+    backend : str or unicode, optional (default='linpack')
+        The routine used to factor the matrix. One of ('linpack', 'lapack').
+        'linpack' uses the bundled (unblocked) ``dqrdc`` subroutine, and
+        'lapack' uses the blocked ``dgeqrf`` routine from scipy's LAPACK,
+        which is much faster for large matrices. Both return the same
+        factorization, in the same storage scheme.
+
+    tol : float, optional (default=1e-7)
+        The tolerance for detecting linear dependencies in the columns of
+        ``X``. A column is considered dependent on the columns before it if
+        its diagonal element in R is no larger than ``tol`` times its norm.
+        The default matches R's ``qr``.
+
+    verify_rank : bool, optional (default=False)
+        Whether to verify the rank against the (much more expensive)
+        SVD-based ``numpy.linalg.matrix_rank``, warning if they disagree.
+
     Returns
     -------
     X : np.ndarray, shape=(n_samples, n_features)
@@ -62,40 +294,56 @@ def qr_decomposition(X, job=1):
     pivot : np.ndarray, shape=(n_features,)
         The pivot array, or None if not ``job``
     """
+    try:
+        factor = _QR_BACKENDS[backend]
+    except KeyError:
+        raise ValueError("backend must be one of %r, but got %r"
+                         % (sorted(_QR_BACKENDS), backend))
 
+    X_in = X
     X = check_array(X, dtype='numeric', order='F',
                     copy=True)  # type: np.ndarray
     n, p = X.shape
 
     # check on size
     _validate_matrix_size(n, p)
-    rank = matrix_rank(X)
+    svd_rank = matrix_rank(X) if verify_rank else None
 
     # validate job:
     job_ = 0 if not job else 1
 
-    qraux, pivot, work = (np.zeros(p, dtype=np.double, order='F'),
-                          # can't use arange, because need fortran
-                          # order ('order' not kw in arange)
-                          np.array([i for i in range(1, p + 1)],
-                                   dtype=np.int, order='F'),
-                          np.zeros(p, dtype=np.double, order='F'))
+    # the original column norms, to judge the diagonal of R against
+    norms = np.sqrt(np.einsum('ij,ij->j', X, X))
+    pivot = np.arange(p)
 
-    # sanity checks
-    assert qraux.shape[0] == p, 'expected qraux to be of length %i' % p
-    assert pivot.shape[0] == p, 'expected pivot to be of length %i' % p
-    assert work.shape[0] == p, 'expected work to be of length %i' % p
+    # factor the matrix IN PLACE
+    X, qraux, _ = factor(X, job_)
+    rank, order = _diag_rank(X, norms, tol)
 
-    # call the fortran module IN PLACE
-    _safecall(dqrsl.dqrdc, X, n, n, p, qraux, pivot, work, job_)
+    # if pivoting, move any dependent columns to the end and re-factor. This
+    # only happens when a dependent column precedes an independent one (or
+    # hides one from the diagonal of a wide matrix), and each pass moves at
+    # least one column to the end (the pass limit only guards against
+    # borderline columns flip-flopping around the tolerance)
+    for _ in range(p if job_ else 0):
+        if np.array_equal(order, np.arange(p)):
+            break
+        pivot, norms = pivot[order], norms[order]
+        X = check_array(X_in, dtype='numeric', order='F')
+        X = np.asfortranarray(X[:, pivot])
+        X, qraux, _ = factor(X, job_)
+        rank, order = _diag_rank(X, norms, tol)
+
+    if verify_rank and rank != svd_rank:
+        warnings.warn("The rank determined from the diagonal of R (%i) "
+                      "differs from the SVD-based rank (%i). Consider "
+                      "adjusting 'tol'." % (rank, svd_rank), UserWarning)
 
     # do returns
     return (X,
             rank,
             qraux,
-
-            # subtract one because pivot started at 1 for the fortran
-            (pivot - 1) if job_ else None)
+            pivot if job_ else None)
 
 
 def _qr_R(qr):
@@ -104,6 +352,31 @@ def _qr_R(qr):
     return qr[:min_dim + 1, :]
 
 
+def _thin_Q(qr, qraux, k):
+    """Form the first ``k`` columns of the orthogonal factor explicitly.
+
+    The LINPACK Householder vectors are translated into LAPACK's storage
+    scheme (the inverse of the translation in ``_lapack_qr``) and expanded
+    with ``dorgqr``. Returns a new (n x k) array, so ``qr`` is untouched.
+    Where LINPACK skipped a transformation (``qraux`` is 0), so does LAPACK
+    (``tau`` is 0).
+    """
+    V = np.array(qr[:, :k], dtype=np.double, order='F')
+    tau = np.array(qraux[:k], dtype=np.double)
+    for j, t in enumerate(tau):
+        if t != 0.:
+            V[j + 1:, j] /= t
+        else:
+            V[j + 1:, j] = 0.
+
+    work = lapack.dorgqr(V, tau, lwork=-1)[1]
+    Q, _, info = lapack.dorgqr(V, tau, lwork=int(work[0]), overwrite_a=1)
+    if info < 0:
+        raise ValueError('illegal value in %i-th argument of internal '
+                         'dorgqr' % -info)
+    return Q
+
+
 def _call_dqrcf(qr, n, k, qraux, X, ny, coef):
     """Call the dqrcf Fortran subroutine"""
     _safecall(dqrsl.dqrcf, qr, n, k, qraux, X, ny, coef, 0)
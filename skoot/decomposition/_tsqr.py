@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Tall-skinny QR (TSQR): factor a tall matrix one block of rows at a time,
+# without ever holding the whole matrix (or a copy of it) in memory.
+
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import warnings
+
+from numpy.linalg import matrix_rank
+from scipy.linalg import solve_triangular
+from sklearn.externals.joblib import Parallel, delayed
+from sklearn.utils import check_array
+
+from ..utils._parallel import _PROCESS_MIN_COLS
+from ._dqrutl import _diag_rank, _pivot_R, _r_factor
+
+__all__ = [
+    'tsqr_coef',
+    'tsqr_decomposition'
+]
+
+# the default number of elements in each block of rows (32MB of doubles)
+_TSQR_BLOCK_ELEMENTS = 2 ** 22
+
+
+def _block_size(chunksize, p):
+    """Get the number of rows in each block of a p-column matrix"""
+    if chunksize is None:
+        return max(2 * p, _TSQR_BLOCK_ELEMENTS // max(p, 1))
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer, but got %r"
+                         % chunksize)
+    return int(chunksize)
+
+
+def _choose_tsqr_backend(X, n_jobs, chunksize):
+    """Choose the joblib backend for factoring the blocks of X.
+
+    The choice depends on the whole problem rather than on the shape of a
+    block. Factoring a block is a single LAPACK call that releases the GIL,
+    so threads scale without copying anything. Worker processes only pay
+    off when ``X`` is a memory map, since joblib passes slices of a memory
+    map by reference and each worker reads its own blocks from disk, and
+    when there are enough blocks to amortize starting them. Blocks of an
+    in-memory array or of an iterable would be copied to each process.
+    """
+    if n_jobs == 1 or not isinstance(X, np.memmap):
+        return 'threading'
+    n_blocks = -(-X.shape[0] // chunksize)  # ceil
+    if n_blocks < _PROCESS_MIN_COLS:
+        return 'threading'
+    return 'multiprocessing'
+
+
+def _iter_blocks(X, chunksize):
+    """Iterate over blocks of rows in ``X``.
+
+    ``X`` may be anything with a shape that can be sliced by row (i.e., an
+    array, memory map or frame), or an iterable of such blocks, in which
+    case the blocks are yielded as-is.
+    """
+    if hasattr(X, 'iloc'):
+        X = X.values
+    if not hasattr(X, 'shape'):
+        for block in X:
+            yield block
+        return
+
+    n = X.shape[0]
+    for start in range(0, n, chunksize):
+        yield X[start:start + chunksize]
+
+
+def _reduce_R(Rs):
+    """Reduce a list of stacked R factors to a single R in a binary tree.
+
+    A tree keeps every intermediate factorization small, and the rounding
+    error growing with the depth of the tree (log2 of the number of blocks)
+    rather than the number of blocks.
+    """
+    while len(Rs) > 1:
+        Rs = [_r_factor(np.vstack(Rs[i:i + 2]))
+              if i + 1 < len(Rs) else Rs[i]
+              for i in range(0, len(Rs), 2)]
+    return Rs[0]
+
+
+def tsqr_decomposition(X, job=1, tol=1e-7, verify_rank=False,
+                       chunksize=None, n_jobs=1):
+    """Compute R, the rank and the pivots of a tall matrix with TSQR.
+
+    Blocks of rows are factored independently (optionally in parallel), and
+    their R factors are reduced in a binary tree to the R factor of the
+    full matrix. Only one block of rows is held in memory per job, so ``X``
+    can be a memory map much larger than the available memory, or an
+    iterable of row blocks read from disk. Since the orthogonal factor is
+    never formed, there is no ``qraux``.
+
+    The rank and pivots are determined from the diagonal of R in the same
+    way as in ``qr_decomposition``. Pivoting only requires re-factoring R
+    (the R factor of ``X[:, pivot]`` is the R factor of ``R[:, pivot]``),
+    so ``X`` is only ever read once.
+
+    Parameters
+    ----------
+    X : array-like or iterable, shape (n_samples, n_features)
+        The matrix to decompose. Either an array-like that can be sliced by
+        row (i.e., a ``np.memmap``), or an iterable of row blocks.
+
+    job : int, optional (default=1)
+        Whether to perform pivoting. 0 is False, any other value
+        will be coerced to 1 (True).
+
+    tol : float, optional (default=1e-7)
+        The tolerance for detecting linear dependencies in the columns of
+        ``X`` (see ``qr_decomposition``).
+
+    verify_rank : bool, optional (default=False)
+        Whether to verify the rank against the SVD-based rank, warning if
+        they disagree. R has the same singular values as ``X``, so this
+        only requires the SVD of R.
+
+    chunksize : int or None, optional (default=None)
+        The number of rows in each block. If None, blocks are sized to
+        contain roughly 4M elements. Ignored if ``X`` is an iterable of
+        blocks.
+
+    n_jobs : int, optional (default=1)
+        The number of jobs used to factor the blocks. Blocks of a
+        ``np.memmap`` are factored in worker processes (each of which reads
+        its own blocks from disk) if there are enough of them; otherwise,
+        they are factored in threads.
+
+    Returns
+    -------
+    R : np.ndarray, shape=(min(n_samples, n_features), n_features)
+        The upper-triangular R factor of ``X[:, pivot]``
+
+    rank : int
+        The rank of the matrix
+
+    qraux : None
+        Always None, since the orthogonal factor is not formed.
+
+    pivot : np.ndarray, shape=(n_features,)
+        The pivot array, or None if not ``job``
+    """
+    p = X.shape[1] if hasattr(X, 'shape') else None
+    chunksize = _block_size(chunksize, p or 1)
+
+    backend = _choose_tsqr_backend(X, n_jobs, chunksize)
+    Rs = Parallel(n_jobs=n_jobs, backend=backend)(
+        delayed(_r_factor)(block) for block in _iter_blocks(X, chunksize))
+    if not Rs:
+        raise ValueError("Found array with 0 sample(s) while a minimum of "
+                         "1 is required.")
+    R = _reduce_R(Rs)
+
+    job_ = 0 if not job else 1
+    if job_:
+        R, rank, pivot = _pivot_R(R, tol)
+    else:
+        norms = np.sqrt(np.einsum('ij,ij->j', R, R))
+        rank, pivot = _diag_rank(R, norms, tol)[0], None
+
+    if verify_rank:
+        svd_rank = matrix_rank(R)
+        if rank != svd_rank:
+            warnings.warn("The rank determined from the diagonal of R (%i) "
+                          "differs from the SVD-based rank (%i). Consider "
+                          "adjusting 'tol'." % (rank, svd_rank), UserWarning)
+
+    return R, rank, None, pivot
+
+
+def tsqr_coef(X, R, rank, pivot, Y, chunksize=None):
+    """Solve the least-squares problem for ``Y`` given the TSQR of ``X``.
+
+    Without the orthogonal factor, the coefficients are found with the
+    corrected semi-normal equations (i.e., ``R'R b = X'Y``, followed by one
+    step of iterative refinement), which streams over ``X`` and ``Y``
+    twice, one block of rows at a time.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, n_features)
+        The decomposed matrix. Must be sliceable by row.
+
+    R : np.ndarray, shape=(n_features, n_features)
+        The R factor of ``X[:, pivot]``
+
+    rank : int
+        The rank of ``X``
+
+    pivot : np.ndarray or None, shape=(n_features,)
+        The pivots of the decomposition.
+
+    Y : array-like, shape (n_samples, n_targets)
+        The targets. Must be sliceable by row.
+
+    chunksize : int or None, optional (default=None)
+        The number of rows in each block.
+
+    Returns
+    -------
+    coef : np.ndarray, shape=(rank, n_targets)
+        The coefficients of the first ``rank`` pivoted columns.
+    """
+    if not hasattr(X, 'shape'):
+        raise ValueError("Coefficients cannot be computed from a TSQR "
+                         "decomposition of an iterable, since it cannot be "
+                         "re-read.")
+    if hasattr(X, 'iloc'):
+        X = X.values
+    if hasattr(Y, 'iloc'):
+        Y = Y.values
+    elif not hasattr(Y, 'shape'):
+        Y = np.asarray(Y)
+    if Y.ndim != 2:
+        raise ValueError("Expected 2D array, got %iD array instead"
+                         % Y.ndim)
+    if Y.shape[0] != X.shape[0]:
+        raise ValueError('qr and X must have same number of rows')
+
+    k = rank
+    p = X.shape[1]
+    cols = np.arange(p) if pivot is None else pivot
+    cols = cols[:k]
+    Rk = R[:k, :k]
+    chunksize = _block_size(chunksize, p)
+
+    def solve(XtY):
+        return solve_triangular(
+            Rk, solve_triangular(Rk, XtY, trans='T'))
+
+    def cross(coef):
+        # X[:, cols]' (Y - X[:, cols] coef), one block at a time
+        XtY = np.zeros((k, Y.shape[1]), dtype=np.double)
+        for Xb, Yb in zip(_iter_blocks(X, chunksize),
+                          _iter_blocks(Y, chunksize)):
+            Xb = check_array(Xb, dtype=np.double)[:, cols]
+            Yb = check_array(Yb, dtype=np.double)
+            if coef is not None:
+                Yb = Yb - Xb.dot(coef)
+            XtY += Xb.T.dot(Yb)
+        return XtY
+
+    coef = solve(cross(None))
+    return coef + solve(cross(coef))
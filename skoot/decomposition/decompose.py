@@ -8,24 +8,30 @@ from abc import ABCMeta, abstractmethod
 
 import numpy as np
 from numpy.linalg import matrix_rank
+from scipy import linalg, sparse
+from scipy.linalg import solve_triangular
 import pandas as pd
 
-from sklearn.decomposition import PCA, TruncatedSVD
+from sklearn.decomposition import PCA, IncrementalPCA, TruncatedSVD
+from sklearn.utils.extmath import fast_logdet, stable_cumsum, svd_flip
 from sklearn.utils.validation import check_is_fitted, check_array
 from sklearn.externals import six
 
 from ..base import BasePDTransformer
 from ..decorators import overrides
+from ..utils.iterables import is_iterable
 from ..utils.validation import check_dataframe, validate_test_set_columns
 
 # local submodule funcs that use Fortran subroutines
 from ._dqrutl import (qr_decomposition, _call_dqrcf,
-                      _validate_matrix_size, _qr_R)
+                      _validate_matrix_size, _qr_R, _thin_Q)
+from ._tsqr import tsqr_decomposition, tsqr_coef
 
 __all__ = [
     'SelectivePCA',
     'SelectiveTruncatedSVD',
-    'QRDecomposition'
+    'QRDecomposition',
+    'QRSolver'
 ]
 
 
@@ -39,6 +45,61 @@ class _BaseSelectiveDecomposer(six.with_metaclass(ABCMeta, BasePDTransformer)):
         self.component_prefix = component_prefix
         self.n_components = n_components
 
+    def _set_component_names(self, n_components):
+        """Cache the names of the output components at fit time"""
+        prefix = self.component_prefix
+        self.component_names_ = ['%s%i' % (prefix, i + 1)
+                                 for i in range(n_components)]
+
+    def _assemble_output(self, X, other_nms, transform):
+        """Assemble the output of ``transform``.
+
+        The passthrough columns (``other_nms``) are placed on the left, in
+        their order in ``X``, and the components on the right. When all of
+        the columns share a dtype (or ``as_df`` is False), the output is a
+        single preallocated array that every column is copied into exactly
+        once (and is wrapped in a frame without a further copy). Otherwise,
+        the passthrough columns are copied into their own frame, and joined
+        to the components without another copy. Either way, the index of
+        ``X`` is preserved.
+        """
+        names = self.component_names_
+
+        # the column diff from check_dataframe is unordered
+        other_set = set(other_nms)
+        other_nms = [c for c in X.columns if c in other_set]
+        n_other = len(other_nms)
+        dtypes = [X[c].dtype for c in other_nms]
+
+        # older versions of Pandas report the dtype of a sparse column as
+        # its subtype, so sparse columns are checked for explicitly
+        if self.as_df and (
+                any(d != transform.dtype for d in dtypes) or
+                any(_is_sparse_column(X[c].values) for c in other_nms)):
+            right = pd.DataFrame(transform, index=X.index, columns=names,
+                                 copy=False)
+            return pd.concat([X[other_nms], right], axis=1, copy=False)
+
+        try:
+            # sparse passthrough columns are densified into the array
+            dtype = np.result_type(transform.dtype,
+                                   *[getattr(d, 'subtype', d)
+                                     for d in dtypes])
+        except TypeError:  # i.e., a categorical passthrough column
+            dtype = object
+
+        out = np.empty((X.shape[0], n_other + len(names)), dtype=dtype)
+        for j, c in enumerate(other_nms):
+            values = X[c].values
+            out[:, j] = values.to_dense() if _is_sparse_column(values) \
+                else values
+        out[:, n_other:] = transform
+
+        if not self.as_df:
+            return out
+        return pd.DataFrame(out, index=X.index, columns=other_nms + names,
+                            copy=False)
+
     def get_decomposition(self):
         """Get the decomposition from a fitted instance.
 
@@ -63,6 +124,102 @@ class _BaseSelectiveDecomposer(six.with_metaclass(ABCMeta, BasePDTransformer)):
         """
 
 
+# the covariance matrix is only formed for inputs this narrow...
+_COV_EIGH_MAX_FEATURES = 1000
+
+# ...and at least this many times taller than they are wide
+_COV_EIGH_MIN_ASPECT = 10
+
+
+def _choose_pca_solver(svd_solver, n_samples, n_features, n_components):
+    """Resolve the 'auto' svd_solver for SelectivePCA.
+
+    Tall, narrow inputs are decomposed via the eigendecomposition of their
+    (small) covariance matrix, which costs one pass over the data plus an
+    O(n_features^3) eigendecomposition, rather than a full SVD of the data.
+    Anything else is deferred to sklearn's own 'auto' policy, which uses the
+    randomized SVD when far fewer components than features are requested.
+    """
+    if svd_solver != 'auto':
+        return svd_solver
+    if n_components != 'mle' and \
+            n_features <= _COV_EIGH_MAX_FEATURES and \
+            n_samples >= _COV_EIGH_MIN_ASPECT * n_features:
+        return 'covariance_eigh'
+    return 'auto'
+
+
+def _fit_covariance_eigh(pca, X):
+    """Fit a PCA instance from the eigendecomposition of the covariance of
+    ``X``, setting the same attributes as ``PCA.fit``.
+    """
+    n_samples, n_features = X.shape
+    n_components = pca.n_components
+    max_components = min(n_samples, n_features)
+
+    if n_components == 'mle':
+        raise ValueError("n_components='mle' is not supported by the "
+                         "'covariance_eigh' solver")
+
+    mean = X.mean(axis=0)
+    X = X - mean
+    cov = X.T.dot(X) / (n_samples - 1)
+
+    # eigh returns the eigenvalues in ascending order
+    variance, components = linalg.eigh(cov)
+    variance = np.maximum(variance[::-1], 0.)[:max_components]
+    components = components[:, ::-1].T[:max_components]
+
+    ratio = variance / variance.sum()
+    if n_components is None:
+        n_components = max_components
+    elif 0 < n_components < 1:
+        n_components = \
+            stable_cumsum(ratio).searchsorted(n_components, side='right') + 1
+    elif not 1 <= n_components <= max_components:
+        raise ValueError("n_components=%r must be between 0 and "
+                         "min(n_samples, n_features)=%r"
+                         % (n_components, max_components))
+    n_components = int(n_components)
+
+    # flip the signs the same way PCA.fit does (based on the scores, which
+    # is X times the components), so the solvers are interchangeable
+    components = components[:n_components]
+    _, components = svd_flip(X.dot(components.T), components)
+
+    pca.mean_ = mean
+    pca.n_samples_ = n_samples
+    pca.n_components_ = n_components
+    pca.components_ = components
+    pca.explained_variance_ = variance[:n_components]
+    pca.explained_variance_ratio_ = ratio[:n_components]
+    pca.singular_values_ = np.sqrt(variance[:n_components] *
+                                   (n_samples - 1))
+    pca.noise_variance_ = (variance[n_components:].mean()
+                           if n_components < max_components else 0.)
+
+    # the name of this attribute differs across sklearn versions
+    pca.n_features_in_ = n_features
+    try:
+        pca.n_features_ = n_features
+    except AttributeError:  # it's a read-only property
+        pass
+    return pca
+
+
+def _row_batches(n_samples, batch_size, min_batch_size=0):
+    """Get slices of ``batch_size`` rows, merging a short last batch.
+
+    As in ``IncrementalPCA.fit``, a last batch of fewer than
+    ``min_batch_size`` rows is merged into the one before it.
+    """
+    starts = list(range(0, n_samples, batch_size))
+    if len(starts) > 1 and n_samples - starts[-1] < min_batch_size:
+        starts.pop()
+    stops = starts[1:] + [n_samples]
+    return [slice(start, stop) for start, stop in zip(starts, stops)]
+
+
 class SelectivePCA(_BaseSelectiveDecomposer):
     """Apply PCA only to a select group of columns.
 
@@ -126,6 +283,42 @@ class SelectivePCA(_BaseSelectiveDecomposer):
         and add one (so as not to down sample or upsample everything), then
         multiply the weights across the transformed features.
 
+    incremental : bool, optional (default=False)
+        Whether to fit a ``sklearn.decomposition.IncrementalPCA`` rather than
+        a ``PCA``. The incremental PCA is fit in batches of ``batch_size``
+        rows, which are extracted from the frame one at a time, so its memory
+        footprint (beyond the frame itself) is bounded by the batch. Note
+        that ``n_components`` must be an int or None in this case.
+        Regardless of this parameter, ``partial_fit`` always fits an
+        incremental PCA.
+
+    batch_size : int or None, optional (default=None)
+        The number of rows in each batch if ``incremental`` is True. If None,
+        ``5 * n_features`` rows are used.
+
+    svd_solver : str or unicode, optional (default='auto')
+        The solver used to fit the (non-incremental) PCA. One of
+        ('auto', 'full', 'arpack', 'randomized', 'covariance_eigh').
+        'covariance_eigh' computes the components from the eigendecomposition
+        of the covariance matrix, which is much faster than an SVD for tall,
+        narrow inputs, and is chosen by 'auto' when
+        ``n_samples >= 10 * n_features`` and ``n_features <= 1000``.
+        Otherwise, 'auto' defers to sklearn's policy, which uses the
+        randomized SVD when ``n_components`` is far smaller than the input.
+        The other solvers are passed directly to ``sklearn.decomposition.PCA``.
+
+    iterated_power : int or 'auto', optional (default='auto')
+        The number of power iterations for the 'randomized' solver.
+
+    random_state : int, RandomState instance or None, optional (default=None)
+        The seed or random state for the 'arpack' and 'randomized' solvers.
+
+    dtype : type or None, optional (default=None)
+        The floating point type in which to fit and transform the data. Use
+        ``np.float32`` to halve the memory footprint (and roughly double the
+        throughput) of the decomposition on large frames. If None, float32
+        inputs are kept as float32, and anything else is cast to float64.
+
     Examples
     --------
     An example decomposition:
@@ -140,16 +333,27 @@ class SelectivePCA(_BaseSelectiveDecomposer):
 
     Attributes
     ----------
-    pca_ : PCA
-        The fitted ``sklearn.decomposition.PCA`` instance.
+    pca_ : PCA or IncrementalPCA
+        The fitted ``sklearn.decomposition.PCA`` instance, or the fitted
+        ``sklearn.decomposition.IncrementalPCA`` if ``incremental`` is True
+        or the transformer was fit with ``partial_fit``.
 
     fit_cols_ : list
         The list of column names on which the transformer was fit. This
         is used to validate the presence of the features in the test set
         during the ``transform`` stage.
+
+    svd_solver_ : str or unicode
+        The solver actually used to fit ``pca_`` (i.e., after resolving
+        'auto'), or 'incremental' for an ``IncrementalPCA``.
+
+    component_names_ : list
+        The names of the output components (i.e., 'PC1', 'PC2', ...).
     """
     def __init__(self, cols=None, n_components=None, whiten=False,
-                 component_prefix='PC', do_weight=False, as_df=True):
+                 component_prefix='PC', do_weight=False, as_df=True,
+                 incremental=False, batch_size=None, svd_solver='auto',
+                 iterated_power='auto', random_state=None, dtype=None):
 
         super(SelectivePCA, self).__init__(
             component_prefix=component_prefix,
@@ -158,6 +362,24 @@ class SelectivePCA(_BaseSelectiveDecomposer):
 
         self.whiten = whiten
         self.do_weight = do_weight
+        self.incremental = incremental
+        self.batch_size = batch_size
+        self.svd_solver = svd_solver
+        self.iterated_power = iterated_power
+        self.random_state = random_state
+        self.dtype = dtype
+
+    def _as_array(self, X):
+        """Get the (numeric) block to decompose in the requested dtype"""
+        dtype = self.dtype
+        if dtype is None:
+            dtype = [np.float64, np.float32]
+        return check_array(X, dtype=dtype)
+
+    def _incremental_pca(self):
+        return IncrementalPCA(n_components=self.n_components,
+                              whiten=self.whiten,
+                              batch_size=self.batch_size)
 
     def fit(self, X, y=None):
         """Fit the transformer.
@@ -177,17 +399,80 @@ class SelectivePCA(_BaseSelectiveDecomposer):
             Pass-through for ``sklearn.pipeline.Pipeline``. Even
             if explicitly set, will not change behavior of ``fit``.
         """
-        # check on state of X and cols
+        # check on state of X and cols (X isn't modified, so don't copy it)
+        X, cols = check_dataframe(X, self.cols, copy=False)
+
+        # fit in batches, only ever holding one batch of the columns
+        if self.incremental:
+            self.svd_solver_ = 'incremental'
+            pca = self._incremental_pca()
+            batch_size = self.batch_size
+            if batch_size is None:
+                batch_size = 5 * len(cols)
+            for rows in _row_batches(X.shape[0], batch_size,
+                                     self.n_components or 0):
+                pca.partial_fit(self._as_array(X.iloc[rows][cols]))
+            self.pca_ = pca
+
+        else:
+            # fails thru if names don't exist:
+            block = self._as_array(X[cols])
+            solver = _choose_pca_solver(self.svd_solver, block.shape[0],
+                                        block.shape[1], self.n_components)
+            self.svd_solver_ = solver
+            pca = PCA(n_components=self.n_components, whiten=self.whiten,
+                      svd_solver=solver if solver != 'covariance_eigh'
+                      else 'full',
+                      iterated_power=self.iterated_power,
+                      random_state=self.random_state)
+
+            if solver == 'covariance_eigh':
+                self.pca_ = _fit_covariance_eigh(pca, block)
+            else:
+                self.pca_ = pca.fit(block)
+
+        # the columns we fit on, and the names of the components
+        self.fit_cols_ = cols
+        self._set_component_names(self.pca_.n_components_)
+
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the transformer on a chunk of data.
+
+        This method will fit a ``sklearn.decomposition.IncrementalPCA`` on
+        the chunk, for the ``cols`` passed in the constructor, updating the
+        components fit on previous chunks. This allows the PCA to be fit on
+        tables that are too large to be loaded at once (i.e., by iterating
+        over ``pd.read_csv(..., chunksize=...)``). If the transformer was
+        previously fit with a (non-incremental) ``PCA``, it is replaced.
+
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. Each chunk must contain at least
+            ``n_components`` rows. If the transformer has already been
+            fit, it must contain the ``fit_cols_``.
+
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
         X, cols = check_dataframe(X, self.cols)
 
-        # fails thru if names don't exist:
-        self.pca_ = PCA(n_components=self.n_components,
-                        whiten=self.whiten)\
-            .fit(X[cols])
+        # if this is the first chunk, start a new incremental PCA
+        pca = getattr(self, 'pca_', None)
+        if not isinstance(pca, IncrementalPCA):
+            pca = self._incremental_pca()
+            self.fit_cols_ = cols
+            self.svd_solver_ = 'incremental'
 
-        # the columns we fit on
-        self.fit_cols_ = cols
+        # otherwise update the one fit on the same columns
+        else:
+            cols = self.fit_cols_
+            validate_test_set_columns(cols, X.columns.tolist())
 
+        self.pca_ = pca.partial_fit(self._as_array(X[cols]))
+        self._set_component_names(self.pca_.n_components_)
         return self
 
     def transform(self, X):
@@ -211,9 +496,9 @@ class SelectivePCA(_BaseSelectiveDecomposer):
         """
         check_is_fitted(self, 'pca_')
 
-        # check on state of X and cols
+        # check on state of X and cols (X isn't modified, so don't copy it)
         X, _, other_nms = check_dataframe(X, cols=self.cols,
-                                          column_diff=True)
+                                          column_diff=True, copy=False)
 
         # validate that the test set columns exist in the fit columns
         cols = self.fit_cols_
@@ -221,7 +506,7 @@ class SelectivePCA(_BaseSelectiveDecomposer):
 
         # get the transformation
         pca = self.pca_  # type: PCA
-        transform = pca.transform(X[cols])
+        transform = pca.transform(self._as_array(X[cols]))
 
         # do weighting if necessary
         if self.do_weight:
@@ -233,14 +518,7 @@ class SelectivePCA(_BaseSelectiveDecomposer):
             transform *= weights
 
         # stack the transformed variables onto the RIGHT side
-        right = pd.DataFrame.from_records(
-            data=transform,
-            columns=[('%s%i' % (self.component_prefix, i + 1))
-                     for i in range(transform.shape[1])])
-
-        # concat if needed
-        x = pd.concat([X[other_nms], right], axis=1) if other_nms else right
-        return x if self.as_df else x.values
+        return self._assemble_output(X, other_nms, transform)
 
     @overrides(_BaseSelectiveDecomposer)
     def _decomposition_name(self):
@@ -276,7 +554,128 @@ class SelectivePCA(_BaseSelectiveDecomposer):
 
         X, cols = check_dataframe(X, self.cols)
         pca = self.pca_  # type: PCA
-        return pca.score(X[cols], y)
+        if hasattr(pca, 'score'):
+            return pca.score(self._as_array(X[cols]), y)
+
+        # the IncrementalPCA has no score method, but it has the same
+        # probabilistic model (see PCA.score_samples)
+        Xr = self._as_array(X[cols]) - pca.mean_
+        n_features = Xr.shape[1]
+        precision = pca.get_precision()
+        log_like = -.5 * (Xr * np.dot(Xr, precision)).sum(axis=1)
+        log_like -= .5 * (n_features * np.log(2. * np.pi) -
+                          fast_logdet(precision))
+        return np.mean(log_like)
+
+
+def _is_sparse_column(values):
+    """Whether the values of a column are a pandas sparse array"""
+    return hasattr(values, 'sp_index')
+
+
+def _spmatrix_to_frame(X, columns):
+    """Create a frame of sparse columns from a scipy sparse matrix.
+
+    Older versions of Pandas (< 0.25) have no ``DataFrame.sparse``
+    accessor, so the frame is built from one ``SparseArray`` per column,
+    densifying only a single column at a time.
+    """
+    accessor = getattr(pd.DataFrame, 'sparse', None)
+    if accessor is not None:
+        return accessor.from_spmatrix(X, columns=columns)
+
+    X = sparse.csc_matrix(X)
+    return pd.DataFrame(
+        dict((c, pd.SparseArray(X[:, j].toarray().ravel(), fill_value=0))
+             for j, c in enumerate(columns)),
+        columns=columns)
+
+
+def _frame_to_csr(X, cols):
+    """Convert the ``cols`` of a frame to a CSR matrix.
+
+    Sparse columns contribute only their stored values, so they are never
+    densified. Sparse columns whose fill value is not zero (and any dense
+    columns) contribute their non-zero values.
+    """
+    n_samples = X.shape[0]
+    rows, indices, data = [], [], []
+    for j, c in enumerate(cols):
+        values = X[c].values
+        if _is_sparse_column(values) and values.fill_value == 0:
+            idx = values.sp_index.to_int_index().indices
+            vals = values.sp_values
+        else:
+            values = np.asarray(values, dtype=np.double)
+            idx = np.flatnonzero(values)
+            vals = values[idx]
+        rows.append(idx)
+        indices.append(np.full(idx.shape[0], j, dtype=idx.dtype))
+        data.append(vals)
+
+    return sparse.coo_matrix(
+        (np.concatenate(data).astype(np.double),
+         (np.concatenate(rows), np.concatenate(indices))),
+        shape=(n_samples, len(cols))).tocsr()
+
+
+def _sparse_columns(X, cols, feature_names):
+    """Resolve column names against the columns of a scipy sparse matrix.
+
+    Parameters
+    ----------
+    X : scipy.sparse matrix, shape=(n_samples, n_features)
+        The sparse matrix.
+
+    cols : list, iterable or None
+        The names of the columns to select. If None, all columns are
+        selected.
+
+    feature_names : array-like or None, shape=(n_features,)
+        The names of the columns of ``X``. If None, the columns are named
+        by their position (as in a frame built from an array).
+
+    Returns
+    -------
+    cols : list
+        The names of the selected columns.
+
+    col_idcs : list
+        The positions of the selected columns in ``X``.
+
+    other_nms : list
+        The names of the columns that are not selected.
+
+    other_idcs : list
+        The positions of the columns that are not selected in ``X``.
+    """
+    n_features = X.shape[1]
+    names = list(range(n_features)) if feature_names is None \
+        else list(feature_names)
+    if len(names) != n_features:
+        raise ValueError("feature_names has %i names, but X has %i columns"
+                         % (len(names), n_features))
+
+    position = {nm: i for i, nm in enumerate(names)}
+    if cols is None:
+        cols = names
+    else:
+        cols = list(cols) if is_iterable(cols) else [cols]
+        if any(c not in position for c in cols):
+            raise ValueError("All columns in `cols` must be present in X. "
+                             "X columns=%r" % names)
+
+    colset = set(cols)
+    other_nms = [nm for nm in names if nm not in colset]
+    return (cols, [position[c] for c in cols],
+            other_nms, [position[c] for c in other_nms])
+
+
+def _take_columns(X, idcs):
+    """Select columns from a CSR matrix, avoiding a copy for all of them"""
+    if idcs == list(range(X.shape[1])):
+        return X
+    return X[:, idcs]
 
 
 class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
@@ -287,6 +686,12 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
     to decompose. TruncatedSVD is the equivalent of Latent Semantic Analysis;
     it returns the "concept space" of the decomposed features.
 
+    Sparse input is never densified. ``X`` may be a frame with pandas
+    sparse columns, or a scipy sparse matrix whose columns are named by
+    ``feature_names``. In either case, the columns to decompose are passed
+    to the ``TruncatedSVD`` as a CSR matrix, and any passthrough columns
+    remain sparse in the output.
+
     Parameters
     ----------
     cols : array-like, shape=(n_features,), optional (default=None)
@@ -321,7 +726,13 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
         method. If False, will return a Numpy ``ndarray`` instead. 
         Since most skoot transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True
-        by default.
+        by default. If ``X`` is a scipy sparse matrix with passthrough
+        columns, a scipy CSR matrix is returned instead of an ``ndarray``.
+
+    feature_names : array-like or None, optional (default=None)
+        The names of the columns of a scipy sparse ``X``, against which
+        ``cols`` are resolved. If None, the columns of a sparse matrix are
+        named by their position. Ignored if ``X`` is a ``DataFrame``.
 
     Examples
     --------
@@ -344,10 +755,14 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
         The list of column names on which the transformer was fit. This
         is used to validate the presence of the features in the test set
         during the ``transform`` stage.
+
+    component_names_ : list
+        The names of the output components (i.e., 'Concept1', ...).
     """
 
     def __init__(self, cols=None, n_components=2, algorithm='randomized',
-                 n_iter=5, component_prefix='Concept', as_df=True):
+                 n_iter=5, component_prefix='Concept', as_df=True,
+                 feature_names=None):
 
         super(SelectiveTruncatedSVD, self).__init__(
             cols=cols, n_components=n_components,
@@ -356,6 +771,17 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
 
         self.algorithm = algorithm
         self.n_iter = n_iter
+        self.feature_names = feature_names
+
+    def _sparse_block(self, X, cols):
+        """Get the CSR block of ``cols`` from a frame with sparse columns.
+
+        Returns None if none of the ``cols`` are sparse, in which case the
+        frame can be decomposed as-is.
+        """
+        if any(_is_sparse_column(X[c].values) for c in cols):
+            return _frame_to_csr(X, cols)
+        return None
 
     def fit(self, X, y=None):
         """Fit the transformer.
@@ -366,8 +792,8 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
 
         Parameters
         ----------
-        X : pd.DataFrame, shape=(n_samples, n_features)
-            The Pandas frame to fit. The frame will only
+        X : pd.DataFrame or scipy.sparse matrix, shape=(n_samples, n_features)
+            The Pandas frame (or sparse matrix) to fit. The frame will only
             be fit on the prescribed ``cols`` (see ``__init__``) or
             all of them if ``cols`` is None. Furthermore, ``X`` will
             not be altered in the process of the fit.
@@ -376,17 +802,27 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
             Pass-through for ``sklearn.pipeline.Pipeline``. Even
             if explicitly set, will not change behavior of ``fit``.
         """
-        # check on state of X and cols
-        X, cols = check_dataframe(X, cols=self.cols)
+        # check on state of X and cols. Sparse input is kept sparse, and
+        # since X isn't modified, it isn't copied
+        if sparse.issparse(X):
+            cols, col_idcs, _, _ = _sparse_columns(X, self.cols,
+                                                   self.feature_names)
+            block = _take_columns(X.tocsr(), col_idcs)
+        else:
+            X, cols = check_dataframe(X, cols=self.cols, copy=False)
+            block = self._sparse_block(X, cols)
+            if block is None:
+                block = X[cols]
 
         # fails thru if names don't exist:
         self.svd_ = TruncatedSVD(n_components=self.n_components,
                                  algorithm=self.algorithm,
                                  n_iter=self.n_iter)\
-            .fit(X[cols])
+            .fit(block)
 
-        # the columns we fit on
+        # the columns we fit on, and the names of the components
         self.fit_cols_ = cols
+        self._set_component_names(self.svd_.components_.shape[0])
 
         return self
 
@@ -398,9 +834,9 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
 
         Parameters
         ----------
-        X : pd.DataFrame, shape=(n_samples, n_features)
-            The Pandas frame to transform. The operation will
-            be applied to a copy of the input data, and the result
+        X : pd.DataFrame or scipy.sparse matrix, shape=(n_samples, n_features)
+            The Pandas frame (or sparse matrix) to transform. The operation
+            will be applied to a copy of the input data, and the result
             will be returned.
 
         Returns
@@ -410,27 +846,49 @@ class SelectiveTruncatedSVD(_BaseSelectiveDecomposer):
             and the result set is returned.
         """
         check_is_fitted(self, 'svd_')
+        svd = self.svd_  # type: TruncatedSVD
+        cols = self.fit_cols_
+
+        if sparse.issparse(X):
+            X = X.tocsr()
+            cols, col_idcs, other_nms, other_idcs = _sparse_columns(
+                X, cols, self.feature_names)
+            transform = svd.transform(_take_columns(X, col_idcs))
+            return self._assemble_sparse_output(
+                X[:, other_idcs] if other_idcs else None,
+                other_nms, transform)
 
-        # check on state of X and cols
+        # check on state of X and cols (X isn't modified, so don't copy it)
         X, _, other_nms = check_dataframe(X, cols=self.cols,
-                                          column_diff=True)
+                                          column_diff=True, copy=False)
 
         # validate that the test set columns exist in the fit columns
-        cols = self.fit_cols_
         validate_test_set_columns(cols, X.columns.tolist())
 
-        svd = self.svd_  # type: TruncatedSVD
-        transform = svd.transform(X[cols])
+        block = self._sparse_block(X, cols)
+        transform = svd.transform(X[cols] if block is None else block)
 
-        # make into a dataframe we'll append to the RIGHT side
-        right = pd.DataFrame.from_records(
-            data=transform,
-            columns=[('%s%i' % (self.component_prefix, i + 1))
-                     for i in range(transform.shape[1])])
+        # stack the transformed variables onto the RIGHT side
+        return self._assemble_output(X, other_nms, transform)
+
+    def _assemble_sparse_output(self, X_other, other_nms, transform):
+        """Assemble the output of ``transform`` for a scipy sparse ``X``.
 
-        # concat if needed
-        x = pd.concat([X[other_nms], right], axis=1) if other_nms else right
-        return x if self.as_df else x.values
+        The passthrough columns (``X_other``) remain sparse: either as
+        sparse columns in the output frame, or as the left-hand block of a
+        CSR matrix if ``as_df`` is False.
+        """
+        if not self.as_df:
+            if X_other is None:
+                return transform
+            return sparse.hstack([X_other, transform], format='csr')
+
+        right = pd.DataFrame(transform, columns=self.component_names_,
+                             copy=False)
+        if X_other is None:
+            return right
+        left = _spmatrix_to_frame(X_other, other_nms)
+        return pd.concat([left, right], axis=1, copy=False)
 
     @overrides(_BaseSelectiveDecomposer)
     def _decomposition_name(self):
@@ -453,11 +911,44 @@ class QRDecomposition(object):
     X : array-like, shape (n_samples, n_features)
         The matrix to decompose. Unlike many other classes in skoot,
         this one does not require a Pandas frame, and can be applied
-        directly to numpy arrays.
+        directly to numpy arrays. If ``backend`` is 'tsqr', this may also
+        be a ``np.memmap`` or an iterable of row blocks.
 
     pivot : bool, optional (default=True)
         Whether to perform pivoting. Default is True.
 
+    backend : str or unicode, optional (default='linpack')
+        The routine used to factor the matrix. One of ('linpack', 'lapack',
+        'tsqr'). 'linpack' uses the bundled (unblocked) ``dqrdc``
+        subroutine, and 'lapack' uses the blocked ``dgeqrf`` routine from
+        scipy's LAPACK, which is much faster for large matrices. Both
+        produce the same factorization. 'tsqr' computes a tall-skinny QR
+        out-of-core, factoring ``chunksize`` rows at a time and never
+        copying ``X``. It only computes R (``qr`` is R, and ``qraux`` is
+        None), and ``get_coef`` must re-read ``X``, so it is unavailable
+        if ``X`` is an iterable of blocks.
+
+    tol : float, optional (default=1e-7)
+        The tolerance for detecting linear dependencies in the columns of
+        ``X``. As in R's ``qr``, a column is considered dependent on the
+        columns before it if its diagonal element in R is no larger than
+        ``tol`` times its norm. When pivoting, dependent columns are moved
+        to the end of the decomposition.
+
+    verify_rank : bool, optional (default=False)
+        Whether to verify the rank derived from the diagonal of R against
+        the (much more expensive) SVD-based rank, warning if they differ.
+
+    chunksize : int or None, optional (default=None)
+        The number of rows factored at a time if ``backend`` is 'tsqr'.
+        If None, blocks of roughly 4M elements are used.
+
+    n_jobs : int, optional (default=1)
+        The number of jobs used to factor blocks of rows in parallel if
+        ``backend`` is 'tsqr'. The blocks of a ``np.memmap`` are factored
+        in worker processes, and those of an in-memory array or iterable
+        in threads (the factorizations release the GIL).
+
     Examples
     --------
     The following example applies the QRDecomposition to the Iris dataset:
@@ -480,29 +971,69 @@ class QRDecomposition(object):
     Attributes
     ----------
     qr : array-like, shape (n_samples, n_features)
-        The decomposed matrix
+        The decomposed matrix. If ``backend`` is 'tsqr', this is the R
+        factor, with shape (min(n_samples, n_features), n_features).
 
     qraux : array-like, shape (n_features,)
         Contains further information required to recover
-        the orthogonal part of the decomposition.
+        the orthogonal part of the decomposition. None if ``backend``
+        is 'tsqr'.
 
     pivot : array-like, shape (n_features,)
-        The pivots, if pivot was set to 1, else None
+        The pivots, if pivot was set to 1, else None. The first ``rank``
+        pivots are the linearly independent columns.
 
     rank : int
         The rank of the input matrix
     """
-    def __init__(self, X, pivot=True):
+    def __init__(self, X, pivot=True, backend='linpack', tol=1e-7,
+                 verify_rank=False, chunksize=None, n_jobs=1):
         self.job_ = 0 if not pivot else 1
+        self.backend = backend
+        self.tol = tol
+        self.verify_rank = verify_rank
+        self.chunksize = chunksize
+        self.n_jobs = n_jobs
         self._decompose(X)
 
     def _decompose(self, X):
         """Decomposes the matrix"""
+        if self.backend == 'tsqr':
+            # keep a reference (not a copy) to re-read for coefficients
+            self._X = X
+            self.qr, self.rank, self.qraux, self.pivot = \
+                tsqr_decomposition(X, self.job_, tol=self.tol,
+                                   verify_rank=self.verify_rank,
+                                   chunksize=self.chunksize,
+                                   n_jobs=self.n_jobs)
+            return
+
         # perform the decomposition
         self.qr, self.rank, self.qraux, self.pivot = \
-            qr_decomposition(X, self.job_)
+            qr_decomposition(X, self.job_, backend=self.backend,
+                             tol=self.tol, verify_rank=self.verify_rank)
 
     def get_coef(self, X):
+        """Get the least squares coefficients of X on the decomposed matrix.
+
+        Parameters
+        ----------
+        X : array-like, shape=(n_samples, n_targets)
+            The targets, with as many rows as the decomposed matrix.
+
+        Returns
+        -------
+        coef : np.ndarray, shape=(rank, n_targets)
+            The coefficients of the first ``rank`` pivoted columns, i.e.,
+            row ``i`` is the coefficient of column ``pivot[i]``. If the
+            matrix is rank deficient, the remaining (linearly dependent)
+            columns have no coefficient, which is equivalent to a
+            coefficient of zero.
+        """
+        if self.backend == 'tsqr':
+            return tsqr_coef(self._X, self.qr, self.rank, self.pivot, X,
+                             chunksize=self.chunksize)
+
         qr, qraux = self.qr, self.qraux
         n, p = qr.shape
 
@@ -541,11 +1072,11 @@ class QRDecomposition(object):
         # call the fortran module IN PLACE
         _call_dqrcf(qr, n, k, qraux, X, ny, coef)
 
-        # post-processing
-        # if k < p:
-        #   cf = np.ones((p,ny)) * np.nan
-        #   cf[self.pivot[np.arange(k)], :] = coef
-        return coef if not k < p else coef[self.pivot[np.arange(k)], :]
+        # the rows of coef correspond to the first k pivoted columns (if
+        # k < p, the rest are linearly dependent and have no coefficient).
+        # Note they must not be re-indexed by the pivots: coef has k rows,
+        # while the pivots are column indices in [0, p)
+        return coef
 
     def get_rank(self):
         """Get the rank of the decomposition.
@@ -568,12 +1099,151 @@ class QRDecomposition(object):
         r = _qr_R(self.qr)
         return r
 
+    def get_solver(self, block_size=256):
+        """Get a reusable least-squares solver for this decomposition.
+
+        Prefer this to ``get_coef`` when solving against many targets, or
+        repeatedly (i.e., bootstrapping): see ``QRSolver``.
+
+        Parameters
+        ----------
+        block_size : int, optional (default=256)
+            The number of targets solved per blocked call.
+
+        Returns
+        -------
+        solver : QRSolver
+            The solver
+        """
+        return QRSolver(self, block_size=block_size)
+
     def get_R_rank(self):
         """Get the rank of the R matrix.
 
+        R has the same rank as the input matrix, which was derived from
+        its diagonal during the decomposition, so this requires no extra
+        work unless ``verify_rank`` is True, in which case the SVD-based
+        rank of R is computed.
+
         Returns
         -------
         rank : int
             The rank of the R matrix
         """
-        return matrix_rank(self.get_R())
+        if self.verify_rank:
+            return matrix_rank(np.triu(self.get_R()))
+        return self.rank
+
+
+class QRSolver(object):
+    """Solve many least-squares problems against one QR decomposition.
+
+    ``QRDecomposition.get_coef`` applies the orthogonal factor with the
+    unblocked LINPACK ``dqrsl`` subroutine, one target at a time, and
+    allocates and validates everything on every call. The QRSolver pays
+    those costs once: it forms the first ``rank`` columns of Q explicitly
+    (with LAPACK's ``dorgqr``) and allocates a workspace for ``block_size``
+    targets. Each call to ``solve`` then costs one matrix product (level-3
+    BLAS) and one small triangular solve per block of targets, and can
+    write the coefficients into a caller-provided array.
+
+    Parameters
+    ----------
+    decomposition : QRDecomposition
+        The decomposition of the design matrix.
+
+    block_size : int, optional (default=256)
+        The number of targets solved per blocked call. Larger blocks make
+        better use of BLAS, at the cost of a larger workspace.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from skoot.decomposition import QRDecomposition
+    >>> rs = np.random.RandomState(42)
+    >>> X, Y = rs.rand(100, 3), rs.rand(100, 1000)
+    >>> solver = QRDecomposition(X).get_solver()
+    >>> solver.solve(Y).shape
+    (3, 1000)
+    """
+    def __init__(self, decomposition, block_size=256):
+        if block_size < 1:
+            raise ValueError("block_size must be a positive integer, but "
+                             "got %r" % block_size)
+
+        self.decomposition = decomposition
+        self.block_size = block_size
+
+        qr, k = decomposition.qr, decomposition.rank
+        self.n_rows_ = (decomposition._X.shape[0]
+                        if decomposition.backend == 'tsqr'
+                        else qr.shape[0])
+
+        # the TSQR has no orthogonal factor (coefficients are streamed)
+        if decomposition.backend == 'tsqr' or not k:
+            return
+
+        # Q' is C-contiguous (Q is Fortran-ordered), for fast products
+        self._Qt = _thin_Q(qr, decomposition.qraux, k).T
+        self._R = np.triu(qr[:k, :k])
+        self._workspace = np.empty(k * block_size, dtype=np.double)
+
+    def solve(self, Y, out=None):
+        """Compute the least-squares coefficients for each target.
+
+        Parameters
+        ----------
+        Y : array-like, shape=(n_samples,) or (n_samples, n_targets)
+            The targets.
+
+        out : np.ndarray or None, optional (default=None)
+            An array of doubles with shape (rank, n_targets) (or (rank,)
+            for a 1d ``Y``) into which to write the coefficients. If None,
+            a new array is allocated.
+
+        Returns
+        -------
+        coef : np.ndarray, shape=(rank, n_targets) or (rank,)
+            The coefficients. As in ``QRDecomposition.get_coef``, the rows
+            correspond to the first ``rank`` pivoted columns.
+        """
+        decomp = self.decomposition
+        k = decomp.rank
+
+        if hasattr(Y, 'iloc'):
+            Y = Y.values
+        elif not hasattr(Y, 'shape'):
+            Y = np.asarray(Y)
+        vector = Y.ndim == 1
+        if vector:
+            Y = Y.reshape(-1, 1)
+        if Y.shape[0] != self.n_rows_:
+            raise ValueError('qr and X must have same number of rows')
+
+        shape = (k,) if vector else (k, Y.shape[1])
+        if out is None:
+            out = np.empty(shape, dtype=np.double, order='F')
+        elif out.shape != shape or out.dtype != np.double:
+            raise ValueError("out must be an array of doubles with shape "
+                             "%r, but got %r array with shape %r"
+                             % (shape, out.dtype, out.shape))
+        coef = out.reshape(k, 1) if vector else out
+
+        if decomp.backend == 'tsqr':
+            coef[:] = tsqr_coef(decomp._X, decomp.qr, k, decomp.pivot, Y,
+                                chunksize=decomp.chunksize)
+            return out
+        if not k:
+            return out
+
+        # compute Q'Y a block of targets at a time, in the workspace
+        ny = Y.shape[1]
+        for start in range(0, ny, self.block_size):
+            stop = min(start + self.block_size, ny)
+            qty = self._workspace[:k * (stop - start)].reshape(k, -1)
+            np.dot(self._Qt, np.asarray(Y[:, start:stop], dtype=np.double),
+                   out=qty)
+            coef[:, start:stop] = solve_triangular(
+                self._R, qty, check_finite=False)
+
+        return out
@@ -5,12 +5,16 @@
 from __future__ import print_function, absolute_import, division
 
 import numpy as np
+import pandas as pd
+from scipy import sparse
 from numpy.testing import (assert_array_equal, assert_array_almost_equal)
 
-from sklearn.decomposition import PCA, TruncatedSVD
+from sklearn.decomposition import PCA, IncrementalPCA, TruncatedSVD
 from sklearn.datasets import load_iris
 
 from skoot.decomposition import SelectivePCA, SelectiveTruncatedSVD
+from skoot.decomposition.decompose import (_is_sparse_column,
+                                           _spmatrix_to_frame)
 from skoot.datasets import load_iris_df
 from skoot.testing import assert_raises
 
@@ -56,6 +60,89 @@ def test_selective_pca():
                   transformed)
 
 
+def test_selective_incremental_pca():
+    pca = SelectivePCA().fit(X)
+    expected = pca.transform(X)
+
+    # keeping all of the components, the incremental PCA fit in batches
+    # matches the exact PCA, up to the signs of the components
+    incremental = SelectivePCA(incremental=True, batch_size=50).fit(X)
+    assert isinstance(incremental.get_decomposition(), IncrementalPCA)
+    assert_array_almost_equal(np.abs(expected.values),
+                              np.abs(incremental.transform(X).values))
+
+    # it can be fit on chunks, with the same naming and weighting
+    chunked = SelectivePCA(cols=['a', 'b', 'c'], n_components=3,
+                           component_prefix='Comp', do_weight=True)
+    for start in range(0, X.shape[0], 50):
+        chunked.partial_fit(X.iloc[start:start + 50])
+    transformed = chunked.transform(X)
+    assert transformed.columns.tolist() == ['d', 'Comp1', 'Comp2', 'Comp3']
+
+    weighted = SelectivePCA(cols=['a', 'b', 'c'], n_components=3,
+                            component_prefix='Comp', do_weight=True)\
+        .fit(X).transform(X)
+    assert_array_almost_equal(np.abs(weighted.values),
+                              np.abs(transformed.values))
+
+    # the incremental PCA can be scored, too
+    assert np.isclose(pca.score(X), incremental.score(X))
+
+    # later chunks must contain the fit columns
+    assert_raises(ValueError, chunked.partial_fit, X[['a', 'b']])
+
+    # the batches of the incremental fit are those of IncrementalPCA.fit,
+    # including a short last batch (of 3 rows) merged into the previous one
+    for n_components, batch_size in ((4, 49), (None, 40)):
+        incremental = SelectivePCA(n_components=n_components,
+                                   incremental=True,
+                                   batch_size=batch_size).fit(X)
+        expected = IncrementalPCA(n_components=n_components,
+                                  batch_size=batch_size).fit(X.values)
+        assert_array_almost_equal(incremental.get_decomposition().components_,
+                                  expected.components_)
+
+
+def test_selective_pca_solvers():
+    rs = np.random.RandomState(42)
+    tall = pd.DataFrame.from_records(rs.rand(1000, 10))
+    full = SelectivePCA(n_components=3, svd_solver='full').fit(tall)
+
+    # tall, narrow frames are decomposed via the covariance matrix
+    auto = SelectivePCA(n_components=3).fit(tall)
+    assert auto.svd_solver_ == 'covariance_eigh'
+    assert isinstance(auto.get_decomposition(), PCA)
+    for attr in ('explained_variance_', 'explained_variance_ratio_',
+                 'singular_values_', 'noise_variance_', 'mean_'):
+        assert_array_almost_equal(getattr(full.pca_, attr),
+                                  getattr(auto.pca_, attr))
+    assert_array_almost_equal(full.transform(tall), auto.transform(tall))
+    assert np.isclose(full.score(tall), auto.score(tall))
+
+    # fractional n_components select the same number of components
+    frac = SelectivePCA(n_components=0.5, svd_solver='covariance_eigh')
+    assert frac.fit(tall).pca_.n_components_ == \
+        SelectivePCA(n_components=0.5, svd_solver='full')\
+        .fit(tall).pca_.n_components_
+    assert_raises(ValueError, SelectivePCA(n_components='mle',
+                  svd_solver='covariance_eigh').fit, tall)
+
+    # wide frames defer to sklearn
+    wide = pd.DataFrame.from_records(rs.rand(100, 600))
+    randomized = SelectivePCA(n_components=5, random_state=1).fit(wide)
+    assert randomized.svd_solver_ == 'auto'
+    assert_array_equal(
+        randomized.transform(wide),
+        SelectivePCA(n_components=5, random_state=1).fit_transform(wide))
+
+    # float32 is kept end to end
+    single = SelectivePCA(n_components=3, dtype=np.float32).fit(tall)
+    assert single.pca_.components_.dtype == np.float32
+    transformed = single.transform(tall)
+    assert (transformed.dtypes == np.float32).all()
+    assert_array_almost_equal(full.transform(tall), transformed, decimal=4)
+
+
 # TODO:
 def test_selective_tsvd():
     original = X
@@ -82,3 +169,106 @@ def test_selective_tsvd():
     assert isinstance(transformer.cols, list)
     assert transformer.cols == cols
     assert transformer.cols is not cols
+
+
+def test_selective_output_assembly():
+    # a non-default index should be preserved in the output (rather than
+    # misaligning the passthrough columns with the components)
+    indexed = X.copy()
+    indexed.index = np.arange(indexed.shape[0])[::-1] + 1000
+
+    for est, prefix in ((SelectivePCA(cols=names[:2], n_components=2),
+                         'PC'),
+                        (SelectiveTruncatedSVD(cols=names[:2],
+                                               n_components=1),
+                         'Concept')):
+        trans = est.fit(indexed)
+        n_comp = len(trans.component_names_)
+        assert trans.component_names_ == ['%s%i' % (prefix, i + 1)
+                                          for i in range(n_comp)]
+
+        transformed = trans.transform(indexed)
+        assert not transformed.isnull().any().any()
+        assert_array_equal(transformed.index, indexed.index)
+        assert transformed.columns.tolist() == \
+            names[2:] + trans.component_names_
+        assert_array_equal(transformed[names[2:]].values,
+                           indexed[names[2:]].values)
+
+        # the input is never modified
+        assert_array_equal(indexed.values, X.values)
+
+        # as_df=False skips the frame entirely
+        trans.as_df = False
+        arr = trans.transform(indexed)
+        assert isinstance(arr, np.ndarray)
+        assert_array_almost_equal(arr, transformed.values)
+
+    # passthrough columns of a different dtype are kept as-is
+    mixed = X.copy()
+    mixed['e'] = np.arange(mixed.shape[0])
+    transformed = SelectivePCA(cols=names, n_components=2).fit(mixed)\
+        .transform(mixed)
+    assert transformed['e'].dtype == mixed['e'].dtype
+    assert transformed.columns.tolist() == ['e', 'PC1', 'PC2']
+
+
+def test_selective_tsvd_sparse():
+    rs = np.random.RandomState(42)
+    dense = sparse.random(200, 8, density=0.1, random_state=rs,
+                          format='csr')
+    nms = list('abcdefgh')
+    cols = nms[:6]
+    expected = TruncatedSVD(n_components=3, random_state=1)\
+        .fit(dense[:, :6]).transform(dense[:, :6])
+
+    def _fit_transform(X, **kwargs):
+        # the randomized svd relies on the global random state
+        np.random.seed(1)
+        trans = SelectiveTruncatedSVD(cols=cols, n_components=3,
+                                      **kwargs).fit(X)
+        return trans, trans.transform(X)
+
+    # a scipy CSR matrix, with its column names
+    trans, transformed = _fit_transform(dense, feature_names=nms)
+    assert trans.fit_cols_ == cols
+    assert transformed.columns.tolist() == nms[6:] + trans.component_names_
+    assert all(_is_sparse_column(transformed[c].values) for c in nms[6:])
+    assert_array_equal(
+        np.column_stack([transformed[c].values.to_dense() for c in nms[6:]]),
+        dense[:, 6:].toarray())
+    assert_array_almost_equal(np.abs(transformed[trans.component_names_]),
+                              np.abs(expected))
+
+    # as_df=False keeps the passthrough columns sparse
+    _, arr = _fit_transform(dense, feature_names=nms, as_df=False)
+    assert sparse.isspmatrix_csr(arr)
+    assert_array_almost_equal(np.abs(arr.toarray()),
+                              np.abs(transformed.values))
+
+    # a frame of pandas sparse columns
+    frame = _spmatrix_to_frame(dense, nms)
+    _, from_frame = _fit_transform(frame)
+    assert_array_almost_equal(np.abs(from_frame[trans.component_names_]),
+                              np.abs(expected))
+    assert _is_sparse_column(from_frame['g'].values)
+
+    # bad column names
+    assert_raises(ValueError, SelectiveTruncatedSVD(cols=['z']).fit, dense)
+    assert_raises(ValueError,
+                  SelectiveTruncatedSVD(feature_names=nms[:3]).fit, dense)
+
+
+def test_spmatrix_to_frame():
+    X = sparse.random(20, 3, density=0.3, random_state=0, format='csr')
+    frame = _spmatrix_to_frame(X, ['a', 'b', 'c'])
+    assert frame.columns.tolist() == ['a', 'b', 'c']
+    assert all(_is_sparse_column(frame[c].values) for c in frame.columns)
+    for j, c in enumerate(frame.columns):
+        assert_array_equal(frame[c].values.to_dense(),
+                           X[:, j].toarray().ravel())
+
+    # Pandas >= 0.25 builds the frame with the sparse accessor
+    if hasattr(pd.DataFrame, 'sparse'):
+        assert all(isinstance(dtype, pd.SparseDtype)
+                   for dtype in frame.dtypes)
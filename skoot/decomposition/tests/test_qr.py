@@ -8,9 +8,14 @@ import numpy as np
 from numpy.testing import assert_array_almost_equal
 
 from sklearn.datasets import load_iris
-from skoot.decomposition import QRDecomposition
+from skoot.decomposition import QRDecomposition, _dqrutl
 from skoot.testing import assert_raises
 
+import tempfile
+import shutil
+import pytest
+import os
+
 X = load_iris().data
 
 
@@ -42,3 +47,209 @@ def test_qr():
 
     # ensure dimension error
     assert_raises(ValueError, q.get_coef, X[:140, :])
+
+
+def test_qr_coef_rank_deficient():
+    # two linearly dependent columns, one of them preceding independent ones
+    rs = np.random.RandomState(42)
+    A = rs.randn(50, 4)
+    A = np.column_stack([A[:, 0], A[:, 0] + A[:, 1], A[:, 1:]])
+    A = np.column_stack([A, A[:, 2] - A[:, 3]])
+    Y = rs.randn(50, 2)
+
+    for backend in ('linpack', 'lapack'):
+        q = QRDecomposition(A, backend=backend)
+        k = q.get_rank()
+        assert k == 4
+
+        # the coefficients are those of the first k pivoted columns, i.e.,
+        # the least squares solution on the independent columns
+        coef = q.get_coef(Y)
+        assert coef.shape == (k, 2)
+        independent = q.pivot[:k]
+        expected = np.linalg.lstsq(A[:, independent], Y, rcond=None)[0]
+        assert_array_almost_equal(coef, expected)
+
+        # and give the same fit as the minimum norm solution on all of them
+        full = np.zeros((A.shape[1], 2))
+        full[independent] = coef
+        lstsq = np.linalg.lstsq(A, Y, rcond=None)[0]
+        assert_array_almost_equal(A.dot(full), A.dot(lstsq))
+
+
+def test_qr_lapack_backend():
+    # the blocked LAPACK routine should produce the same factorization
+    linpack = QRDecomposition(X)
+    lapack = QRDecomposition(X, backend='lapack')
+
+    assert_array_almost_equal(linpack.qr, lapack.qr)
+    assert_array_almost_equal(linpack.qraux, lapack.qraux)
+    assert_array_almost_equal(linpack.pivot, lapack.pivot)
+    assert linpack.get_rank() == lapack.get_rank()
+    assert_array_almost_equal(linpack.get_coef(X), lapack.get_coef(X))
+
+    # and for wide matrices
+    assert_array_almost_equal(QRDecomposition(X[:3]).qr,
+                              QRDecomposition(X[:3], backend='lapack').qr)
+
+    # unknown backends fail
+    assert_raises(ValueError, QRDecomposition, X, backend='foo')
+
+
+def test_qr_rank_from_diagonal():
+    # a dependent column ahead of an independent one is pivoted to the end
+    Z = np.column_stack([X[:, 0], X[:, 0] * 2., X[:, 1], X[:, 2]])
+    q = QRDecomposition(Z)
+    assert q.get_rank() == 3
+    assert q.get_R_rank() == 3
+    assert_array_almost_equal(q.pivot, [0, 2, 3, 1])
+
+    # without pivoting the order is kept, but the rank is still found
+    assert QRDecomposition(Z, pivot=False).get_rank() == 3
+
+    # the tolerance is relative to the norm of each column
+    noisy = Z.copy()
+    noisy[:, 1] += np.random.RandomState(42).rand(Z.shape[0]) * 1e-4
+    assert QRDecomposition(noisy).get_rank() == 4
+    assert QRDecomposition(noisy, tol=1e-4).get_rank() == 3
+
+    # the SVD-based verification agrees on a well-conditioned matrix
+    q = QRDecomposition(Z, verify_rank=True)
+    assert q.get_rank() == q.get_R_rank() == 3
+
+
+def test_qr_tsqr_backend():
+    # the R factor is unique up to the signs of its rows
+    dense = QRDecomposition(X)
+    tsqr = QRDecomposition(X, backend='tsqr', chunksize=16)
+    R = np.triu(dense.get_R()[:4])
+    assert_array_almost_equal(np.abs(R), np.abs(tsqr.get_R()))
+    assert tsqr.get_rank() == 4
+    assert tsqr.qraux is None
+    assert_array_almost_equal(dense.get_coef(X), tsqr.get_coef(X))
+
+    # rank and pivots match those of the dense decomposition
+    Z = np.column_stack([X[:, 0], X[:, 0] * 2., X[:, 1], X[:, 2]])
+    tsqr = QRDecomposition(Z, backend='tsqr', chunksize=7)
+    assert tsqr.get_rank() == 3
+    assert_array_almost_equal(tsqr.pivot, QRDecomposition(Z).pivot)
+
+    # an iterable of blocks can be factored, but not re-read for coefs
+    blocks = (X[i:i + 50] for i in range(0, X.shape[0], 50))
+    tsqr = QRDecomposition(blocks, backend='tsqr')
+    assert_array_almost_equal(np.abs(R), np.abs(tsqr.get_R()))
+    assert_raises(ValueError, tsqr.get_coef, X)
+    assert_raises(ValueError, QRDecomposition, X, backend='tsqr',
+                  chunksize=0)
+
+
+def _memmap(shape, fill):
+    """Create a memory-mapped matrix, filled one block of rows at a time"""
+    folder = tempfile.mkdtemp(prefix='skoot_')
+    X_mm = np.memmap(os.path.join(folder, 'X.mmap'), dtype=np.double,
+                     mode='w+', shape=shape)
+    for start in range(0, shape[0], 1000000):
+        fill(X_mm[start:start + 1000000], start)
+    X_mm.flush()
+    return folder, X_mm
+
+
+def _fill(block, start):
+    # column 2 is a linear combination of columns 0 and 1
+    rs = np.random.RandomState(start)
+    block[:] = rs.rand(*block.shape)
+    block[:, 2] = block[:, 0] + block[:, 1]
+
+
+def test_qr_too_large_memmap():
+    folder, X_mm = _memmap((5000, 4), _fill)
+    limit = _dqrutl._MAX_FORTRAN_ELEMENTS
+    try:
+        # pretend the memory map is too large for the Fortran routines
+        _dqrutl._MAX_FORTRAN_ELEMENTS = X_mm.size - 1
+        assert_raises(ValueError, QRDecomposition, X_mm)
+
+        # but it can still be factored in chunks
+        q = QRDecomposition(X_mm, backend='tsqr', chunksize=1000)
+        assert q.get_rank() == 3
+        assert_array_almost_equal(q.pivot, [0, 1, 3, 2])
+    finally:
+        _dqrutl._MAX_FORTRAN_ELEMENTS = limit
+        del X_mm
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_qr_tsqr_parallel():
+    from skoot.decomposition._tsqr import _choose_tsqr_backend
+
+    folder, X_mm = _memmap((5000, 4), _fill)
+    try:
+        # only memory maps with enough blocks are factored in processes
+        assert _choose_tsqr_backend(X_mm, 2, 500) == 'multiprocessing'
+        assert _choose_tsqr_backend(X_mm, 2, 1000) == 'threading'
+        assert _choose_tsqr_backend(X_mm, 1, 500) == 'threading'
+        assert _choose_tsqr_backend(np.array(X_mm), 2, 500) == 'threading'
+
+        expected = QRDecomposition(X_mm, backend='tsqr', chunksize=500)
+        for X_in in (X_mm, np.array(X_mm)):
+            q = QRDecomposition(X_in, backend='tsqr', chunksize=500,
+                                n_jobs=2)
+            assert q.get_rank() == 3
+            assert_array_almost_equal(q.pivot, expected.pivot)
+            assert_array_almost_equal(np.abs(q.get_R()),
+                                      np.abs(expected.get_R()))
+    finally:
+        del X_mm
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+@pytest.mark.skipif(not os.environ.get('SKOOT_STRESS_TESTS'),
+                    reason='set SKOOT_STRESS_TESTS=1 to factor a matrix '
+                           'with more than 2^31 elements (~17GB on disk)')
+def test_qr_over_2_31_elements():
+    shape = (_dqrutl._MAX_FORTRAN_ELEMENTS // 10 + 1, 10)
+    folder, X_mm = _memmap(shape, _fill)
+    try:
+        q = QRDecomposition(X_mm, backend='tsqr')
+        assert q.get_rank() == 9
+        assert q.pivot[-1] == 2
+    finally:
+        del X_mm
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_qr_solver():
+    rs = np.random.RandomState(42)
+    Y = rs.rand(X.shape[0], 600)
+    q = QRDecomposition(X)
+    expected = q.get_coef(Y)
+
+    # the blocked solver matches get_coef, across several blocks
+    solver = q.get_solver(block_size=256)
+    assert_array_almost_equal(expected, solver.solve(Y))
+
+    # it can write into a caller-provided buffer, and solve vectors
+    out = np.empty((4, 600))
+    assert solver.solve(Y, out=out) is out
+    assert_array_almost_equal(expected, out)
+    assert_array_almost_equal(expected[:, 0], solver.solve(Y[:, 0]))
+
+    # and works for the other backends
+    tsqr = QRDecomposition(X, backend='tsqr').get_solver()
+    assert_array_almost_equal(expected, tsqr.solve(Y))
+
+    # bad shapes
+    assert_raises(ValueError, solver.solve, Y[:10])
+    assert_raises(ValueError, solver.solve, Y, out=np.empty((3, 600)))
+    assert_raises(ValueError, q.get_solver, block_size=0)
+
+
+def test_qr_delete_columns():
+    R = np.triu(QRDecomposition(X).get_R()[:4])
+
+    # deleting columns from R matches the R of X without those columns
+    for cols in ([0], [1, 2], [3], [0, 2]):
+        keep = np.delete(np.arange(4), cols)
+        expected = np.triu(QRDecomposition(X[:, keep]).get_R()[:len(keep)])
+        assert_array_almost_equal(np.abs(expected),
+                                  np.abs(_dqrutl._qr_delete_columns(R, cols)))
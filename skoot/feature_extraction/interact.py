@@ -6,6 +6,9 @@
 
 from __future__ import absolute_import
 
+import numpy as np
+import pandas as pd
+
 from sklearn.utils.validation import check_is_fitted
 from itertools import combinations
 
@@ -43,6 +46,11 @@ class InteractionTermTransformer(BasePDTransformer):
     interaction_function : callable, optional (default=None)
         A callable for interactions. Default None will
         result in multiplication of two Series objects
+        (``np.multiply``). If the callable is a binary NumPy ufunc (i.e.,
+        ``np.multiply`` or ``np.add``) and the interacted columns share a
+        single numeric dtype, all of the interaction terms are computed
+        into one pre-allocated block, which is appended to the frame at
+        once rather than one column at a time.
 
     name_suffix : str, optional (default='I')
         The suffix to add to the new feature name in the form of
@@ -109,8 +117,7 @@ class InteractionTermTransformer(BasePDTransformer):
 
         # if not provided default to multiplication
         self.fun_ = self.interaction_function \
-            if self.interaction_function is not None else \
-            (lambda a, b: a * b)
+            if self.interaction_function is not None else np.multiply
 
         # need to store the transform columns since they may differ in the
         # transform call
@@ -148,6 +155,12 @@ class InteractionTermTransformer(BasePDTransformer):
         suff = self.name_suffix
         fun = self.fun_
 
+        # if we can, compute all of the terms at once
+        if _is_binary_ufunc(fun):
+            X_interact = _ufunc_interactions(X, transform_cols, fun, suff)
+            if X_interact is not None:
+                return X_interact if self.as_df else X_interact.values
+
         # create a generator of names/features that we'll use the itertools
         # combinations to iterate and map out
         features = [(t, X[t]) for t in transform_cols]  # (name, feature)
@@ -159,3 +172,45 @@ class InteractionTermTransformer(BasePDTransformer):
 
         # return matrix if needed
         return X if self.as_df else X.values
+
+
+def _is_binary_ufunc(fun):
+    return isinstance(fun, np.ufunc) and fun.nin == 2 and fun.nout == 1
+
+
+def _ufunc_interactions(X, cols, fun, suffix):
+    """Compute all of the pairwise interactions of ``cols`` in one block.
+
+    The terms are written column by column into a pre-allocated,
+    column-major block (in the order of the upper-triangle indices of the
+    columns, i.e., that of ``itertools.combinations``), which is appended
+    to ``X`` with a single concat. Returns None if the columns don't share
+    a numeric dtype, or if a term's name is already in ``X`` or is shared
+    by another term, in which case the terms must be assigned one at a
+    time.
+    """
+    dtypes = X[cols].dtypes.unique()
+    if dtypes.shape[0] != 1 or not isinstance(dtypes[0], np.dtype) or \
+            dtypes[0].kind not in 'biufc':
+        return None
+
+    first, second = np.triu_indices(len(cols), 1)
+    names = ['%s_%s_%s' % (cols[i], cols[j], suffix)
+             for i, j in zip(first, second)]
+    if len(set(names)) != len(names) or X.columns.isin(names).any():
+        return None
+
+    # a single-dtype frame's values are column-major already
+    values = X[cols].values
+    dtype = fun(values[:1, :1], values[:1, :1]).dtype
+    block = np.empty((X.shape[0], first.shape[0]), dtype=dtype, order='F')
+
+    # the terms of each column with all of the columns after it
+    start = 0
+    for i in range(len(cols) - 1):
+        stop = start + len(cols) - 1 - i
+        fun(values[:, i:i + 1], values[:, i + 1:], out=block[:, start:stop])
+        start = stop
+
+    return pd.concat([X, pd.DataFrame(block, index=X.index, columns=names)],
+                     axis=1, copy=False)
@@ -85,3 +85,54 @@ def test_interaction_corners():
     # test diff columns on test set to force value error
     X_test = X_pd.drop(['a'], axis=1)
     assert_raises(ValueError, trans.transform, X_test)
+
+
+def test_interaction_ufunc_block():
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.randn(50, 6), columns=list('abcdef'))
+    X_int = pd.DataFrame(rs.randint(-5, 5, (50, 6)), columns=list('abcdef'))
+
+    # the (pre-allocated) ufunc block matches the column-by-column terms
+    for frame in (X, X_int):
+        for ufunc in (np.multiply, np.add, np.true_divide):
+            def slow(a, b):
+                return ufunc(a, b)
+
+            for cols in (None, ['e', 'b', 'c']):
+                fast_trans = InteractionTermTransformer(
+                    cols=cols, interaction_function=ufunc)
+                slow_trans = InteractionTermTransformer(
+                    cols=cols, interaction_function=slow)
+                expected = slow_trans.fit_transform(frame)
+                result = fast_trans.fit_transform(frame)
+                assert result.columns.tolist() == \
+                    expected.columns.tolist()
+                assert (result.dtypes == expected.dtypes).all()
+                assert_array_equal(result.values, expected.values)
+
+    # mixed dtypes fall back to the column-by-column terms
+    mixed = X.copy()
+    mixed['b'] = X_int['b']
+    trans = InteractionTermTransformer(cols=['a', 'b', 'c'])
+    X_trans = trans.fit_transform(mixed)
+    assert X_trans['b_c_I'].dtype == np.float64
+    assert_array_equal(X_trans['a_b_I'].values, (mixed.a * mixed.b).values)
+
+    # as do names that are already present (which are overwritten)
+    present = X.copy()
+    present['a_b_I'] = 0.
+    X_trans = InteractionTermTransformer(cols=['a', 'b']).fit_transform(
+        present)
+    assert X_trans.shape[1] == present.shape[1]
+    assert_array_equal(X_trans['a_b_I'].values, (X.a * X.b).values)
+
+    # and names shared by two terms (the last of which is kept)
+    shared = pd.DataFrame(rs.randn(50, 4), columns=['a', 'b_c', 'a_b', 'c'])
+    X_trans = InteractionTermTransformer().fit_transform(shared)
+    assert X_trans.columns.tolist().count('a_b_c_I') == 1
+    assert X_trans.shape[1] == shared.shape[1] + 5
+    assert_array_equal(X_trans['a_b_c_I'].values,
+                       (shared.a_b * shared.c).values)
+
+    # the input frame is not modified
+    assert X.shape[1] == 6
@@ -0,0 +1,543 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# A blocked, parallel correlation engine for wide numeric blocks.
+
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+from scipy.stats import kendalltau, rankdata
+from sklearn.externals.joblib import Parallel, delayed
+
+from ..utils._parallel import choose_backend, shared_memmap
+
+__all__ = [
+    'CoMoments',
+    'correlation_matrix',
+    'thresholded_correlations'
+]
+
+# the number of columns on each side of a tile of the correlation matrix
+_CORR_TILE = 1024
+
+
+def _constant_columns(X):
+    """Get a mask of the constant columns of X (checked exactly, since the
+    centered values of a constant column can carry rounding error)"""
+    return (X == X[:1]).all(axis=0)
+
+
+def _standardize(X):
+    """Center and scale the columns of a (copied) block to unit norm.
+
+    Returns the standardized block and a mask of the constant columns, which
+    have no defined correlation with anything.
+    """
+    Z = np.array(X, dtype=np.double)  # always a copy we can modify
+    constant = _constant_columns(Z)
+    Z -= Z.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', Z, Z))
+    norms[constant] = 1.
+    Z /= norms
+    return Z, constant
+
+
+def _fill_tile(Z, out, i, j, tile):
+    """Compute one (upper-triangular) tile of Z'Z, and its mirror"""
+    block = np.dot(Z[:, i:i + tile].T, Z[:, j:j + tile])
+    out[i:i + tile, j:j + tile] = block
+    if i != j:
+        out[j:j + tile, i:i + tile] = block.T
+
+
+def _crossprod(Z, n_jobs):
+    """Compute Z'Z in tiles (for a standardized Z, the Pearson correlations).
+
+    Only the upper triangle of tiles is computed, and each tile is a single
+    BLAS matrix product. The products release the GIL, so the tiles are
+    filled concurrently in threads, directly into the output.
+    """
+    p = Z.shape[1]
+    out = np.empty((p, p), dtype=np.double)
+    starts = range(0, p, _CORR_TILE)
+    Parallel(n_jobs=n_jobs, backend='threading')(
+        delayed(_fill_tile)(Z, out, i, j, _CORR_TILE)
+        for i in starts for j in starts if j >= i)
+    return out
+
+
+def _rank_column(X, j):
+    """Rank a column of X (averaging ties)"""
+    return rankdata(X[:, j])
+
+
+def _ranks(X, n_jobs):
+    """Rank every column of X in parallel"""
+    backend = choose_backend(n_jobs, *X.shape)
+    with shared_memmap(X, backend) as shared:
+        ranks = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(_rank_column)(shared, j) for j in range(X.shape[1]))
+    return np.column_stack(ranks)
+
+
+def _kendall_row(X, i, others):
+    """Compute the Kendall tau-b of column i with each of ``others``.
+
+    Each pair is computed with Knight's merge-sort algorithm, in
+    O(n_samples * log(n_samples)).
+    """
+    x = X[:, i]
+    return np.array([kendalltau(x, X[:, j])[0] for j in others],
+                    dtype=np.double)
+
+
+def _kendall(X, constant, n_jobs):
+    """Compute Kendall's tau-b for every pair of (non-constant) columns"""
+    p = X.shape[1]
+    out = np.full((p, p), np.nan, dtype=np.double)
+    valid = np.flatnonzero(~constant)
+
+    backend = choose_backend(n_jobs, X.shape[0], valid.shape[0])
+    with shared_memmap(X, backend) as shared:
+        rows = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(_kendall_row)(shared, i, valid[k + 1:])
+            for k, i in enumerate(valid))
+
+    for k, (i, row) in enumerate(zip(valid, rows)):
+        others = valid[k + 1:]
+        out[i, others] = row
+        out[others, i] = row
+    return out
+
+
+def correlation_matrix(X, method='pearson', n_jobs=1):
+    """Compute the correlation matrix of the columns of a numeric block.
+
+    The block is standardized once, and the Pearson correlations are
+    computed as a tiled matrix product. Spearman correlations are the
+    Pearson correlations of the column ranks (computed once, in parallel),
+    and Kendall's tau-b is computed for each pair of columns with an
+    O(n log n) merge-sort algorithm, in parallel over the pairs.
+
+    As in ``pd.DataFrame.corr``, the correlations of a constant column are
+    NaN (including with itself).
+
+    Parameters
+    ----------
+    X : array-like, shape=(n_samples, n_features)
+        The finite, numeric block.
+
+    method : str or unicode, optional (default='pearson')
+        The method used to compute the correlation,
+        one of ('pearson', 'kendall', 'spearman').
+
+    n_jobs : int, optional (default=1)
+        The number of jobs used to compute the tiles, ranks or pairs.
+
+    Returns
+    -------
+    corr : np.ndarray, shape=(n_features, n_features)
+        The symmetric correlation matrix.
+    """
+    if method not in ('pearson', 'kendall', 'spearman'):
+        raise ValueError("method must be one of ('pearson', 'kendall', "
+                         "'spearman'), but got %r" % method)
+
+    if method == 'kendall':
+        X = np.asarray(X, dtype=np.double)
+        constant = _constant_columns(X)
+        corr = _kendall(X, constant, n_jobs)
+    else:
+        if method == 'spearman':
+            X = _ranks(np.asarray(X, dtype=np.double), n_jobs)
+        Z, constant = _standardize(X)
+        corr = _crossprod(Z, n_jobs)
+        del Z
+        np.clip(corr, -1., 1., out=corr)
+
+    np.fill_diagonal(corr, 1.)
+    corr[constant] = np.nan
+    corr[:, constant] = np.nan
+    return corr
+
+
+def _reduce_tile(block, i, j, threshold, valid):
+    """Reduce one (upper-triangular) tile of a correlation matrix.
+
+    Rather than being stored, the tile is reduced to the sums of its
+    absolute values along each axis, and the (row, column, value) triples
+    of its entries above the threshold. Only the strict upper triangle of a
+    diagonal tile contributes pairs.
+    """
+    np.clip(block, -1., 1., out=block)
+    if i == j:
+        np.fill_diagonal(block, valid[i:i + block.shape[0]])
+
+    abs_block = np.abs(block)
+    above = abs_block > threshold
+    if i == j:
+        above = np.triu(above, k=1)
+    rows, cols = np.nonzero(above)
+    return (abs_block.sum(axis=1), abs_block.sum(axis=0),
+            rows + i, cols + j, block[rows, cols])
+
+
+def _threshold_tile(Z, i, j, tile, threshold, valid):
+    """Compute and reduce one (upper-triangular) tile of Z'Z"""
+    block = np.dot(Z[:, i:i + tile].T, Z[:, j:j + tile])
+    return _reduce_tile(block, i, j, threshold, valid)
+
+
+def _threshold_comoment_tile(source, i, j, tile, threshold, valid):
+    """Scale and reduce one (upper-triangular) tile of a co-moment matrix.
+
+    ``source`` is the co-moment matrix and the scale (the root of the
+    diagonal) of each column. The constant columns have no correlations, so
+    their rows and columns of the tile are zeroed.
+    """
+    comoment, scale = source
+    block = comoment[i:i + tile, j:j + tile] / scale[i:i + tile, np.newaxis]
+    block /= scale[j:j + tile]
+    block *= valid[i:i + tile, np.newaxis]
+    block *= valid[j:j + tile]
+    return _reduce_tile(block, i, j, threshold, valid)
+
+
+class _PairAccumulator(object):
+    """Accumulate the reduced tiles (or rows) of a correlation matrix"""
+    def __init__(self, n_features):
+        self.abs_sums = np.zeros(n_features, dtype=np.double)
+        self.rows, self.cols, self.values = [], [], []
+
+    def add_pairs(self, rows, cols, values):
+        self.rows.append(rows)
+        self.cols.append(cols)
+        self.values.append(values)
+
+    def finalize(self, constant):
+        # as in pd.DataFrame.mean, the mean absolute correlation of each
+        # column is taken over the columns it has a correlation with (which
+        # includes itself), and is NaN for constant columns
+        n_valid = (~constant).sum()
+        mean_abs = self.abs_sums / max(n_valid, 1)
+        mean_abs[constant] = np.nan
+
+        def cat(arrays, dtype):
+            return np.concatenate(arrays).astype(dtype) if arrays \
+                else np.empty(0, dtype=dtype)
+
+        return (mean_abs, cat(self.rows, np.intp), cat(self.cols, np.intp),
+                cat(self.values, np.double))
+
+
+def _reduce_tiles(reduce_tile, source, constant, threshold, n_jobs):
+    """Reduce a correlation matrix one row of tiles at a time.
+
+    ``reduce_tile`` computes and reduces the tile at a given offset from
+    ``source``. The tiles in each row are reduced concurrently in threads.
+    """
+    p = constant.shape[0]
+    tile = _CORR_TILE
+    valid = (~constant).astype(np.double)
+    acc = _PairAccumulator(p)
+
+    with Parallel(n_jobs=n_jobs, backend='threading') as parallel:
+        for i in range(0, p, tile):
+            tiles = parallel(
+                delayed(reduce_tile)(source, i, j, tile, threshold, valid)
+                for j in range(i, p, tile))
+
+            for j, (row_sums, col_sums, rows, cols, values) in \
+                    zip(range(i, p, tile), tiles):
+                acc.abs_sums[i:i + tile] += row_sums
+                if i != j:  # the mirrored tile
+                    acc.abs_sums[j:j + tile] += col_sums
+                acc.add_pairs(rows, cols, values)
+
+    return acc.finalize(constant)
+
+
+def _tiled_pearson_pairs(Z, constant, threshold, n_jobs):
+    """Reduce Z'Z one row of tiles at a time"""
+    return _reduce_tiles(_threshold_tile, Z, constant, threshold, n_jobs)
+
+
+def _kendall_pairs(X, constant, threshold, n_jobs):
+    """Reduce Kendall's tau-b one batch of rows at a time"""
+    p = X.shape[1]
+    valid = np.flatnonzero(~constant)
+    acc = _PairAccumulator(p)
+    acc.abs_sums[valid] = 1.  # the diagonal
+
+    backend = choose_backend(n_jobs, X.shape[0], valid.shape[0])
+    with shared_memmap(X, backend) as shared, \
+            Parallel(n_jobs=n_jobs, backend=backend) as parallel:
+        for start in range(0, valid.shape[0], _CORR_TILE):
+            batch = range(start, min(start + _CORR_TILE, valid.shape[0]))
+            rows = parallel(
+                delayed(_kendall_row)(shared, valid[k], valid[k + 1:])
+                for k in batch)
+
+            for k, row in zip(batch, rows):
+                i, others = valid[k], valid[k + 1:]
+                abs_row = np.abs(row)
+                acc.abs_sums[i] += abs_row.sum()
+                acc.abs_sums[others] += abs_row
+                above = np.flatnonzero(abs_row > threshold)
+                acc.add_pairs(np.full(above.shape[0], i, dtype=np.intp),
+                              others[above], row[above])
+
+    return acc.finalize(constant)
+
+
+def thresholded_correlations(X, threshold, method='pearson', n_jobs=1):
+    """Reduce the correlation matrix of a numeric block without storing it.
+
+    The correlations are computed as in ``correlation_matrix``, but one
+    tile (or, for Kendall's tau-b, one batch of rows) at a time. Each piece
+    is reduced to running per-column sums of absolute correlations and the
+    pairs of columns whose absolute correlation exceeds ``threshold``, and
+    is then discarded. Memory is O(n_features + n_pairs) rather than
+    O(n_features ** 2).
+
+    Parameters
+    ----------
+    X : array-like, shape=(n_samples, n_features)
+        The finite, numeric block.
+
+    threshold : float
+        Only the pairs of columns with an absolute correlation strictly
+        greater than ``threshold`` are kept.
+
+    method : str or unicode, optional (default='pearson')
+        The method used to compute the correlation,
+        one of ('pearson', 'kendall', 'spearman').
+
+    n_jobs : int, optional (default=1)
+        The number of jobs used to compute the tiles, ranks or pairs.
+
+    Returns
+    -------
+    mean_abs : np.ndarray, shape=(n_features,)
+        The mean absolute correlation of each column (NaN for constant
+        columns), as in ``np.abs(corr).mean(axis=0)`` skipping NaNs.
+
+    rows : np.ndarray, shape=(n_pairs,)
+        The first column of each pair (always less than ``cols``).
+
+    cols : np.ndarray, shape=(n_pairs,)
+        The second column of each pair.
+
+    values : np.ndarray, shape=(n_pairs,)
+        The correlation of each pair.
+    """
+    if method not in ('pearson', 'kendall', 'spearman'):
+        raise ValueError("method must be one of ('pearson', 'kendall', "
+                         "'spearman'), but got %r" % method)
+
+    if method == 'kendall':
+        X = np.asarray(X, dtype=np.double)
+        return _kendall_pairs(X, _constant_columns(X), threshold, n_jobs)
+
+    if method == 'spearman':
+        X = _ranks(np.asarray(X, dtype=np.double), n_jobs)
+    Z, constant = _standardize(X)
+    return _tiled_pearson_pairs(Z, constant, threshold, n_jobs)
+
+
+class CoMoments(object):
+    """Mergeable co-moment statistics of the columns of a numeric block.
+
+    Accumulates the number of samples, the column means and the matrix of
+    centered cross-products (the co-moment matrix) one chunk at a time. The
+    statistics of each chunk are computed independently, and then merged
+    with the pairwise update of Chan, Golub & LeVeque [1], which is stable
+    for any number (and any size) of chunks. Since statistics computed on
+    separate chunks (i.e., in separate workers) can be merged in any order,
+    a block can be accumulated in parallel as well as in sequence.
+
+    The column minimums and maximums are also tracked, so constant columns
+    can be identified exactly.
+
+    Parameters
+    ----------
+    n_jobs : int, optional (default=1)
+        The number of jobs used to compute the cross-products of each chunk.
+
+    Attributes
+    ----------
+    n_samples : int
+        The number of samples seen so far.
+
+    mean : np.ndarray or None, shape=(n_features,)
+        The mean of each column.
+
+    comoment : np.ndarray or None, shape=(n_features, n_features)
+        The sum of the centered cross-products of each pair of columns.
+
+    References
+    ----------
+    .. [1] Chan, T. F., Golub, G. H., & LeVeque, R. J. (1979). Updating
+           formulae and a pairwise algorithm for computing sample variances.
+    """
+    def __init__(self, n_jobs=1):
+        self.n_jobs = n_jobs
+        self.n_samples = 0
+        self.mean = None
+        self.comoment = None
+        self.min = None
+        self.max = None
+
+    def update(self, X, copy=True):
+        """Fold a chunk of rows into the statistics.
+
+        Parameters
+        ----------
+        X : array-like, shape=(n_samples, n_features)
+            The finite, numeric chunk.
+
+        copy : bool, optional (default=True)
+            Whether to copy ``X``. If False, and ``X`` is already an array
+            of doubles, it is centered in place.
+        """
+        X = np.array(X, dtype=np.double, copy=copy)
+        if X.ndim != 2:
+            raise ValueError("Expected 2D array, got %iD array instead"
+                             % X.ndim)
+        if not X.shape[0]:
+            return self
+
+        chunk = CoMoments(n_jobs=self.n_jobs)
+        chunk.n_samples = X.shape[0]
+        chunk.min = X.min(axis=0)
+        chunk.max = X.max(axis=0)
+        chunk.mean = X.mean(axis=0)
+        X -= chunk.mean
+        chunk.comoment = _crossprod(X, self.n_jobs)
+        return self._merge(chunk, copy=False)
+
+    def merge(self, other):
+        """Merge the statistics of another set of rows into these.
+
+        Parameters
+        ----------
+        other : CoMoments
+            The statistics of another set of rows, with the same columns.
+            These are not modified.
+        """
+        return self._merge(other, copy=True)
+
+    def _merge(self, other, copy):
+        if not other.n_samples:
+            return self
+        if not self.n_samples:
+            def take(a):
+                return a.copy() if copy else a
+
+            self.n_samples = other.n_samples
+            self.mean, self.comoment, self.min, self.max = \
+                [take(a) for a in (other.mean, other.comoment,
+                                   other.min, other.max)]
+            return self
+        if other.mean.shape != self.mean.shape:
+            raise ValueError("Cannot merge the statistics of %i columns "
+                             "with those of %i columns"
+                             % (other.mean.shape[0], self.mean.shape[0]))
+
+        n_a, n_b = self.n_samples, other.n_samples
+        n = n_a + n_b
+        delta = other.mean - self.mean
+
+        # the outer product is added one block of rows at a time, so it's
+        # never allocated in full
+        C = self.comoment
+        C += other.comoment
+        scaled = delta * (n_a * n_b / n)
+        for i in range(0, C.shape[0], _CORR_TILE):
+            C[i:i + _CORR_TILE] += np.outer(scaled[i:i + _CORR_TILE], delta)
+
+        self.mean += delta * (n_b / n)
+        self.n_samples = n
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        return self
+
+    def correlation(self, columns=None):
+        """Compute the Pearson correlation matrix from the statistics.
+
+        As in ``correlation_matrix``, the correlations of a constant column
+        are NaN.
+
+        Parameters
+        ----------
+        columns : array-like or None, optional (default=None)
+            The indices of a subset of the columns to compute the
+            correlations of. If None, all of the columns are used.
+
+        Returns
+        -------
+        corr : np.ndarray, shape=(n_features, n_features)
+            The symmetric correlation matrix.
+        """
+        if not self.n_samples:
+            raise ValueError("No samples have been accumulated")
+
+        comoment, low, high = self.comoment, self.min, self.max
+        if columns is not None:
+            columns = np.asarray(columns, dtype=np.intp)
+            comoment = comoment[np.ix_(columns, columns)]
+            low, high = low[columns], high[columns]
+
+        constant = low == high
+        scale = np.sqrt(np.diag(comoment))
+        scale[constant] = 1.
+
+        corr = comoment / scale[:, np.newaxis]
+        corr /= scale
+        np.clip(corr, -1., 1., out=corr)
+        np.fill_diagonal(corr, 1.)
+        corr[constant] = np.nan
+        corr[:, constant] = np.nan
+        return corr
+
+    def thresholded_correlations(self, threshold):
+        """Reduce the Pearson correlation matrix without storing it.
+
+        As in ``thresholded_correlations``, the correlations are derived
+        from the co-moment matrix one tile at a time (in parallel), and
+        each tile is reduced to the per-column sums of absolute
+        correlations and the pairs above ``threshold`` before being
+        discarded, so no other O(n_features ** 2) matrix is allocated.
+
+        Parameters
+        ----------
+        threshold : float
+            Only the pairs of columns with an absolute correlation strictly
+            greater than ``threshold`` are kept.
+
+        Returns
+        -------
+        mean_abs : np.ndarray, shape=(n_features,)
+            The mean absolute correlation of each column (NaN for constant
+            columns).
+
+        rows : np.ndarray, shape=(n_pairs,)
+            The first column of each pair (always less than ``cols``).
+
+        cols : np.ndarray, shape=(n_pairs,)
+            The second column of each pair.
+
+        values : np.ndarray, shape=(n_pairs,)
+            The correlation of each pair.
+        """
+        if not self.n_samples:
+            raise ValueError("No samples have been accumulated")
+
+        constant = self.min == self.max
+        scale = np.sqrt(np.diag(self.comoment))
+        scale[constant] = 1.
+        return _reduce_tiles(_threshold_comoment_tile,
+                             (self.comoment, scale), constant, threshold,
+                             self.n_jobs)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Mergeable heavy-hitter sketches for streaming value frequencies.
+
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    'HeavyHitters'
+]
+
+
+def _value_counts(values):
+    """Count the occurrences of the distinct, non-null values of a column.
+
+    Returns the distinct values and their counts, computed in a single
+    pass: categorical codes are counted with ``np.bincount``, and any
+    other values are counted in a hash table, so they are never sorted
+    (which is much slower for the discrete numeric columns this is most
+    often applied to).
+    """
+    if hasattr(values, 'codes'):  # a pd.Categorical
+        codes = np.asarray(values.codes)
+        counts = np.bincount(codes[codes >= 0],
+                             minlength=len(values.categories))
+        present = counts > 0
+        return np.asarray(values.categories)[present], counts[present]
+
+    counts = pd.Series(values).value_counts(sort=False)
+    return counts.index.values, counts.values
+
+
+def _merge_value_counts(value_counts):
+    """Merge the counts of the distinct values of several chunks of a column.
+
+    Takes a list of the ``(uniques, counts)`` of each chunk (as returned by
+    ``_value_counts``), and returns those of all of them. The distinct
+    values are hashed to integer codes, and their counts are summed with
+    ``np.bincount``.
+    """
+    if len(value_counts) == 1:
+        return value_counts[0]
+    if not value_counts:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    codes, uniques = pd.factorize(
+        np.concatenate([u for u, _ in value_counts]))
+    counts = np.bincount(codes,
+                         weights=np.concatenate([c for _, c in value_counts]),
+                         minlength=len(uniques))
+    return np.asarray(uniques), counts.astype(np.int64)
+
+
+class HeavyHitters(object):
+    """A mergeable Misra-Gries summary of the most frequent values.
+
+    Keeps a counter for at most ``capacity`` distinct values of a column,
+    updated one chunk at a time. Each chunk is counted exactly and then
+    merged into the summary: whenever more than ``capacity`` counters
+    remain (in the chunk's counts, or after adding them to the summary's),
+    the (``capacity`` + 1)-th largest count is subtracted from all of them,
+    and the non-positive ones are discarded [1]. Summaries of separate
+    chunks (i.e., from separate workers) can be merged in any order with
+    the same guarantees.
+
+    Every counter is a lower bound on the true count of its value, and
+    underestimates it by at most ``error`` (the sum of all of the
+    subtracted counts), which never exceeds ``n_samples / (capacity + 1)``.
+    Values without a counter occur at most ``error`` times.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of counters to keep.
+
+    Attributes
+    ----------
+    counts : pd.Series
+        The (lower bounds of the) counts, indexed by value.
+
+    error : int
+        The maximum amount by which any count is underestimated.
+
+    n_samples : int
+        The number of non-null values seen so far.
+
+    References
+    ----------
+    .. [1] Agarwal, P. K., Cormode, G., Huang, Z., Phillips, J., Wei, Z., &
+           Yi, K. (2012). Mergeable summaries. In Proceedings of the 31st
+           ACM Symposium on Principles of Database Systems (pp. 23-34).
+    """
+    def __init__(self, capacity):
+        if not (isinstance(capacity, (int, np.integer)) and capacity >= 2):
+            raise ValueError("capacity must be an int >= 2, but got %r"
+                             % capacity)
+
+        self.capacity = capacity
+        self.counts = pd.Series([], dtype=np.int64)
+        self.error = 0
+        self.n_samples = 0
+
+    def update(self, values):
+        """Count a chunk of values, and merge its summary into this one.
+
+        Parameters
+        ----------
+        values : array-like, shape=(n_samples,)
+            The chunk of values. Nulls are not counted.
+        """
+        uniques, counts = _value_counts(values)
+        return self.merge(_summarize(uniques, counts, self.capacity))
+
+    def merge(self, other):
+        """Merge another summary of the same column into this one.
+
+        Parameters
+        ----------
+        other : HeavyHitters
+            The summary of another set of values. It is not modified.
+        """
+        counts = self.counts.add(other.counts, fill_value=0)
+        error = self.error + other.error
+
+        k = self.capacity
+        if counts.shape[0] > k:
+            # subtract the (k + 1)-th largest count from all of them
+            delta = -np.partition(-counts.values, k)[k]
+            counts = counts[counts > delta] - delta
+            error += delta
+
+        self.counts = counts.astype(np.int64)
+        self.error = int(error)
+        self.n_samples += other.n_samples
+        return self
+
+    def top_two(self):
+        """Get the (lower bounds of the) two largest counts"""
+        counts = self.counts.values
+        if counts.shape[0] < 2:
+            return (int(counts[0]) if counts.shape[0] else 0), 0
+        second, first = np.partition(counts, counts.shape[0] - 2)[-2:]
+        return int(first), int(second)
+
+    def ratio(self):
+        """Estimate the ratio of the two largest counts, with bounds.
+
+        The true largest count is in ``[first, first + error]``, and the
+        true second-largest count is in ``[second, second + error]``, so
+        the true ratio is in ``[first / (second + error),
+        (first + error) / second]``. With no error, all three are equal.
+
+        Returns
+        -------
+        ratio : float
+            The ratio of the two largest counts in the summary (infinity if
+            there are fewer than two).
+
+        lower : float
+            The lower bound on the true ratio.
+
+        upper : float
+            The upper bound on the true ratio.
+        """
+        first, second = self.top_two()
+        error = self.error
+
+        def divide(a, b):
+            return a / float(b) if b else np.inf
+
+        return (divide(first, second), divide(first, second + error),
+                divide(first + error, second))
+
+
+def _count_ratio(counts):
+    """Get the ratio of the two largest of the counts of a column's values
+    (infinity if there are fewer than two)"""
+    if counts.shape[0] < 2:
+        return np.inf
+
+    # only the top two counts are needed, so there's no need for a sort
+    second, first = np.partition(counts, counts.shape[0] - 2)[-2:]
+    return first / float(second) if second else np.inf
+
+
+def _summarize(uniques, counts, capacity):
+    """Summarize the exact counts of a chunk of values.
+
+    If there are more than ``capacity`` distinct values, the (``capacity``
+    + 1)-th largest count is found with ``np.partition`` and subtracted
+    from the others first, so the summary's index is only built over the
+    counters that are kept.
+    """
+    summary = HeavyHitters(capacity)
+    summary.n_samples = int(counts.sum())
+    if counts.shape[0] > capacity:
+        delta = -np.partition(-counts, capacity)[capacity]
+        keep = counts > delta
+        uniques, counts = uniques[keep], counts[keep] - delta
+        summary.error = int(delta)
+
+    summary.counts = pd.Series(counts.astype(np.int64), index=uniques)
+    return summary
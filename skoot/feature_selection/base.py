@@ -4,6 +4,9 @@
 
 from __future__ import print_function, division, absolute_import
 
+import numpy as np
+import pandas as pd
+
 from sklearn.utils.validation import check_is_fitted
 from sklearn.externals import six
 from abc import ABCMeta
@@ -31,7 +34,9 @@ class BaseFeatureSelector(six.with_metaclass(ABCMeta, BasePDTransformer)):
         * The ``fit`` method should not change the state of the training frame.
 
         * The transform method should return a copy of the test frame,
-          dropping the columns identified as "bad" in the ``fit`` method.
+          dropping the columns identified as "bad" in the ``fit`` method
+          (or, if ``copy=False``, a view of the kept columns when they are
+          contiguous).
 
     Parameters
     ----------
@@ -47,21 +52,29 @@ class BaseFeatureSelector(six.with_metaclass(ABCMeta, BasePDTransformer)):
         method. If False, will return a Numpy ``ndarray`` instead. 
         Since most skoot transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True by default.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
     """
-    def __init__(self, cols=None, as_df=True):
-        # simple pass-through for the super constructor call
+    def __init__(self, cols=None, as_df=True, copy=True):
         super(BaseFeatureSelector, self).__init__(
             cols=cols, as_df=as_df)
 
+        self.copy = copy
+
     def transform(self, X):
         """Transform a test dataframe.
 
         Parameters
         ----------
         X : pd.DataFrame, shape=(n_samples, n_features)
-            The Pandas frame to transform. The operation will
-            be applied to a copy of the input data, and the result
-            will be returned.
+            The Pandas frame to transform. The input frame is never
+            modified. The kept columns are selected from it in a single
+            positional take (or sliced, if ``copy`` is False).
 
         Returns
         -------
@@ -70,27 +83,44 @@ class BaseFeatureSelector(six.with_metaclass(ABCMeta, BasePDTransformer)):
         """
         check_is_fitted(self, 'drop_')
 
-        # check on state of X and cols
-        X, cols = check_dataframe(X, self.cols)
+        # check on state of X and cols. X is not modified, so the only copy
+        # made is the selection of the kept columns below
+        X, cols = check_dataframe(X, self.cols, copy=False)
 
-        # if there's nothing to drop
+        # what if we don't want to throw this key error for a non-existent
+        # column that we hope to drop anyways? We need to at least inform
+        # the user...
         drop_columns = self.drop_  # type: list
-        if not drop_columns:
-            return X if self.as_df else X.values
-
-        # otherwise, there's something to drop
+        columns = X.columns
+        if drop_columns and not pd.Index(drop_columns).isin(columns).all():
+            warnings.warn('one or more features to drop not contained '
+                          'in input data feature names (drop=%r)'
+                          % drop_columns, UserWarning)
+
+        # the positions of the columns to keep (all of them if there's
+        # nothing to drop)
+        if drop_columns:
+            keep = np.flatnonzero(~columns.isin(drop_columns))
         else:
-            # what if we don't want to throw this key error for a non-existent
-            # column that we hope to drop anyways? We need to at least inform
-            # the user...
-            colset = set(X.columns)
-            drops = [x for x in drop_columns if x in colset]
-
-            # for length mismatch, we know there's a missing column
-            if len(drops) != len(drop_columns):
-                warnings.warn('one or more features to drop not contained '
-                              'in input data feature names (drop=%r)'
-                              % drop_columns, UserWarning)
-
-            dropped = X.drop(drops, axis=1)
-            return dropped if self.as_df else dropped.values
+            keep = np.arange(columns.shape[0])
+
+        selected = _take_columns(X, keep, self.copy)
+        return selected if self.as_df else selected.values
+
+
+def _take_columns(X, keep, copy):
+    """Select the columns at the ``keep`` positions of X in a single take.
+
+    If ``copy`` is False and the positions are contiguous, the columns are
+    sliced rather than taken, which does not copy a single-dtype block.
+    """
+    n_keep = keep.shape[0]
+    if not copy:
+        if n_keep == X.shape[1]:
+            return X
+        if n_keep == 0 or keep[-1] - keep[0] + 1 == n_keep:
+            start = keep[0] if n_keep else 0
+            return X.iloc[:, start:start + n_keep]
+
+    # iloc with an array of positions takes (copies) the columns
+    return X.iloc[:, keep]
@@ -5,11 +5,15 @@
 from __future__ import division, print_function
 
 from sklearn.externals import six
+from scipy.linalg import solve_triangular
 import numpy as np
 
 from .base import BaseFeatureSelector
 from ..decomposition import QRDecomposition
-from ..utils.validation import check_dataframe, validate_multiple_cols
+from ..decomposition._dqrutl import (_exceeds_fortran_size, _pivot_R,
+                                     _qr_delete_columns, _r_factor)
+from ..utils.validation import (check_dataframe, validate_multiple_cols,
+                                validate_test_set_columns)
 from ..utils.iterables import flatten_all
 
 __all__ = [
@@ -44,6 +48,20 @@ class LinearCombinationFilter(BaseFeatureSelector):
         Since most skoot transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True by default.
 
+    chunksize : int or None, optional (default=None)
+        If provided, ``fit`` factors ``chunksize`` rows at a time with a
+        tall-skinny QR (TSQR), rather than factoring a dense copy of all of
+        the ``cols`` at once. This bounds the memory required by the
+        factorization for very tall frames. For data that doesn't fit in
+        memory at all, use ``partial_fit`` on chunks of the data.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
+
     Examples
     --------
     An example linear combination filter:
@@ -62,14 +80,27 @@ class LinearCombinationFilter(BaseFeatureSelector):
         are designated as "bad" and will be dropped in the ``transform``
         method.
 
+    fit_cols_ : list
+        The columns the transformer was fit on.
+
+    r_factor_ : np.ndarray, shape=(n_features, n_features)
+        The upper-triangular R factor of the QR decomposition of the
+        ``fit_cols_`` (in their original order). It summarizes all of the
+        data seen so far, and is updated by ``partial_fit``.
+
+    n_samples_seen_ : int
+        The number of rows the transformer has been fit on.
+
     References
     ----------
     .. [1] Caret's filterLinearCombos script - https://bit.ly/2uA6vSX
     """
 
-    def __init__(self, cols=None, as_df=True):
+    def __init__(self, cols=None, as_df=True, chunksize=None, copy=True):
         super(LinearCombinationFilter, self).__init__(
-            cols=cols, as_df=as_df)
+            cols=cols, as_df=as_df, copy=copy)
+
+        self.chunksize = chunksize
 
     def fit(self, X, y=None):
         """Fit the transformer.
@@ -92,42 +123,129 @@ class LinearCombinationFilter(BaseFeatureSelector):
         # there must be at least two columns
         validate_multiple_cols(self.__class__.__name__, cols)
 
-        # init drops list
-        drops = []
+        # factor the columns once (in their original order, so further
+        # chunks can be stacked with R), and find the drops from R
+        chunksize = self.chunksize
+        if chunksize is None:
+            R = _get_R(_decompose(X[cols].as_matrix()))
+        else:
+            if chunksize < 1:
+                raise ValueError("chunksize must be a positive integer, but "
+                                 "got %r" % chunksize)
+            blocks = (X.iloc[start:start + chunksize][cols].values
+                      for start in range(0, X.shape[0], chunksize))
+            R = QRDecomposition(blocks, pivot=False, backend='tsqr').qr
+
+        self.fit_cols_ = cols
+        self.n_samples_seen_ = X.shape[0]
+        self.r_factor_ = R
+        self.drop_ = _drop_linear_combos(R, cols)
 
-        # Generate sub matrix for qr decomposition
-        x = X[cols].as_matrix()
-        cols = np.array(cols)  # so we can use boolean masking
+        return self
 
-        # do subroutines
-        lc_list = _enum_lc(QRDecomposition(x))
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the transformer on a chunk of data.
 
-        if lc_list is not None:
-            while lc_list is not None:
-                # we want the first index in each of the keys in the dict
-                bad = np.array([p for p in
-                                set([v[0]
-                                     for _, v in six.iteritems(lc_list)])
-                                ])
+        The chunk is folded into the R factor of all of the data seen so far
+        (the R factor of the two stacked together is the R factor of all of
+        the data), and the linear combinations are re-enumerated from R. The
+        cost of each call is proportional to the size of the chunk, and each
+        chunk is only read once, so the transformer can be fit on data that
+        does not fit in memory (i.e., ``pd.read_csv(..., chunksize=...)``).
 
-                # get the corresponding bad names
-                bad_nms = cols[bad]
-                drops.extend(bad_nms)
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. If the transformer has already been
+            fit, it must contain the ``fit_cols_``.
 
-                # update our X, and then our cols
-                x = np.delete(x, bad, axis=1)
-                cols = np.delete(cols, bad)
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
+        X, cols = check_dataframe(X, cols=self.cols, assert_all_finite=True)
 
-                # keep removing linear dependencies until it resolves
-                lc_list = _enum_lc(QRDecomposition(x))
+        # if this is the first chunk, start a new factorization
+        if not hasattr(self, 'r_factor_'):
+            validate_multiple_cols(self.__class__.__name__, cols)
+            R = _r_factor(X[cols].values)
+            self.fit_cols_ = cols
+            self.n_samples_seen_ = 0
 
-                # will break when lc_list returns None
+        # otherwise update the factorization of the columns we fit on
+        else:
+            cols = self.fit_cols_
+            validate_test_set_columns(cols, X.columns)
+            R = _r_factor(np.vstack([self.r_factor_, X[cols].values]))
 
-        # Assign attributes, return
-        self.drop_ = list(set(drops))  # de-dupe, and make a list
+        self.n_samples_seen_ += X.shape[0]
+        self.r_factor_ = R
+        self.drop_ = _drop_linear_combos(R, cols)
 
         return self
-        
+
+
+def _drop_linear_combos(R, cols):
+    """Find the columns to drop, given the R factor of the matrix.
+
+    Only R is ever touched: the dependent columns are deleted from R at each
+    iteration, rather than from the matrix, which would then have to be
+    factored again.
+
+    Parameters
+    ----------
+    R : np.ndarray, shape=(k, n_features)
+        The upper-triangular R factor of the matrix (unpivoted).
+
+    cols : list
+        The names of the columns of the matrix.
+    """
+    drops = []
+    cols = np.array(cols)  # so we can use boolean masking
+
+    R, rank, pivot = _pivot_R(R)
+    lc_list = _enum_lc_R(R, rank, pivot)
+
+    while lc_list is not None:
+        # we want the first index in each of the keys in the dict
+        bad = np.array(sorted(set([v[0]
+                                   for _, v in six.iteritems(lc_list)])))
+
+        # get the corresponding bad names
+        drops.extend(cols[bad])
+        cols = np.delete(cols, bad)
+
+        # delete the bad columns from R (whose columns are in pivoted
+        # order) rather than re-factoring the matrix without them
+        positions = np.flatnonzero(np.in1d(pivot, bad))
+        R = _qr_delete_columns(R, positions)
+
+        # re-index the pivots to the remaining columns, and re-pivot
+        remaining = np.delete(pivot, positions)
+        remaining = np.searchsorted(np.sort(remaining), remaining)
+        R, rank, repivot = _pivot_R(R)
+        pivot = remaining[repivot]
+
+        # keep removing linear dependencies until it resolves
+        lc_list = _enum_lc_R(R, rank, pivot)
+
+    return list(set(drops))  # de-dupe, and make a list
+
+
+def _decompose(x):
+    """Decompose a matrix (without pivoting) for linear combo scoping.
+
+    Matrices too large for the 32-bit Fortran routines are factored in
+    chunks with TSQR, which is all ``_enum_lc`` needs (R, rank & pivots).
+    """
+    if _exceeds_fortran_size(*x.shape):
+        return QRDecomposition(x, pivot=False, backend='tsqr')
+    return QRDecomposition(x, pivot=False)
+
+
+def _get_R(decomp):
+    """Get the (strictly upper-triangular) R factor of a decomposition"""
+    return np.triu(decomp.get_R()[:min(decomp.qr.shape)])
+
 
 def _enum_lc(decomp):
     """Perform a single iteration of linear combo scoping.
@@ -137,39 +255,46 @@ def _enum_lc(decomp):
     decomp : QRDecomposition
         The QR decomposition of the matrix
     """
-    # qr = decomp.qr  # the decomposition matrix
+    return _enum_lc_R(_get_R(decomp), decomp.get_rank(), decomp.pivot)
 
-    # extract the R matrix
-    R = decomp.get_R()         # the R matrix
-    n_features = R.shape[1]    # number of columns in R
-    # is_zero = n_features == 0  # whether there are no features
 
-    # the rank of the original matrix, or num of independent cols
-    rank = decomp.get_rank()
+def _enum_lc_R(R, rank, pivot):
+    """Perform a single iteration of linear combo scoping given only the
+    upper-triangular R factor of a (pivoted) decomposition.
+
+    Parameters
+    ----------
+    R : np.ndarray, shape=(k, n_features)
+        The upper-triangular R factor of the pivoted matrix
+
+    rank : int
+        The rank of the matrix
+
+    pivot : np.ndarray, shape=(n_features,)
+        The pivots. The first ``rank`` are the independent columns.
+    """
+    n_features = R.shape[1]    # number of columns in R
 
     if rank != n_features:
-        pivot = decomp.pivot         # the pivot vector
         X = R[:rank, :rank]          # extract the independent cols
-        Y = R[:rank, rank:]  # +1?   # extract the dependent columns
-
-        new_qr = QRDecomposition(X)  # factor the independent columns
-        b = new_qr.get_coef(Y)       # get regression coefs of dependent cols
-
-        # if b is None, then there were no dependent columns
-        if b is not None:
-            b[np.abs(b) < 1e-6] = 0  # zap small values
-            
-            # will return a dict of {dim : list of bad idcs}
-            d = {}
-            row_idcs = np.arange(b.shape[0])
-            for i in range(Y.shape[1]):  # should only ever be 1, right?
-                nested = [ 
-                            pivot[rank+i],
-                            pivot[row_idcs[b[:, i] != 0]]
-                         ]
-                d[i] = list(flatten_all(nested))
-
-            return d
+        Y = R[:rank, rank:]          # extract the dependent columns
+
+        # get regression coefs of dependent cols on the independent ones
+        # (X is upper-triangular, so this is a back-substitution)
+        b = solve_triangular(X, Y)
+        b[np.abs(b) < 1e-6] = 0  # zap small values
+
+        # will return a dict of {dim : list of bad idcs}
+        d = {}
+        row_idcs = np.arange(b.shape[0])
+        for i in range(Y.shape[1]):
+            nested = [
+                pivot[rank + i],
+                pivot[row_idcs[b[:, i] != 0]]
+            ]
+            d[i] = list(flatten_all(nested))
+
+        return d
 
     # if we get here, there are no linear combos to discover
     return None
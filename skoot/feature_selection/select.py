@@ -7,17 +7,73 @@ from __future__ import print_function, division, absolute_import
 import numpy as np
 import pandas as pd
 
+from heapq import heapify, heappop, heappush
+
+from sklearn.externals.joblib import Parallel, delayed
+from sklearn.utils.validation import check_is_fitted
+
 from .base import BaseFeatureSelector
-from ..utils.validation import check_dataframe, validate_multiple_cols
+from ._corr import CoMoments, correlation_matrix, thresholded_correlations
+from ._sketch import (HeavyHitters, _count_ratio, _merge_value_counts,
+                      _summarize, _value_counts)
+from ..utils._parallel import choose_backend
+from ..utils.validation import (check_dataframe, validate_multiple_cols,
+                                validate_test_set_columns)
 
 __all__ = [
     'FeatureFilter',
     'MultiCorrFilter',
     'NearZeroVarianceFilter',
+    'ScreeningFilter',
     'SparseFeatureFilter'
 ]
 
 
+# the number of rows whose nulls are counted at a time
+_SPARSITY_CHUNK_ROWS = 65536
+
+
+def _null_counts(X, positions, threshold=None):
+    """Count the nulls in the columns of X at the given positions.
+
+    The rows are counted a chunk at a time, with each chunk counted in one
+    vectorized pass over its dtype blocks. If ``threshold`` is not None, a
+    column stops being counted once its sparsity is provably above the
+    threshold, or provably at or below it, given the total row count. The
+    counts of such columns are lower bounds.
+    """
+    n_samples = X.shape[0]
+    counts = np.zeros(positions.shape[0], dtype=np.int64)
+    active = np.arange(positions.shape[0])
+
+    # if all of X is counted, the chunks can be sliced rather than taken
+    all_columns = np.array_equal(positions, np.arange(X.shape[1]))
+
+    for start in range(0, n_samples, _SPARSITY_CHUNK_ROWS):
+        stop = min(start + _SPARSITY_CHUNK_ROWS, n_samples)
+        if all_columns and active.shape[0] == positions.shape[0]:
+            nulls = X.iloc[start:stop].isnull().values
+
+        # taking (copying) a few columns of the chunk is cheaper than
+        # checking all of them, but taking most of them is not
+        elif 2 * active.shape[0] < X.shape[1]:
+            nulls = X.iloc[start:stop, positions[active]].isnull().values
+        else:
+            nulls = X.iloc[start:stop].isnull().values[:, positions[active]]
+        counts[active] += nulls.sum(axis=0)
+
+        if threshold is not None:
+            # the counts can only grow by the number of remaining rows
+            n = float(n_samples)
+            lower = counts[active] / n
+            upper = (counts[active] + (n_samples - stop)) / n
+            active = active[(lower <= threshold) & (upper > threshold)]
+            if not active.shape[0]:
+                break
+
+    return counts
+
+
 class SparseFeatureFilter(BaseFeatureSelector):
     """Drop overly sparse features.
 
@@ -44,6 +100,20 @@ class SparseFeatureFilter(BaseFeatureSelector):
         Since most skutil transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True by default.
 
+    early_exit : bool, optional (default=False)
+        Whether ``fit`` should stop counting the nulls of a feature once
+        it is provably above (or at or below) ``threshold``, given the
+        number of rows in the frame. The ``drop_`` are the same, but the
+        ``sparsity_`` of such features is only a lower bound, so
+        ``drop_path`` is only exact for the fitted ``threshold``.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
+
     Examples
     --------
     An example of the sparse feature filter:
@@ -68,18 +138,31 @@ class SparseFeatureFilter(BaseFeatureSelector):
     ----------
     sparsity_ : array-like, shape=(n_features,)
         The array of sparsity values
+
+    fit_cols_ : list
+        The names of the columns ``sparsity_`` was assessed on.
+
+    null_counts_ : np.ndarray or None, shape=(n_features,)
+        The number of nulls in each of the ``fit_cols_``, accumulated by
+        ``fit`` and ``partial_fit`` (None after a ``fit`` with
+        ``early_exit``, whose counts may be incomplete).
+
+    n_samples_seen_ : int
+        The number of rows the filter has been fit on.
     
     drop_ : array-like, shape=(n_features,)
         Assigned after calling ``fit``. These are the features that
         are designated as "bad" and will be dropped in the ``transform``
         method.
     """
-    def __init__(self, cols=None, threshold=0.5, as_df=True):
+    def __init__(self, cols=None, threshold=0.5, as_df=True,
+                 early_exit=False, copy=True):
 
         super(SparseFeatureFilter, self).__init__(
-            cols=cols, as_df=as_df)
+            cols=cols, as_df=as_df, copy=copy)
 
         self.threshold = threshold
+        self.early_exit = early_exit
 
     def fit(self, X, y=None):
         """Fit the transformer.
@@ -96,23 +179,108 @@ class SparseFeatureFilter(BaseFeatureSelector):
             Pass-through for ``sklearn.pipeline.Pipeline``. Even
             if explicitly set, will not change behavior of ``fit``.
         """
-        X, cols = check_dataframe(X, cols=self.cols)
+        X, cols = check_dataframe(X, cols=self.cols, copy=False)
         thresh = self.threshold
 
         # validate the threshold
-        if not (isinstance(thresh, float) and (0.0 <= thresh < 1.0)):
-            raise ValueError('thresh must be a float between '
-                             '0 (inclusive) and 1. Got %s' % str(thresh))
+        self._validate_threshold(thresh)
 
         # assess sparsity
-        subset = X[cols]
-        self.sparsity_ = subset.apply(
-            lambda x: x.isnull().sum() / x.shape[0]).values  # type: np.ndarray
+        counts = _null_counts(X, X.columns.get_indexer(cols),
+                              threshold=thresh if self.early_exit else None)
+        self.sparsity_ = counts / float(X.shape[0])  # type: np.ndarray
+
+        # keep the counts for a subsequent partial_fit, unless they may
+        # have stopped early
+        self.fit_cols_ = cols
+        self.null_counts_ = None if self.early_exit else counts
+        self.n_samples_seen_ = X.shape[0]
+        self.drop_ = self._drops_at(thresh)
+        return self
 
-        mask = self.sparsity_ > thresh  # numpy boolean array
-        self.drop_ = subset.columns[mask].tolist()
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the sparse feature filter on a chunk.
+
+        The nulls of each column of the chunk are counted and added to
+        those of all of the data seen so far (including the data of a
+        previous ``fit``), and ``sparsity_`` and ``drop_`` are re-computed
+        from the totals. Each chunk is only read once, so the filter can be
+        fit on data that does not fit in memory (i.e., ``pd.read_csv(...,
+        chunksize=...)``). Since the total number of rows is not known
+        until the last chunk, ``early_exit`` does not apply here, and a
+        ``fit`` with ``early_exit`` cannot be continued.
+
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. If the filter has already been
+            fit, it must contain the ``fit_cols_``.
+
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
+        X, cols = check_dataframe(X, cols=self.cols, copy=False)
+        thresh = self.threshold
+        self._validate_threshold(thresh)
+
+        # if this is the first chunk, start new counts
+        if not hasattr(self, 'fit_cols_'):
+            self.fit_cols_ = cols
+            self.null_counts_ = np.zeros(len(cols), dtype=np.int64)
+            self.n_samples_seen_ = 0
+
+        # otherwise update the counts of the columns we fit on
+        else:
+            if self.null_counts_ is None:
+                raise ValueError("The filter was fit with early_exit=True, "
+                                 "so its null counts are only lower bounds "
+                                 "and cannot be updated. Refit it with "
+                                 "early_exit=False.")
+            cols = self.fit_cols_
+            validate_test_set_columns(cols, X.columns)
+
+        self.null_counts_ += _null_counts(X, X.columns.get_indexer(cols))
+        self.n_samples_seen_ += X.shape[0]
+
+        self.sparsity_ = self.null_counts_ / float(self.n_samples_seen_)
+        self.drop_ = self._drops_at(thresh)
         return self
 
+    def drop_path(self, thresholds):
+        """Get the features that would be dropped at each threshold.
+
+        The drops are derived from the fitted ``sparsity_``, so the frame
+        is not re-assessed for each threshold (i.e., when tuning
+        ``threshold`` in a grid search).
+
+        Parameters
+        ----------
+        thresholds : iterable
+            The thresholds of sparsity (see ``threshold``).
+
+        Returns
+        -------
+        drops : list
+            The list of features that would be dropped (``drop_``) at each
+            of the ``thresholds``.
+        """
+        check_is_fitted(self, 'sparsity_')
+        drops = []
+        for thresh in thresholds:
+            self._validate_threshold(thresh)
+            drops.append(self._drops_at(thresh))
+        return drops
+
+    def _drops_at(self, thresh):
+        mask = self.sparsity_ > thresh  # numpy boolean array
+        return [self.fit_cols_[i] for i in np.flatnonzero(mask)]
+
+    @staticmethod
+    def _validate_threshold(thresh):
+        if not (isinstance(thresh, float) and (0.0 <= thresh < 1.0)):
+            raise ValueError('thresh must be a float between '
+                             '0 (inclusive) and 1. Got %s' % str(thresh))
+
 
 class FeatureFilter(BaseFeatureSelector):
     """A simple feature-dropping transformer class.
@@ -138,6 +306,13 @@ class FeatureFilter(BaseFeatureSelector):
         Since most skoot transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True by default.
 
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
+
     Examples
     --------
     An example using the FeatureFilter:
@@ -158,10 +333,10 @@ class FeatureFilter(BaseFeatureSelector):
         are designated as "bad" and will be dropped in the ``transform``
         method.
     """
-    def __init__(self, cols=None, as_df=True):
+    def __init__(self, cols=None, as_df=True, copy=True):
         # just a pass-through for super constructor
         super(FeatureFilter, self).__init__(
-            cols=cols, as_df=as_df)
+            cols=cols, as_df=as_df, copy=copy)
 
     def fit(self, X, y=None):
         # check on state of X and cols
@@ -185,6 +360,14 @@ class MultiCorrFilter(BaseFeatureSelector):
     mean absolute correlation (MAC) of each feature is considered, and the
     feature with the highest MAC is discarded.
 
+    By default, every pair is resolved at once using the MACs of all of the
+    features (as in caret's ``findCorrelation_fast``), which may drop both
+    features of a pair, or drop more features than necessary. If ``exact``
+    is True, the features are instead discarded one at a time: the feature
+    with the highest MAC among those still in a correlated pair is dropped,
+    and the MACs of the remaining features are updated (excluding the
+    dropped feature) before the next one is chosen.
+
     Parameters
     ----------
     cols : array-like, shape=(n_features,), optional (default=None)
@@ -207,6 +390,43 @@ class MultiCorrFilter(BaseFeatureSelector):
         Since most skoot transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True by default.
 
+    n_jobs : int, 1 by default
+       The number of jobs to use for computing the correlation matrix.
+       Pearson correlations are computed as a tiled matrix product, with
+       the tiles computed in parallel. Spearman correlations are Pearson
+       correlations of the column ranks, which are computed in parallel.
+       Kendall correlations are computed in parallel over pairs of columns.
+
+       If -1 all CPUs are used. If 1 is given, no parallel computing code
+       is used at all, which is useful for debugging. For n_jobs below -1,
+       (n_cpus + 1 + n_jobs) are used. Thus for n_jobs = -2, all CPUs but
+       one are used.
+
+    tiled : bool or str, optional (default='auto')
+        Whether to avoid storing the full correlation matrix. If True, the
+        correlations are computed one tile at a time, and each tile is
+        reduced to running mean absolute correlations and the (sparse) list
+        of pairs above ``threshold`` before being discarded. This requires
+        O(n_features + n_pairs) memory rather than O(n_features ** 2), and
+        selects the same features. If 'auto', the tiled mode is used for
+        more than 10000 features. The co-moments accumulated by
+        ``partial_fit`` take O(n_features ** 2) memory regardless, but are
+        also reduced one tile at a time.
+
+    exact : bool, optional (default=False)
+        Whether to discard the correlated features one at a time, updating
+        the MACs after each (see above), rather than all at once. The
+        features in correlated pairs are kept in a priority queue keyed on
+        their MACs, which are updated incrementally, so this only requires
+        the correlations among the features in correlated pairs.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
+
     Examples
     --------
     The following demonstrates a simple multi-correlation filter
@@ -233,16 +453,48 @@ class MultiCorrFilter(BaseFeatureSelector):
 
     mean_abs_correlations_ : list, float
         The corresponding mean absolute correlations of each ``drop_`` name
+
+    comoments_ : CoMoments or None
+        The co-moment statistics accumulated by ``fit`` and
+        ``partial_fit``, from which the correlations are derived. They are
+        only kept for Pearson correlations that are not ``tiled`` (or are
+        accumulated by ``partial_fit``), and are None otherwise.
+
+    fit_cols_ : list
+        The names of the columns the correlations were computed for.
+
+    fit_threshold_ : float
+        The ``threshold`` the filter was fit with.
+
+    correlated_pairs_ : tuple
+        The pairs of features with an absolute correlation above
+        ``fit_threshold_``, as a tuple of three arrays: the indices (in
+        ``fit_cols_``) of the first and second features of each pair, and
+        their correlations. Used to derive ``drop_path``.
+
+    candidate_correlations_ : np.ndarray or None
+        The absolute correlations among the features in
+        ``correlated_pairs_`` (ordered by their indices in ``fit_cols_``),
+        used to update the MACs if ``exact`` is True (None otherwise).
+
+    Note that ``drop_``, ``mean_abs_correlations_``, ``correlated_pairs_``
+    and ``candidate_correlations_`` are derived from ``comoments_`` (if
+    any) when they are first accessed after a ``fit`` or ``partial_fit``,
+    so fitting many chunks in a row only updates the co-moments.
     """
 
     def __init__(self, cols=None, threshold=0.85,
-                 method='pearson', as_df=True):
+                 method='pearson', as_df=True, n_jobs=1, tiled='auto',
+                 exact=False, copy=True):
 
         super(MultiCorrFilter, self).__init__(
-            cols=cols, as_df=as_df)
+            cols=cols, as_df=as_df, copy=copy)
 
         self.threshold = threshold
         self.method = method
+        self.n_jobs = n_jobs
+        self.tiled = tiled
+        self.exact = exact
 
     def fit(self, X, y=None):
         """Fit the multi-collinearity filter.
@@ -260,83 +512,401 @@ class MultiCorrFilter(BaseFeatureSelector):
             if explicitly set, will not change behavior of ``fit``.
         """
         # check on state of X and cols. Also need all columns to be finite!
-        X, cols = check_dataframe(X, cols=self.cols, assert_all_finite=True)
+        # (X isn't modified, so don't copy it)
+        X, cols = check_dataframe(X, cols=self.cols, assert_all_finite=True,
+                                  copy=False)
 
         # we need to make sure there's more than 1 column!
         validate_multiple_cols(self.__class__.__name__, cols)
-
-        # Generate correlation matrix
-        c = X[cols].corr(method=self.method)
+        tiled = self._is_tiled(len(cols))
+
+        # (pearson) co-moments are only kept if they would not take more
+        # memory than the dense correlation matrix, so partial_fit can
+        # continue from them
+        values = X[cols].values
+        self.comoments_ = None
+        if self.method == 'pearson' and not tiled:
+            self.comoments_ = CoMoments(n_jobs=self.n_jobs).update(values)
+            self._update_fit(cols)
+            return self
 
         # get drops list
-        # TODO: write a _find_correlations_exact for smaller matrices
-        self.drop_, self.mean_abs_correlations_ = \
-            self._find_correlations_fast(c, self.threshold)
-
+        if tiled:
+            # reduce the correlation matrix as it's computed, never storing
+            # more than a tile of it
+            pairs = thresholded_correlations(
+                values, self.threshold, method=self.method,
+                n_jobs=self.n_jobs)
+
+            # the exact method needs the correlations among the features in
+            # pairs, which are re-computed
+            def block(features):
+                return correlation_matrix(values[:, features],
+                                          method=self.method,
+                                          n_jobs=self.n_jobs)
+
+        else:
+            # Generate correlation matrix
+            c = pd.DataFrame(correlation_matrix(values,
+                                                method=self.method,
+                                                n_jobs=self.n_jobs),
+                             index=cols, columns=cols)
+            pairs = _dense_correlated_pairs(c, self.threshold)
+
+            def block(features):
+                return _symmetric_block(c.values, features)
+
+        self._update_fit(cols)
+        self._set_correlated_pairs(pairs, block)
         return self
 
-    @staticmethod
-    def _find_correlations_fast(c, threshold):
-        """Filter highly correlated features.
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the multi-collinearity filter on a chunk.
 
-        This function identifies the correlations between features that
-        are greater than the provided threshold, and identifies which
-        to drop on the basis of mean absolute correlation. This function is
-        based on Caret's ``findCorrelation_fast`` method [1], which is very
-        efficient for large matrices.
+        The chunk's counts, means and co-moment (centered cross-product)
+        matrix are merged into those of all of the data seen so far (which
+        includes the data of a previous ``fit``). Each chunk is only read
+        once, so the filter can be fit on data that does not fit in memory
+        (i.e., ``pd.read_csv(..., chunksize=...)``). The correlated pairs,
+        and ``drop_``, are derived from the merged statistics when they are
+        next accessed (in tiles, if ``tiled``), rather than for every
+        chunk. Only Pearson correlations can be accumulated this way, since
+        rank correlations depend on all of the data at once.
 
         Parameters
         ----------
-        c : pd.DataFrame
-            The pre-computed correlation matrix.
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. If the filter has already been
+            fit, it must contain the ``fit_cols_``.
 
-        threshold : float
-            The threshold above which to filter features which
-            are multi-collinear in nature.
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
+        if self.method != 'pearson':
+            raise ValueError("partial_fit is only supported for "
+                             "method='pearson', but got %r" % self.method)
+
+        X, cols = check_dataframe(X, cols=self.cols, assert_all_finite=True,
+                                  copy=False)
+
+        # if this is the first chunk, start new statistics
+        if not hasattr(self, 'fit_cols_'):
+            validate_multiple_cols(self.__class__.__name__, cols)
+            self._is_tiled(len(cols))
+            self.comoments_ = CoMoments(n_jobs=self.n_jobs)
+
+        # otherwise update the statistics of the columns we fit on
+        else:
+            if self.comoments_ is None:
+                raise ValueError("The filter was fit with tiled "
+                                 "correlations, which do not keep the "
+                                 "co-moments that partial_fit updates. "
+                                 "Fit it with partial_fit alone, or with "
+                                 "tiled=False.")
+            cols = self.fit_cols_
+            validate_test_set_columns(cols, X.columns)
+
+        self.comoments_.update(X[cols].values)
+        self._update_fit(cols)
+        return self
 
-        Returns
-        -------
-        drop_names : list, shape=(n_features,)
-            The feature names that should be dropped
+    def drop_path(self, thresholds):
+        """Get the features that would be dropped at each threshold.
 
-        average_corr : array-like, shape=(n_features,)
-            The mean absolute correlations between
-            the features.
+        The drops are derived from the fitted ``mean_abs_correlations_``
+        and ``correlated_pairs_``, so the correlations are not re-computed
+        for each threshold (i.e., when tuning ``threshold`` in a grid
+        search). Since only the pairs above the fitted ``threshold`` are
+        stored, the filter should be fit with the lowest threshold of
+        interest.
 
-        References
+        Parameters
         ----------
-        .. [1] Caret findCorrelations.R (findCorrelation_fast)
-               https://bit.ly/2E1AMcJ
+        thresholds : iterable
+            The thresholds, each of which must be at least the fitted
+            ``threshold``.
+
+        Returns
+        -------
+        drops : list
+            The list of features that would be dropped (``drop_``) at each
+            of the ``thresholds``.
         """
-        # get the average absolute column correlations
-        c_abs = c.abs()  # type: pd.DataFrame
-        average_corr = c_abs.mean().values  # type: np.ndarray
+        check_is_fitted(self, 'correlated_pairs_')
+        return [self._drops_at(thresh) for thresh in thresholds]
+
+    # the statistics derived from the co-moments are only computed (and
+    # stored in the private attributes) when they're first accessed after a
+    # fit or partial_fit
+    @property
+    def drop_(self):
+        self._derive_pairs()
+        return self._drop
+
+    @property
+    def mean_abs_correlations_(self):
+        self._derive_pairs()
+        return self._mean_abs_correlations
+
+    @property
+    def correlated_pairs_(self):
+        self._derive_pairs()
+        return self._correlated_pairs
+
+    @property
+    def candidate_correlations_(self):
+        self._derive_pairs()
+        return self._candidate_correlations
+
+    def _is_tiled(self, n_features):
+        tiled = self.tiled
+        if tiled not in ('auto', True, False):
+            raise ValueError("tiled must be one of ('auto', True, False), "
+                             "but got %r" % tiled)
+        if tiled == 'auto':
+            return n_features > _MCF_DENSE_MAX_FEATURES
+        return tiled
+
+    def _update_fit(self, cols):
+        """Record the parameters of a fit, whose correlated pairs are derived
+        from the co-moments (if any) when next accessed"""
+        self.fit_cols_ = cols
+        self.fit_threshold_ = self.threshold
+        self._fit_tiled = self._is_tiled(len(cols))
+        self._fit_exact = self.exact
+        self._pairs_outdated = self.comoments_ is not None
+
+    def _derive_pairs(self):
+        """Derive the correlated pairs from the co-moments, if outdated"""
+        if not getattr(self, '_pairs_outdated', False):
+            return
+
+        comoments = self.comoments_
+        if self._fit_tiled:
+            pairs = comoments.thresholded_correlations(self.fit_threshold_)
+
+            def block(features):
+                return comoments.correlation(features)
+
+        else:
+            cols = self.fit_cols_
+            c = pd.DataFrame(comoments.correlation(), index=cols,
+                             columns=cols)
+            pairs = _dense_correlated_pairs(c, self.fit_threshold_)
+
+            def block(features):
+                return _symmetric_block(c.values, features)
+
+        self._pairs_outdated = False
+        self._set_correlated_pairs(pairs, block)
+
+    def _set_correlated_pairs(self, pairs, block):
+        """Store the fitted statistics, and derive ``drop_`` from them.
+
+        ``block`` computes the correlations among the given features, and
+        is only called if ``exact`` was True when the filter was fit.
+        """
+        average_corr, rows, columns, values = pairs
+        self._mean_abs_correlations = average_corr
+        self._correlated_pairs = (rows, columns, values)
+
+        self._candidate_correlations = None
+        if self._fit_exact:
+            self._candidate_correlations = np.abs(
+                block(np.union1d(rows, columns)))
+
+        self._drop = self._drops_at(self.fit_threshold_)
+
+    def _drops_at(self, threshold):
+        if threshold < self.fit_threshold_:
+            raise ValueError("The filter was fit with threshold=%r, so the "
+                             "drops at lower thresholds (got %r) require "
+                             "refitting." % (self.fit_threshold_, threshold))
+
+        rows, columns, values = self.correlated_pairs_
+        mask = np.abs(values) > threshold
+        candidate_corr = self.candidate_correlations_
+        if candidate_corr is not None:
+            drop_cols = _drop_correlated_exact(
+                self.mean_abs_correlations_, rows[mask], columns[mask],
+                np.union1d(rows, columns), candidate_corr)
+        else:
+            drop_cols = _drop_correlated_pairs(self.mean_abs_correlations_,
+                                               rows[mask], columns[mask])
+        return [self.fit_cols_[i] for i in drop_cols]
+
+
+def _dense_correlated_pairs(c, threshold):
+    """Reduce a correlation matrix to its pairs above the threshold.
+
+    Note that the lower triangle of ``c`` is set to NaN in the process.
+
+    Parameters
+    ----------
+    c : pd.DataFrame
+        The pre-computed correlation matrix.
+
+    threshold : float
+        Only the pairs with an absolute correlation greater than
+        ``threshold`` are kept.
+
+    Returns
+    -------
+    average_corr : np.ndarray, shape=(n_features,)
+        The mean absolute correlations of the features.
+
+    rows : np.ndarray, shape=(n_pairs,)
+        The index of the first feature of each pair.
+
+    cols : np.ndarray, shape=(n_pairs,)
+        The index of the second feature of each pair.
+
+    values : np.ndarray, shape=(n_pairs,)
+        The correlation of each pair.
+    """
+    # get the average absolute column correlations
+    c_abs = c.abs()  # type: pd.DataFrame
+    average_corr = c_abs.mean().values  # type: np.ndarray
 
-        # get the sort order
-        average_corr_order = np.argsort(average_corr)
+    # set the lower tri to NaN so we don't consider anymore
+    # first, get the lower tri indices and then zip them
+    lower_tri = np.tril_indices(n=c.shape[0], k=0)
+    c.values[lower_tri] = np.nan
 
-        # set the lower tri to NaN so we don't consider anymore
-        # first, get the lower tri indices and then zip them
-        lower_tri = np.tril_indices(n=c.shape[0], k=0)
-        c.values[lower_tri] = np.nan
+    # get those above cutoff (re-compute abs on amended array)
+    c_abs = c.abs()  # type: pd.DataFrame
+    rows, cols = np.where(c_abs > threshold)
+    return average_corr, rows, cols, c.values[rows, cols]
 
-        # get those above cutoff (re-compute abs on amended array)
-        c_abs = c.abs()  # type: pd.DataFrame
-        combs_above_thresh = np.where(c_abs > threshold)
-        rows_to_check, cols_to_check = combs_above_thresh
 
-        cols_to_discard = (average_corr_order[cols_to_check] >
-                           average_corr_order[rows_to_check])
-        rows_to_discard = ~cols_to_discard
+# above this many features, MultiCorrFilter(tiled='auto') won't store the
+# full correlation matrix (which would take 800MB)
+_MCF_DENSE_MAX_FEATURES = 10000
 
-        # append each set of discard rows/cols, get the distinct
-        drop_cols = np.unique(
-            np.concatenate([cols_to_check[cols_to_discard],
-                            rows_to_check[rows_to_discard]]))
 
-        # the names to drop
-        drop_names = c.columns[drop_cols].tolist()
-        return drop_names, average_corr
+def _drop_correlated_pairs(average_corr, rows_to_check, cols_to_check):
+    """Decide which of each pair of highly-correlated features to drop.
+
+    This is the drop logic of Caret's ``findCorrelation_fast`` method [1],
+    on the sparse list of pairs above the threshold (in the upper triangle
+    of the correlation matrix).
+
+    Parameters
+    ----------
+    average_corr : array-like, shape=(n_features,)
+        The mean absolute correlations of the features.
+
+    rows_to_check : array-like, shape=(n_pairs,)
+        The index of the first feature of each pair.
+
+    cols_to_check : array-like, shape=(n_pairs,)
+        The index of the second feature of each pair.
+
+    Returns
+    -------
+    drop_cols : np.ndarray
+        The sorted, distinct indices of the features to drop.
+
+    References
+    ----------
+    .. [1] Caret findCorrelations.R (findCorrelation_fast)
+           https://bit.ly/2E1AMcJ
+    """
+    # get the sort order
+    average_corr_order = np.argsort(average_corr)
+
+    cols_to_discard = (average_corr_order[cols_to_check] >
+                       average_corr_order[rows_to_check])
+    rows_to_discard = ~cols_to_discard
+
+    # append each set of discard rows/cols, get the distinct
+    return np.unique(
+        np.concatenate([cols_to_check[cols_to_discard],
+                        rows_to_check[rows_to_discard]]))
+
+
+def _symmetric_block(c, features):
+    """Get the correlations among some features from an upper triangle.
+
+    ``c`` is a correlation matrix whose lower triangle (and diagonal) has
+    been set to NaN by ``_dense_correlated_pairs``.
+    """
+    block = c[np.ix_(features, features)]
+    block = np.where(np.isnan(block), block.T, block)
+    np.fill_diagonal(block, 1.)
+    return block
+
+
+def _drop_correlated_exact(average_corr, rows_to_check, cols_to_check,
+                           candidates, candidate_corr):
+    """Drop the most correlated features one at a time.
+
+    The feature with the highest mean absolute correlation (MAC) among
+    those still in a pair above the threshold is dropped, and the MACs of
+    the remaining features are updated by removing its correlations, until
+    no pairs remain. The features are kept in a max-heap keyed on their
+    MACs. Since the MACs only decrease, a stale key is re-pushed with the
+    current MAC when it's popped, rather than updated in place.
+
+    Parameters
+    ----------
+    average_corr : array-like, shape=(n_features,)
+        The mean absolute correlations of the features.
+
+    rows_to_check : array-like, shape=(n_pairs,)
+        The index of the first feature of each pair.
+
+    cols_to_check : array-like, shape=(n_pairs,)
+        The index of the second feature of each pair.
+
+    candidates : np.ndarray, shape=(n_candidates,)
+        The sorted indices of (at least) all of the features in pairs.
+
+    candidate_corr : np.ndarray, shape=(n_candidates, n_candidates)
+        The absolute correlations among the ``candidates``.
+
+    Returns
+    -------
+    drop_cols : np.ndarray
+        The sorted, distinct indices of the features to drop.
+    """
+    n_candidates = candidates.shape[0]
+
+    # all of the non-constant features' MACs are over the same number of
+    # features, so the sums of their absolute correlations are compared
+    n_valid = np.isfinite(average_corr).sum()
+    sums = np.asarray(average_corr)[candidates] * n_valid
+
+    # the correlated partners of each candidate, in CSR form
+    rows = np.searchsorted(candidates, rows_to_check)
+    cols = np.searchsorted(candidates, cols_to_check)
+    sources = np.concatenate([rows, cols])
+    partners = np.concatenate([cols, rows])[np.argsort(sources,
+                                                       kind='mergesort')]
+    n_partners = np.bincount(sources, minlength=n_candidates)
+    indptr = np.concatenate([[0], np.cumsum(n_partners)])
+
+    heap = [(-sums[i], i) for i in np.flatnonzero(n_partners)]
+    heapify(heap)
+    dropped = np.zeros(n_candidates, dtype=bool)
+
+    while heap:
+        key, i = heappop(heap)
+
+        # it's been dropped, or none of its partners remain
+        if dropped[i] or not n_partners[i]:
+            continue
+
+        # its MAC has decreased since it was pushed
+        if -key != sums[i]:
+            heappush(heap, (-sums[i], i))
+            continue
+
+        dropped[i] = True
+        sums -= candidate_corr[:, i]
+        n_partners[partners[indptr[i]:indptr[i + 1]]] -= 1
+
+    return candidates[dropped]
 
 
 def _near_zero_variance_ratio(series, ratio):
@@ -372,6 +942,21 @@ def _near_zero_variance_ratio(series, ratio):
     return ratio_, drop_
 
 
+def _update_sketch(sketch, values):
+    """Update a column's sketch (possibly in another process)"""
+    return sketch.update(values)
+
+
+def _fit_sketch(values, capacity):
+    """Count a column exactly, and summarize the counts in a sketch.
+
+    Returns the exact ratio of the counts of the two most common values of
+    the column, and its heavy-hitter sketch.
+    """
+    uniques, counts = _value_counts(values)
+    return _count_ratio(counts), _summarize(uniques, counts, capacity)
+
+
 class NearZeroVarianceFilter(BaseFeatureSelector):
     r"""Identify near zero variance predictors.
 
@@ -381,9 +966,12 @@ class NearZeroVarianceFilter(BaseFeatureSelector):
     to the number of samples and the ratio of the frequency of the most
     common value to the frequency of the second most common value is large.
 
-    A note of caution: if you attempt to run this over large, continuous data,
-    it might take a long time. Since for each column in ``cols`` it will
-    compute ``value_counts``, applying to continuous data could be a bad idea.
+    Only the counts of the two most common values of each column are
+    needed, and these are found without sorting a table of value
+    frequencies: each column is counted in a single pass (with
+    ``np.bincount`` over the codes of categorical columns, and in a hash
+    table otherwise), and the two largest counts are selected with
+    ``np.partition``.
 
     Parameters
     ----------
@@ -406,6 +994,31 @@ class NearZeroVarianceFilter(BaseFeatureSelector):
         Since most skutil transformers depend on explicitly-named
         ``DataFrame`` features, the ``as_df`` parameter is True by default.
 
+    n_jobs : int, 1 by default
+       The number of jobs to use for the computation. This works by
+       computing the ratios of the columns in parallel.
+
+       If -1 all CPUs are used. If 1 is given, no parallel computing code
+       is used at all, which is useful for debugging. For n_jobs below -1,
+       (n_cpus + 1 + n_jobs) are used. Thus for n_jobs = -2, all CPUs but
+       one are used.
+
+    sketch_size : int, optional (default=1000)
+        The maximum number of distinct values counted per column by
+        ``partial_fit``. Columns with at most this many distinct values are
+        counted exactly. Otherwise, the counts of the most common values
+        may be underestimated by at most ``n_samples / (sketch_size + 1)``
+        (see ``ratio_bounds_``). The ratios computed by ``fit`` are always
+        exact, but the counts it keeps for a subsequent ``partial_fit`` are
+        sketched the same way.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
+
     Examples
     --------
     An example of the near zero variance filter on a completely
@@ -453,6 +1066,19 @@ class NearZeroVarianceFilter(BaseFeatureSelector):
         The ratios of the counts of the most populous classes to the second
         most populated classes for each column in ``cols``.
 
+    fit_cols_ : list
+        The names of the columns ``ratios_`` were computed for.
+
+    ratio_bounds_ : np.ndarray, shape=(n_features, 2)
+        The lower and upper bounds on the true ratio of each column. These
+        are equal to ``ratios_`` after ``fit``, but after ``partial_fit``
+        they bound the error of the sketched counts. A drop (or keep)
+        decision is certain if ``freq_cut`` does not fall within them.
+
+    sketches_ : list
+        The heavy-hitter sketch of the counts of each column, from which
+        ``partial_fit`` continues.
+
     References
     ----------
     .. [1] Kuhn, M. & Johnson, K. "Applied Predictive 
@@ -461,12 +1087,15 @@ class NearZeroVarianceFilter(BaseFeatureSelector):
     .. [2] Caret (R package) nearZeroVariance R code
            https://bit.ly/2J0ozbM
     """
-    def __init__(self, cols=None, freq_cut=95./5., as_df=True):
+    def __init__(self, cols=None, freq_cut=95./5., as_df=True, n_jobs=1,
+                 sketch_size=1000, copy=True):
 
         super(NearZeroVarianceFilter, self).__init__(
-            cols=cols, as_df=as_df)
+            cols=cols, as_df=as_df, copy=copy)
 
         self.freq_cut = freq_cut
+        self.n_jobs = n_jobs
+        self.sketch_size = sketch_size
 
     def fit(self, X, y=None):
         """Fit the near-zero variance filter.
@@ -484,47 +1113,320 @@ class NearZeroVarianceFilter(BaseFeatureSelector):
             if explicitly set, will not change behavior of ``fit``.
         """
         # check on state of X and cols
-        X, cols = check_dataframe(X, self.cols)
+        X, cols = check_dataframe(X, self.cols, copy=False)
 
         # get the freq cut and validate it is an appropriate value...
-        freq_cut = self.freq_cut
-        if not (isinstance(freq_cut, (int, float)) and 1. < freq_cut):
-            raise ValueError("freq_cut must be a float > 1.0")
+        freq_cut = self._validate_freq_cut(self.freq_cut)
+
+        # get the exact ratios (in parallel over the columns), from which
+        # the drops are derived, and the sketches of the counts, from which
+        # a subsequent partial_fit continues
+        n_jobs = self.n_jobs
+        backend = choose_backend(n_jobs, X.shape[0], len(cols))
+        fitted = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(_fit_sketch)(X[c].values, self.sketch_size)
+            for c in cols)
+        self.ratios_ = np.array([ratio for ratio, _ in fitted],
+                                dtype=np.double)
+        self.ratio_bounds_ = np.column_stack([self.ratios_, self.ratios_])
+        self.sketches_ = [sketch for _, sketch in fitted]
+        self.fit_cols_ = cols
+        self.drop_ = self._drops_at(freq_cut)
+        return self
 
-        # make sure it's cast to a float if not already
-        freq_cut = float(freq_cut)
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the near-zero variance filter on a chunk.
+
+        Each column of the chunk is counted exactly, and merged into a
+        bounded-size heavy-hitter (Misra-Gries) sketch of the column, from
+        which ``ratios_`` and ``drop_`` are re-derived. If the filter has
+        already been fit, the chunk is merged into the sketches of that
+        fit. Each chunk is only read once, so the filter can be fit on data
+        that does not fit in memory (i.e., ``pd.read_csv(...,
+        chunksize=...)``). Since columns with more than ``sketch_size``
+        distinct values are only counted approximately, the bounds on each
+        ratio are kept in ``ratio_bounds_``.
 
-        # get a mask of which should be dropped
-        subset = X[cols]
-        ratios = subset.apply(self._filter_freq_cut).values
-        self.drop_ = subset.columns[ratios >= freq_cut].tolist()
-        self.ratios_ = ratios
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. If the filter has already been
+            fit, it must contain the ``fit_cols_``.
+
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
+        X, cols = check_dataframe(X, self.cols, copy=False)
+        freq_cut = self._validate_freq_cut(self.freq_cut)
+
+        # if this is the first chunk, start new sketches
+        if getattr(self, 'sketches_', None) is None:
+            sketches = [HeavyHitters(self.sketch_size) for _ in cols]
+            self.fit_cols_ = cols
+
+        # otherwise update the sketches of the columns we fit on
+        else:
+            sketches = self.sketches_
+            cols = self.fit_cols_
+            validate_test_set_columns(cols, X.columns)
+
+        n_jobs = self.n_jobs
+        backend = choose_backend(n_jobs, X.shape[0], len(cols))
+        self.sketches_ = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(_update_sketch)(sketch, X[c].values)
+            for sketch, c in zip(sketches, cols))
+
+        ratios = np.array([sketch.ratio() for sketch in self.sketches_],
+                          dtype=np.double)
+        self.ratios_ = ratios[:, 0]
+        self.ratio_bounds_ = ratios[:, 1:]
+        self.drop_ = self._drops_at(freq_cut)
 
         return self
 
-    @staticmethod
-    def _filter_freq_cut(series):
-        """Filter above a frequency cut.
+    def drop_path(self, freq_cuts):
+        """Get the features that would be dropped at each frequency cut.
+
+        The drops are derived from the fitted ``ratios_``, so the value
+        counts are not re-computed for each cut (i.e., when tuning
+        ``freq_cut`` in a grid search).
 
         Parameters
         ----------
-        series : pd.Series
-            One series in the specified column list.
+        freq_cuts : iterable
+            The frequency cuts (see ``freq_cut``).
 
         Returns
         -------
-        ratio : float
-            The ratio of the count of the most populated class to the second
-            most populated class. If there is only one class, will return
-            infinity.
+        drops : list
+            The list of features that would be dropped (``drop_``) at each
+            of the ``freq_cuts``.
         """
-        vc = series.value_counts()
-        n_levels = vc.shape[0]
+        check_is_fitted(self, 'ratios_')
+        return [self._drops_at(self._validate_freq_cut(freq_cut))
+                for freq_cut in freq_cuts]
+
+    def _drops_at(self, freq_cut):
+        mask = self.ratios_ >= freq_cut
+        return [self.fit_cols_[i] for i in np.flatnonzero(mask)]
+
+    @staticmethod
+    def _validate_freq_cut(freq_cut):
+        if not (isinstance(freq_cut, (int, float)) and 1. < freq_cut):
+            raise ValueError("freq_cut must be a float > 1.0")
+
+        # make sure it's cast to a float if not already
+        return float(freq_cut)
+
+
+# the number of elements in each block of rows scanned by the
+# ScreeningFilter
+_SCREEN_BLOCK_ELEMENTS = 2 ** 22
+
+
+class ScreeningFilter(BaseFeatureSelector):
+    """Screen out sparse, near-zero variance and correlated features.
+
+    Applies the drop rules of the ``SparseFeatureFilter``, the
+    ``NearZeroVarianceFilter`` and the (Pearson) ``MultiCorrFilter`` in
+    sequence, but computes all of the statistics they depend on in a single
+    scan of the frame, one block of rows at a time (so the frame is never
+    copied in full). The nulls of each block are counted, its distinct
+    values are counted exactly (in parallel over the columns), and its
+    co-moments are computed as a tiled matrix product (also in parallel)
+    and merged into those of the previous blocks. The rules are then
+    applied in order:
+
+        1. Features sparser than ``sparsity_threshold`` are dropped.
+        2. Of those remaining, features whose frequency ratio is at least
+           ``freq_cut`` are dropped.
+        3. Of those remaining, features are dropped as in the
+           ``MultiCorrFilter`` with ``corr_threshold``. As in the
+           ``MultiCorrFilter``, the remaining features must all be finite.
+
+    This selects the same features as applying the three filters one after
+    another, each to the output of the last, but the frame is read once
+    (rather than copied three times), and only the correlations of the
+    features that remain for the third rule are derived from the
+    co-moments. Since the distinct values of every column are counted
+    exactly, continuous columns take memory in proportion to their number
+    of distinct values, as in the ``NearZeroVarianceFilter``.
+
+    Parameters
+    ----------
+    cols : array-like, shape=(n_features,), optional (default=None)
+        The names of the columns on which to apply the transformation.
+        If no column names are provided, the transformer will be ``fit``
+        on the entire frame. Note that the transformation will also only
+        apply to the specified columns, and any other non-specified
+        columns will still be present after transformation. The columns
+        must be numeric.
+
+    sparsity_threshold : float, optional (default=0.5)
+        The threshold of sparsity above which features will be deemed "too
+        sparse" and will be dropped (see ``SparseFeatureFilter``).
+
+    freq_cut : float, optional (default=95/5)
+        The cutoff for the ratio of the most common value to the second most
+        common value (see ``NearZeroVarianceFilter``).
+
+    corr_threshold : float, optional (default=0.85)
+        The threshold above which to filter correlated features (see
+        ``MultiCorrFilter``).
+
+    as_df : bool, optional (default=True)
+        Whether to return a Pandas ``DataFrame`` in the ``transform``
+        method. If False, will return a Numpy ``ndarray`` instead.
+        Since most skoot transformers depend on explicitly-named
+        ``DataFrame`` features, the ``as_df`` parameter is True by default.
+
+    n_jobs : int, 1 by default
+       The number of jobs to use for the computation of the per-column
+       statistics and the co-moments.
+
+       If -1 all CPUs are used. If 1 is given, no parallel computing code
+       is used at all, which is useful for debugging. For n_jobs below -1,
+       (n_cpus + 1 + n_jobs) are used. Thus for n_jobs = -2, all CPUs but
+       one are used.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` should return a copy of the kept columns. If
+        False, and the kept columns form one contiguous block of the input
+        frame (or nothing is dropped), the result is a slice of the input
+        that shares its memory where Pandas allows it (i.e., when the block
+        is of a single dtype), so modifying it will modify the input.
+
+    Examples
+    --------
+    Screening the iris dataset:
+
+    >>> from skoot.datasets import load_iris_df
+    >>>
+    >>> X = load_iris_df(include_tgt=False)
+    >>> screen = ScreeningFilter(corr_threshold=0.85).fit(X)
+    >>> screen.drop_
+    ['petal length (cm)']
+
+    Attributes
+    ----------
+    drop_ : array-like, shape=(n_features,)
+        Assigned after calling ``fit``. These are the features that
+        are designated as "bad" and will be dropped in the ``transform``
+        method.
+
+    fit_cols_ : list
+        The names of the columns that were screened.
+
+    sparsity_ : np.ndarray, shape=(n_features,)
+        The fraction of null values in each of the ``fit_cols_``.
+
+    ratios_ : np.ndarray, shape=(n_features,)
+        The ratio of the counts of the two most common values in each of
+        the ``fit_cols_``.
+
+    corr_cols_ : list
+        The names of the columns that remained for the correlation rule
+        (i.e., that were not dropped for sparsity or near-zero variance).
+
+    mean_abs_correlations_ : np.ndarray, shape=(n_corr_features,)
+        The mean absolute correlation of each of the ``corr_cols_``.
+    """
+    def __init__(self, cols=None, sparsity_threshold=0.5, freq_cut=95. / 5.,
+                 corr_threshold=0.85, as_df=True, n_jobs=1, copy=True):
+
+        super(ScreeningFilter, self).__init__(
+            cols=cols, as_df=as_df, copy=copy)
+
+        self.sparsity_threshold = sparsity_threshold
+        self.freq_cut = freq_cut
+        self.corr_threshold = corr_threshold
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y=None):
+        """Fit the screening filter.
 
-        # base case 1: vc len is 1 (single value, no variance at all)
-        if n_levels == 1:
-            return np.inf
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The Pandas frame to fit. The frame will only
+            be fit on the prescribed ``cols`` (see ``__init__``) or
+            all of them if ``cols`` is None. Furthermore, ``X`` will
+            not be altered in the process of the fit.
 
-        # get the first two levels and counts
-        first_two = vc.values[:2].astype(float)
-        return first_two[0] / first_two[1]
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``. Even
+            if explicitly set, will not change behavior of ``fit``.
+        """
+        # X is only ever read, so don't copy it
+        X, cols = check_dataframe(X, cols=self.cols, copy=False)
+        SparseFeatureFilter._validate_threshold(self.sparsity_threshold)
+        freq_cut = NearZeroVarianceFilter._validate_freq_cut(self.freq_cut)
+
+        # every column is read as doubles, so must be numeric
+        non_numeric = [c for c in cols if X[c].dtype.kind not in 'biuf']
+        if non_numeric:
+            raise ValueError("ScreeningFilter requires numeric columns, but "
+                             "got non-numeric columns: %r" % non_numeric)
+
+        # scan the frame once, one block of rows at a time
+        n_samples, n_features = X.shape[0], len(cols)
+        n_jobs = self.n_jobs
+        arrays = [X[c].values for c in cols]
+        n_null = np.zeros(n_features, dtype=np.int64)
+        n_non_finite = np.zeros(n_features, dtype=np.int64)
+        block_counts = [[] for _ in cols]
+        comoments = CoMoments(n_jobs=n_jobs)
+        block_rows = max(1, _SCREEN_BLOCK_ELEMENTS // max(n_features, 1))
+
+        with Parallel(n_jobs=n_jobs, backend='threading') as parallel:
+            for start in range(0, n_samples, block_rows):
+                chunks = [v[start:start + block_rows] for v in arrays]
+
+                # the levels are counted in each column's own dtype, before
+                # the block is cast (so integer and bool columns are never
+                # counted as doubles)
+                for counts, chunk_counts in zip(
+                        block_counts,
+                        parallel(delayed(_value_counts)(chunk)
+                                 for chunk in chunks)):
+                    counts.append(chunk_counts)
+
+                block = np.column_stack(chunks).astype(np.double, copy=False)
+                non_finite = ~np.isfinite(block)
+                n_null += np.isnan(block).sum(axis=0)
+                n_non_finite += non_finite.sum(axis=0)
+                block[non_finite] = 0.
+                comoments.update(block, copy=False)
+
+        self.sparsity_ = n_null / float(n_samples)
+        self.ratios_ = np.array(
+            [_count_ratio(_merge_value_counts(counts)[1])
+             for counts in block_counts], dtype=np.double)
+
+        # apply the rules in sequence
+        keep = self.sparsity_ <= self.sparsity_threshold
+        keep &= ~(self.ratios_ >= freq_cut)
+        remaining = np.flatnonzero(keep)
+        if n_non_finite[remaining].any():
+            raise ValueError('Expected all entries in specified columns '
+                             'to be finite')
+
+        corr_cols = [cols[i] for i in remaining]
+        drop_corr = set()
+        average_corr = np.zeros(0, dtype=np.double)
+        if len(corr_cols) > 1:
+            c = pd.DataFrame(comoments.correlation(remaining),
+                             index=corr_cols, columns=corr_cols)
+            average_corr, rows, columns, _ = \
+                _dense_correlated_pairs(c, self.corr_threshold)
+            drop_corr = set(_drop_correlated_pairs(
+                average_corr, rows, columns).tolist())
+
+        self.fit_cols_ = cols
+        self.corr_cols_ = corr_cols
+        self.mean_abs_correlations_ = average_corr
+        dropped = set(np.flatnonzero(~keep).tolist()) | \
+            set(remaining[list(drop_corr)].tolist())
+        self.drop_ = [cols[i] for i in sorted(dropped)]
+
+        return self
@@ -7,12 +7,12 @@ from __future__ import print_function
 import numpy as np
 import pandas as pd
 
-from skoot.decomposition import QRDecomposition
+from skoot.decomposition import QRDecomposition, _dqrutl
 from skoot.feature_selection import LinearCombinationFilter
 from skoot.feature_selection.combos import _enum_lc
 from skoot.testing import assert_raises
 
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 from sklearn.datasets import load_iris
 
 # Def data for testing
@@ -190,6 +190,17 @@ def test_linear_combos():
     assert_raises(ValueError, LinearCombinationFilter(cols=['A']).fit, Z)
 
 
+def test_linear_combos_too_large_for_fortran():
+    # matrices too large for the Fortran routines are factored in chunks
+    limit = _dqrutl._MAX_FORTRAN_ELEMENTS
+    try:
+        _dqrutl._MAX_FORTRAN_ELEMENTS = 10
+        lcf = LinearCombinationFilter().fit(Z)
+    finally:
+        _dqrutl._MAX_FORTRAN_ELEMENTS = limit
+    assert lcf.drop_ == ['C'], lcf.drop_
+
+
 def test_enum_lc():
     z = np.array([
         [1, 2, 3],
@@ -203,3 +214,43 @@ def test_enum_lc():
     assert not _enum_lc(QRDecomposition(iris.data))
 
     assert_array_equal(_enum_lc(QRDecomposition(y))[0], np.array([2, 1]))
+
+
+def test_nested_linear_combos():
+    # chains of nested combinations, interleaved with independent columns
+    rs = np.random.RandomState(42)
+    A = rs.rand(100, 4)
+    X_nested = pd.DataFrame.from_records(np.column_stack([
+        A[:, 0], A[:, 1], A[:, 0] + A[:, 1], A[:, 2],
+        A[:, 0] + 2 * A[:, 1] + A[:, 2], A[:, 3], A[:, 0] - A[:, 3]]),
+        columns=list('abcdefg'))
+
+    lcf = LinearCombinationFilter().fit(X_nested)
+    assert sorted(lcf.drop_) == ['c', 'e', 'g'], lcf.drop_
+
+
+def test_linear_combos_streaming():
+    # fitting in chunks finds the same combos as fitting all at once
+    lcf = LinearCombinationFilter(chunksize=16).fit(Z)
+    assert lcf.drop_ == ['C'], lcf.drop_
+    assert lcf.n_samples_seen_ == Z.shape[0]
+
+    lcf = LinearCombinationFilter()
+    for start in range(0, Z.shape[0], 40):
+        lcf.partial_fit(Z.iloc[start:start + 40])
+    assert lcf.drop_ == ['C'], lcf.drop_
+    assert lcf.n_samples_seen_ == Z.shape[0]
+    assert_array_equal(lcf.transform(Z).columns.values, ['A', 'B'])
+
+    # the streamed R factor matches that of a single fit
+    full = LinearCombinationFilter().fit(X)
+    lcf = LinearCombinationFilter()
+    for start in range(0, X.shape[0], 50):
+        lcf.partial_fit(X.iloc[start:start + 50])
+    assert not lcf.drop_
+    assert_array_almost_equal(np.abs(full.r_factor_),
+                              np.abs(lcf.r_factor_))
+
+    # later chunks must contain the fit columns
+    assert_raises(ValueError, lcf.partial_fit, Z)
+    assert_raises(ValueError, LinearCombinationFilter(chunksize=0).fit, Z)
@@ -7,10 +7,15 @@ from __future__ import print_function
 import numpy as np
 import pandas as pd
 
+import warnings
+
 from skoot.datasets import load_iris_df
 from skoot.testing import assert_raises
 from skoot.feature_selection import (FeatureFilter, SparseFeatureFilter,
-                                     MultiCorrFilter, NearZeroVarianceFilter)
+                                     MultiCorrFilter, NearZeroVarianceFilter,
+                                     ScreeningFilter)
+from skoot.feature_selection._corr import correlation_matrix, CoMoments
+from skoot.feature_selection._sketch import HeavyHitters
 
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
@@ -97,6 +102,379 @@ def test_mcf_iris_medium_thresh():
         np.array([0.69976926,  0.47160736,  0.81375684,  0.78431371]))
 
 
+def test_correlation_matrix():
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.randn(100, 6), columns=list('abcdef'))
+    X['b'] += X['a']
+    X['c'] = np.round(X['c'])  # ties
+    X['f'] = 0.1  # constant
+
+    for method in ('pearson', 'spearman', 'kendall'):
+        # the constant column has no correlation. Depending on its version
+        # and the method, pandas may report rounding noise or 1 instead
+        expected = X.corr(method=method).values
+        expected[-1, :] = expected[:, -1] = np.nan
+        for n_jobs in (1, 2):
+            corr = correlation_matrix(X.values, method=method,
+                                      n_jobs=n_jobs)
+            assert_array_almost_equal(corr, expected)
+
+    # the tiles are mirrored across the diagonal
+    from skoot.feature_selection import _corr
+    tile, _corr._CORR_TILE = _corr._CORR_TILE, 4
+    try:
+        expected = X.corr().values
+        expected[-1, :] = expected[:, -1] = np.nan
+        assert_array_almost_equal(correlation_matrix(X.values), expected)
+    finally:
+        _corr._CORR_TILE = tile
+
+    assert_raises(ValueError, correlation_matrix, X.values, method='foo')
+
+
+def test_mcf_tiled():
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.randn(200, 12), columns=list('abcdefghijkl'))
+    for i in range(4):  # correlated pairs
+        X.iloc[:, i + 4] = X.iloc[:, i] + rs.randn(200) * 0.3
+    X['l'] = 1.  # constant
+
+    # use tiles smaller than the frame
+    from skoot.feature_selection import _corr
+    tile, _corr._CORR_TILE = _corr._CORR_TILE, 5
+    try:
+        for method in ('pearson', 'spearman', 'kendall'):
+            dense = MultiCorrFilter(threshold=0.8, method=method,
+                                    tiled=False).fit(X)
+            tiled = MultiCorrFilter(threshold=0.8, method=method,
+                                    tiled=True).fit(X)
+            assert dense.drop_, method
+            assert tiled.drop_ == dense.drop_, (method, tiled.drop_)
+            assert_array_almost_equal(tiled.mean_abs_correlations_,
+                                      dense.mean_abs_correlations_)
+
+            # the pairs are those of the upper triangle above the threshold
+            mean_abs, rows, cols, values = _corr.thresholded_correlations(
+                X.values, 0.8, method=method)
+            corr = X.corr(method=method).values
+            assert (rows < cols).all()
+            assert_array_almost_equal(values, corr[rows, cols])
+            assert sorted(zip(rows, cols)) == \
+                list(zip(*np.where(np.triu(np.abs(corr), 1) > 0.8)))
+    finally:
+        _corr._CORR_TILE = tile
+
+    assert_raises(ValueError, MultiCorrFilter(tiled='foo').fit, X)
+
+
+def _naive_exact_drops(X, threshold):
+    # re-compute the MACs of the remaining features on every iteration
+    corr = np.abs(X.corr().values)
+    remaining = list(range(X.shape[1]))
+    drops = []
+    while True:
+        sub = corr[np.ix_(remaining, remaining)]
+        paired = (np.triu(sub, 1) > threshold)
+        paired = paired.any(axis=0) | paired.any(axis=1)
+        if not paired.any():
+            return sorted(X.columns[drops].tolist())
+        mac = np.nanmean(sub, axis=0)
+        mac[~paired] = -1
+        drops.append(remaining.pop(int(np.argmax(mac))))
+
+
+def test_mcf_exact():
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.randn(300, 30))
+    for i in range(10, 30):  # chains of (more or less) correlated features
+        X[i] = X[i - 10] + X[(i + 1) % 10] * 0.5 + \
+            rs.randn(300) * (0.2 + 0.1 * (i % 10))
+    X[30] = 1.  # constant
+
+    from skoot.feature_selection import _corr
+    tile, _corr._CORR_TILE = _corr._CORR_TILE, 7
+    try:
+        for threshold in (0.5, 0.7, 0.9):
+            expected = _naive_exact_drops(X, threshold)
+            assert expected, threshold
+            for tiled in (False, True):
+                mcf = MultiCorrFilter(threshold=threshold, exact=True,
+                                      tiled=tiled).fit(X)
+                assert sorted(mcf.drop_) == expected, (threshold, tiled)
+    finally:
+        _corr._CORR_TILE = tile
+
+    # it differs from the fast method, and leaves no correlated pairs
+    assert mcf.drop_ != MultiCorrFilter(threshold=0.9).fit(X).drop_
+    kept = X.drop(mcf.drop_, axis=1).corr().abs().values
+    assert not (np.triu(kept, 1) > 0.9).any()
+
+    # the drop path is exact at higher thresholds
+    mcf = MultiCorrFilter(threshold=0.5, exact=True).fit(X)
+    path = mcf.drop_path([0.5, 0.7, 0.9])
+    assert [sorted(d) for d in path] == \
+        [_naive_exact_drops(X, t) for t in (0.5, 0.7, 0.9)]
+
+    # as are the partial fits
+    mcf = MultiCorrFilter(threshold=0.7, exact=True)
+    mcf.partial_fit(X.iloc[:150]).partial_fit(X.iloc[150:])
+    assert sorted(mcf.drop_) == _naive_exact_drops(X, 0.7)
+
+
+def test_mcf_partial_fit():
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.randn(300, 6) * 100 + 1e4, columns=list('abcdef'))
+    X['e'] = X['a'] * 2. + rs.randn(300)
+    X['f'] = 0.1  # constant
+
+    full = MultiCorrFilter(threshold=0.8).fit(X)
+    mcf = MultiCorrFilter(threshold=0.8)
+    for start in range(0, 300, 70):
+        mcf.partial_fit(X.iloc[start:start + 70])
+
+    assert mcf.comoments_.n_samples == 300
+    assert mcf.fit_cols_ == X.columns.tolist()
+    assert mcf.drop_ == full.drop_ == ['a'], mcf.drop_
+    assert_array_almost_equal(mcf.mean_abs_correlations_,
+                              full.mean_abs_correlations_)
+    assert_array_almost_equal(mcf.comoments_.correlation(),
+                              correlation_matrix(X.values))
+    assert_array_equal(mcf.transform(X).columns, full.transform(X).columns)
+
+    # statistics from separate workers can be merged in any order
+    parts = [CoMoments().update(X.values[s:s + 100])
+             for s in (200, 0, 100)]
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+    assert_array_almost_equal(merged.mean, X.values.mean(axis=0))
+    assert_array_almost_equal(merged.correlation(),
+                              correlation_matrix(X.values))
+
+    # the pairs are only derived when they're accessed
+    mcf.partial_fit(X.iloc[:10])
+    assert mcf._pairs_outdated
+    assert mcf.drop_ == ['a']
+    assert not mcf._pairs_outdated
+
+    # and are reduced in tiles if tiled
+    from skoot.feature_selection import _corr
+    tile, _corr._CORR_TILE = _corr._CORR_TILE, 4
+    try:
+        for exact in (False, True):
+            tiled = MultiCorrFilter(threshold=0.8, tiled=True, exact=exact)
+            for start in range(0, 300, 70):
+                tiled.partial_fit(X.iloc[start:start + 70])
+            assert tiled.drop_ == full.drop_
+            assert_array_almost_equal(tiled.mean_abs_correlations_,
+                                      full.mean_abs_correlations_)
+            assert_array_almost_equal(tiled.correlated_pairs_[2],
+                                      full.correlated_pairs_[2])
+    finally:
+        _corr._CORR_TILE = tile
+
+    # a fit starts over, and a partial_fit continues from it
+    mcf.fit(X.iloc[:200]).partial_fit(X.iloc[200:])
+    assert mcf.comoments_.n_samples == 300
+    assert mcf.drop_ == full.drop_
+    assert_array_almost_equal(mcf.mean_abs_correlations_,
+                              full.mean_abs_correlations_)
+
+    # chunks must contain the fit columns
+    assert_raises(ValueError, mcf.partial_fit, X[['a', 'b']])
+
+    # a tiled fit does not keep the co-moments to continue from
+    tiled = MultiCorrFilter(threshold=0.8, tiled=True).fit(X)
+    assert tiled.comoments_ is None
+    assert_raises(ValueError, tiled.partial_fit, X)
+
+    # rank correlations cannot be accumulated
+    assert_raises(ValueError,
+                  MultiCorrFilter(method='spearman').partial_fit, X)
+
+
+def test_nzv_ratios_dtypes():
+    rs = np.random.RandomState(42)
+    n = 500
+    X = pd.DataFrame({
+        'float': np.round(rs.randn(n), 1),
+        'float_nan': np.where(rs.rand(n) < 0.2, np.nan, rs.randint(3, size=n)),
+        'zeros': np.where(rs.rand(n) < 0.5, 0., -0.),
+        'int': rs.randint(5, size=n),
+        'wide_int': rs.choice([-10 ** 12, 0, 10 ** 12], size=n,
+                              p=[0.1, 0.6, 0.3]),
+        'bool': rs.rand(n) < 0.9,
+        'str': rs.choice(['a', 'b', 'c', None], size=n),
+        'cat': pd.Categorical(rs.choice(['x', 'y'], size=n, p=[0.8, 0.2])),
+        'const': np.ones(n, dtype=int)})
+
+    def expected(series):
+        vc = series.value_counts()
+        return np.inf if vc.shape[0] < 2 else vc.iloc[0] / vc.iloc[1]
+
+    for n_jobs in (1, 2):
+        nzv = NearZeroVarianceFilter(n_jobs=n_jobs).fit(X)
+        assert_array_almost_equal(nzv.ratios_,
+                                  [expected(X[c]) for c in X.columns])
+    assert nzv.ratios_[list(X.columns).index('zeros')] == np.inf
+
+
+def test_nzv_partial_fit():
+    rs = np.random.RandomState(42)
+    n = 1000
+    X = pd.DataFrame({
+        'int': rs.choice(4, size=n, p=[0.9, 0.05, 0.03, 0.02]),
+        'str': rs.choice(['a', 'b', None], size=n, p=[0.6, 0.3, 0.1]),
+        'float': np.where(rs.rand(n) < 0.5, 0., rs.randn(n)),
+        'const': np.ones(n)})
+    full = NearZeroVarianceFilter(freq_cut=10.).fit(X)
+
+    # with few enough distinct values, the sketches are exact
+    nzv = NearZeroVarianceFilter(freq_cut=10., sketch_size=n)
+    for start in range(0, n, 300):
+        nzv.partial_fit(X.iloc[start:start + 300])
+    assert_array_almost_equal(nzv.ratios_, full.ratios_)
+    assert_array_almost_equal(nzv.ratio_bounds_,
+                              np.column_stack([full.ratios_] * 2))
+    assert nzv.drop_ == full.drop_ == ['int', 'float', 'const'], nzv.drop_
+
+    # with a small sketch, the true ratios are within the bounds
+    nzv = NearZeroVarianceFilter(freq_cut=10., sketch_size=3)
+    for start in range(0, n, 100):
+        nzv.partial_fit(X.iloc[start:start + 100])
+    lower, upper = nzv.ratio_bounds_.T
+    assert (lower <= full.ratios_).all() and (full.ratios_ <= upper).all()
+    float_sketch = nzv.sketches_[2]
+    assert float_sketch.counts.shape[0] <= 3
+    assert 0 < float_sketch.error <= n / 4.
+    assert float_sketch.counts[0.] <= (X['float'] == 0).sum() <= \
+        float_sketch.counts[0.] + float_sketch.error
+
+    # sketches of separate chunks can be merged in any order
+    parts = [HeavyHitters(3).update(X['float'].values[s:s + 250])
+             for s in (750, 250, 0, 500)]
+    merged = parts[0].merge(parts[1]).merge(parts[2]).merge(parts[3])
+    assert merged.n_samples == n
+    assert merged.error <= n / 4.
+    assert merged.top_two()[0] <= (X['float'] == 0).sum()
+
+    # a fit starts over, and a partial_fit continues from it
+    nzv = NearZeroVarianceFilter(freq_cut=10., sketch_size=n)
+    nzv.partial_fit(X.iloc[:100]).fit(X.iloc[:600]).partial_fit(X.iloc[600:])
+    assert [sketch.n_samples for sketch in nzv.sketches_] == \
+        X.notnull().sum().tolist()
+    assert_array_almost_equal(nzv.ratios_, full.ratios_)
+    assert nzv.drop_ == full.drop_
+
+    # chunks must contain the fit columns
+    assert_raises(ValueError, nzv.partial_fit, X[['int']])
+    assert_raises(ValueError, HeavyHitters, 1)
+
+
+def test_screening_filter():
+    rs = np.random.RandomState(42)
+    n = 300
+    X = pd.DataFrame(rs.randn(n, 6), columns=list('abcdef'))
+    X['b'] = X['a'] * 2 + rs.randn(n) * 0.1  # correlated with a
+    X['c'] = np.where(rs.rand(n) < 0.7, np.nan, X['c'])  # sparse
+    X['d'] = np.where(rs.rand(n) < 0.97, 1., X['d'])  # near-zero variance
+    X['g'] = X['e'] - X['f'] + rs.randn(n) * 0.01  # a combination
+    X['h'] = np.where(X['c'].isnull(), np.nan, X['e'])  # sparse, correlated
+
+    # the same as the three filters in sequence
+    sparse_out = SparseFeatureFilter(threshold=0.5).fit_transform(X)
+    nzv_out = NearZeroVarianceFilter(freq_cut=10.).fit_transform(sparse_out)
+    mcf = MultiCorrFilter(threshold=0.7).fit(nzv_out)
+    expected = mcf.transform(nzv_out)
+
+    for n_jobs in (1, 2):
+        screen = ScreeningFilter(sparsity_threshold=0.5, freq_cut=10.,
+                                 corr_threshold=0.7, n_jobs=n_jobs).fit(X)
+        assert_array_equal(screen.transform(X).columns, expected.columns)
+        assert set(screen.drop_) - {'a', 'b'} == {'c', 'd', 'h'}, \
+            screen.drop_
+        assert len(screen.drop_) == X.shape[1] - expected.shape[1]
+        assert screen.corr_cols_ == nzv_out.columns.tolist()
+        assert_array_almost_equal(screen.mean_abs_correlations_,
+                                  mcf.mean_abs_correlations_)
+        assert_array_almost_equal(
+            screen.sparsity_,
+            SparseFeatureFilter(threshold=0.5).fit(X).sparsity_)
+        assert_array_almost_equal(
+            screen.ratios_, NearZeroVarianceFilter().fit(X).ratios_)
+
+    # the statistics are the same when scanned in many blocks of rows
+    from skoot.feature_selection import select
+    X['i'] = rs.randint(3, size=n)
+    X['j'] = rs.rand(n) < 0.98
+    block_elements = select._SCREEN_BLOCK_ELEMENTS
+    select._SCREEN_BLOCK_ELEMENTS = 7 * X.shape[1]
+    try:
+        blocked = ScreeningFilter(sparsity_threshold=0.5, freq_cut=10.,
+                                  corr_threshold=0.7).fit(X)
+    finally:
+        select._SCREEN_BLOCK_ELEMENTS = block_elements
+    whole = ScreeningFilter(sparsity_threshold=0.5, freq_cut=10.,
+                            corr_threshold=0.7).fit(X)
+    assert blocked.drop_ == whole.drop_
+    assert 'j' in whole.drop_ and 'i' not in whole.drop_
+    assert_array_almost_equal(blocked.sparsity_, whole.sparsity_)
+    assert_array_almost_equal(blocked.ratios_, whole.ratios_)
+    assert_array_almost_equal(
+        whole.ratios_, NearZeroVarianceFilter().fit(X).ratios_)
+    assert_array_almost_equal(blocked.mean_abs_correlations_,
+                              whole.mean_abs_correlations_)
+
+    # columns that survive to the correlation rule must be finite
+    assert_raises(ValueError, ScreeningFilter(sparsity_threshold=0.9).fit, X)
+
+    # and the columns must be numeric
+    X['k'] = 'x'
+    assert_raises(ValueError, ScreeningFilter().fit, X)
+
+
+def test_drop_path():
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.randn(200, 8), columns=list('abcdefgh'))
+    for i in range(4):  # correlated to varying degrees
+        X.iloc[:, i + 4] = X.iloc[:, i] + rs.randn(200) * (i + 1) * 0.25
+
+    # the path matches refitting at each threshold
+    thresholds = [0.5, 0.7, 0.8, 0.9, 0.95]
+    for tiled in (False, True):
+        mcf = MultiCorrFilter(threshold=0.5, tiled=tiled).fit(X)
+        path = mcf.drop_path(thresholds)
+        assert path[0] == mcf.drop_
+        assert path == [MultiCorrFilter(threshold=t).fit(X).drop_
+                        for t in thresholds]
+        assert len(set(map(tuple, path))) > 2  # the path isn't trivial
+
+        # pairs below the fitted threshold weren't kept
+        assert_raises(ValueError, mcf.drop_path, [0.4])
+
+    # sparsity
+    X_nan = X.copy()
+    for i, c in enumerate(X_nan.columns):
+        X_nan.loc[:i * 20, c] = np.nan
+    thresholds = [0., 0.2, 0.45, 0.7]
+    sff = SparseFeatureFilter(threshold=0.1).fit(X_nan)
+    assert sff.drop_path(thresholds) == \
+        [SparseFeatureFilter(threshold=t).fit(X_nan).drop_
+         for t in thresholds]
+    assert_raises(ValueError, sff.drop_path, [1.5])
+
+    # frequency cuts
+    X_cat = pd.DataFrame({'a': [1] * 90 + [2] * 10,
+                          'b': [1] * 60 + [2] * 40,
+                          'c': [1] * 97 + [2] * 3,
+                          'd': [1] * 100})
+    freq_cuts = [1.4, 5., 20., 50.]
+    nzv = NearZeroVarianceFilter().fit(X_cat)
+    assert nzv.drop_path(freq_cuts) == \
+        [NearZeroVarianceFilter(freq_cut=f).fit(X_cat).drop_
+         for f in freq_cuts]
+    assert nzv.drop_path([1.4])[0] == ['a', 'b', 'c', 'd']
+    assert_raises(ValueError, nzv.drop_path, [0.5])
+
+
 def test_mcf_non_finite():
     mcf = MultiCorrFilter(threshold=0.75)
     assert_raises(ValueError, mcf.fit, sparse)
@@ -127,6 +505,53 @@ def test_feature_filter_some():
     assert trans.equals(iris[['c', 'd']])
 
 
+def test_feature_filter_views():
+    X = iris.copy()
+
+    # a contiguous block of kept columns is sliced without a copy
+    dpr = FeatureFilter(cols=['a'], copy=False).fit(X)
+    view = dpr.transform(X)
+    assert view.equals(iris[['b', 'c', 'd']])
+    assert np.shares_memory(view.values, X.values)
+
+    # but it is copied by default
+    trans = FeatureFilter(cols=['a']).fit_transform(X)
+    assert trans.equals(view)
+    assert not np.shares_memory(trans.values, X.values)
+
+    # non-contiguous columns are always copied, in the input order
+    dpr = FeatureFilter(cols=['b', 'c'], copy=False).fit(X)
+    trans = dpr.transform(X)
+    assert trans.equals(iris[['a', 'd']])
+    assert not np.shares_memory(trans.values, X.values)
+
+    # as do the arrays when as_df=False
+    dpr = FeatureFilter(cols=['d'], as_df=False, copy=False).fit(X)
+    arr = dpr.transform(X)
+    assert_array_equal(arr, iris[['a', 'b', 'c']].values)
+    assert np.shares_memory(arr, X.values)
+
+    # nothing dropped returns the frame itself with copy=False
+    dpr = FeatureFilter(copy=False).fit(X)
+    assert dpr.transform(X) is X
+    assert dpr.get_params()['copy'] is False
+
+    # the input is never modified
+    assert X.equals(iris)
+
+
+def test_feature_filter_missing_drop():
+    # drops 'c', which is not in X
+    dpr = SparseFeatureFilter(threshold=0.5).fit(sparse)
+    X = sparse[['a', 'b']]
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        trans = dpr.transform(X)
+    assert any(issubclass(x.category, UserWarning) for x in w)
+    assert trans.equals(X)
+
+
 def test_sparse_filter():
     sps_filter = SparseFeatureFilter(threshold=0.5)
     trans = sps_filter.fit_transform(sparse)
@@ -136,6 +561,64 @@ def test_sparse_filter():
     assert 'c' not in trans.columns
 
 
+def test_sparse_filter_chunked():
+    from skoot.feature_selection import select
+    rs = np.random.RandomState(42)
+    X = pd.DataFrame(rs.rand(1000, 6), columns=list('abcdef'))
+    X[X < np.array([0., .1, .45, .55, .9, 1.])] = np.nan
+    X['g'] = ['x'] * 700 + [None] * 300  # an object column
+
+    expected = X.isnull().mean().values
+    sps = SparseFeatureFilter(threshold=0.5).fit(X)
+    assert_array_almost_equal(sps.sparsity_, expected)
+    assert sps.drop_ == ['d', 'e', 'f']
+
+    # count a few rows at a time, so the columns can exit early
+    chunk_rows = select._SPARSITY_CHUNK_ROWS
+    select._SPARSITY_CHUNK_ROWS = 64
+    try:
+        for cols in (None, ['g', 'f', 'a']):
+            exact = SparseFeatureFilter(cols=cols, threshold=0.5).fit(X)
+            early = SparseFeatureFilter(cols=cols, threshold=0.5,
+                                        early_exit=True).fit(X)
+            assert early.drop_ == exact.drop_
+
+            # the early sparsity is a lower bound, and exits 'a' and 'f'
+            assert (early.sparsity_ <= exact.sparsity_ + 1e-12).all()
+            assert early.sparsity_[early.fit_cols_.index('a')] == 0.
+            assert early.sparsity_[early.fit_cols_.index('f')] < 1.
+    finally:
+        select._SPARSITY_CHUNK_ROWS = chunk_rows
+
+    # partial fits over chunks match the fit
+    sps = SparseFeatureFilter(threshold=0.5)
+    for start in range(0, 1000, 300):
+        sps.partial_fit(X.iloc[start:start + 300])
+    assert sps.n_samples_seen_ == 1000
+    assert_array_almost_equal(sps.sparsity_, expected)
+    assert sps.drop_ == ['d', 'e', 'f']
+
+    # a fit starts over
+    head = X.iloc[:10]
+    sps.fit(head)
+    assert sps.n_samples_seen_ == 10
+    assert sps.drop_ == head.columns[head.isnull().mean() > 0.5].tolist()
+
+    # and a partial_fit continues from it
+    sps.partial_fit(X.iloc[10:])
+    assert sps.n_samples_seen_ == 1000
+    assert_array_almost_equal(sps.sparsity_, expected)
+    assert sps.drop_ == ['d', 'e', 'f']
+
+    # later chunks must contain the fit columns
+    assert_raises(ValueError, sps.partial_fit, X[['a', 'b']])
+
+    # the counts of an early exit are incomplete, so can't be continued
+    early = SparseFeatureFilter(threshold=0.5, early_exit=True).fit(X)
+    assert early.null_counts_ is None
+    assert_raises(ValueError, early.partial_fit, X)
+
+
 def test_sparse_filter_dense_data():
     sps_filter = SparseFeatureFilter(threshold=0.25)
     trans = sps_filter.fit_transform(iris)
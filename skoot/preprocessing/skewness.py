@@ -8,6 +8,7 @@ from __future__ import print_function, absolute_import, division
 
 import numpy as np
 from abc import ABCMeta, abstractmethod
+from functools import partial
 
 from scipy import optimize
 from scipy.stats import boxcox
@@ -17,6 +18,7 @@ from sklearn.externals.joblib import Parallel, delayed
 from sklearn.utils.validation import check_is_fitted
 
 from ..base import BasePDTransformer
+from ..utils._parallel import choose_backend, shared_memmap
 from ..utils.validation import (check_dataframe, validate_multiple_rows,
                                 validate_test_set_columns)
 
@@ -28,7 +30,20 @@ __all__ = [
 ZERO = 1E-16
 
 
-def _bc_est_lam(y, min_value):
+# The half-width of the bracket around a previous lambda when warm-starting
+# the estimation. Brent's method expands it downhill if the optimum has moved
+# further than this.
+_WARM_START_STEP = 0.1
+
+
+def _warm_start_bracket(lam, brack):
+    # Start the search from the previous optimum, if there is one
+    if lam is None:
+        return brack
+    return lam - _WARM_START_STEP, lam + _WARM_START_STEP
+
+
+def _bc_est_lam(y, min_value, weights=None, lam=None):
     """Estimate the lambda param for box-cox transformations.
 
     Estimate lambda for a single y, given a range of lambdas
@@ -38,37 +53,70 @@ def _bc_est_lam(y, min_value):
     ----------
     y : np.ndarray, shape (n_samples,)
        The vector from which lambda is being estimated
+
+    min_value : float
+       The floor for values in ``y``.
+
+    weights : np.ndarray or None, shape (n_samples,), optional
+       The weight of each value in ``y``. If provided, ``y`` and ``weights``
+       are a weighted histogram summary of the data.
+
+    lam : float or None, optional
+       A previous estimate of lambda from which to warm-start the search.
     """
     # ensure is array, floor at min_value
     y = np.maximum(np.asarray(y), min_value)
 
     # Use scipy's log-likelihood estimator
-    b = boxcox(y, lmbda=None)
+    if weights is None and lam is None:
+        b = boxcox(y, lmbda=None)
+
+        # Return lambda corresponding to maximum P
+        return b[1]
+
+    # Otherwise maximize the (weighted) LLF, starting near the old lambda
+    return optimize.brent(lambda lmb: -_bc_llf(y, lmb, weights),
+                          brack=_warm_start_bracket(lam, (-2.0, 2.0)))
+
+
+def _bc_llf(data, lmb, weights=None):
+    """Compute the Box-Cox log-likelihood function.
+
+    This is the same LLF maximized by ``scipy.stats.boxcox``, but allows
+    each value in ``data`` to carry a weight.
+    """
+    n = data.shape[0] if weights is None else weights.sum()
+    y_trans = np.log(data) if lmb == 0 else (data ** lmb - 1.) / lmb
+
+    y_mean = np.average(y_trans, weights=weights)
+    var = np.average((y_trans - y_mean) ** 2., weights=weights)
+
+    llf = (lmb - 1) * n * np.average(np.log(data), weights=weights)
+    llf -= n / 2.0 * np.log(var)
 
-    # Return lambda corresponding to maximum P
-    return b[1]
+    return llf
 
 
-def _yj_est_lam(y, brack):
+def _yj_est_lam(y, brack, weights=None, lam=None):
     y = np.asarray(y)
 
     # Use MLE to compute the optimal YJ parameter
     def _mle_opt(i, brck):
         def _eval_mle(lmb, data):
             # Function to minimize
-            return -_yj_llf(data, lmb)
+            return -_yj_llf(data, lmb, weights)
 
         return optimize.brent(_eval_mle, brack=brck, args=(i,))
 
-    return _mle_opt(y, brack)  # _mle(x, brack)
+    return _mle_opt(y, _warm_start_bracket(lam, brack))
 
 
-def _yj_llf(data, lmb):
+def _yj_llf(data, lmb, weights=None):
     """YJ-transform a vector.
 
     Transform a y vector given a single lambda value,
     and compute the log-likelihood function. No validation
-    is applied to the input.
+    is applied to the input, and the input is not modified.
 
     Parameters
     ----------
@@ -77,13 +125,18 @@ def _yj_llf(data, lmb):
 
     lmb : scalar
        The lambda value
+
+    weights : array-like or None, optional
+       The weight of each value in ``data``. If provided, ``data`` and
+       ``weights`` are a weighted histogram summary of the data.
     """
     # make into a numpy array, if not already one
     data = np.asarray(data)
-    n = data.shape[0]
+    n = data.shape[0] if weights is None else weights.sum()
 
-    # transform the vector
-    y_trans = _yj_transform_y(data, lmb)
+    # transform a copy of the vector, since the optimizer will evaluate
+    # the LLF on the same data many times
+    y_trans = _yj_transform_y(np.array(data), lmb)
 
     # We can't take the canonical log of data, as there could be
     # zeros or negatives. Thus, we need to shift both distributions
@@ -91,7 +144,7 @@ def _yj_llf(data, lmb):
     min_d, min_y = np.min(data), np.min(y_trans)
     if min_d < ZERO:
         shift = np.abs(min_d) + 1
-        data += shift
+        data = data + shift
 
     # Same goes for Y
     if min_y < ZERO:
@@ -99,8 +152,8 @@ def _yj_llf(data, lmb):
         y_trans += shift
 
     # Compute mean on potentially shifted data
-    y_mean = np.mean(y_trans, axis=0)
-    var = np.sum((y_trans - y_mean) ** 2. / n, axis=0)
+    y_mean = np.average(y_trans, weights=weights)
+    var = np.average((y_trans - y_mean) ** 2., weights=weights)
 
     # If var is 0.0, we'll get a warning. Means all the
     # values were nearly identical in y, so we will return
@@ -108,12 +161,69 @@ def _yj_llf(data, lmb):
     if 0 == var:
         return np.nan
 
-    llf = (lmb - 1) * np.sum(np.log(data), axis=0)
+    llf = (lmb - 1) * n * np.average(np.log(data), weights=weights)
     llf -= n / 2.0 * np.log(var)
 
     return llf
 
 
+def _merge_histogram(centers, weights, y, max_bins):
+    """Merge a chunk of values into a weighted histogram summary.
+
+    The summary is a sorted vector of bin centers and their weights (counts).
+    The new values are counted, merged with the existing bins, and if there
+    are more than ``max_bins`` bins, consecutive bins are pooled into groups
+    of roughly equal weight. Each pooled bin is centered on the weighted
+    mean of its members, so the total weight and the mean of the summary are
+    preserved exactly. The cost is proportional to the size of the new chunk
+    plus ``max_bins``.
+
+    Parameters
+    ----------
+    centers : np.ndarray or None, shape (n_bins,)
+        The sorted bin centers of the existing summary, or None for a new
+        summary.
+
+    weights : np.ndarray or None, shape (n_bins,)
+        The weights of the existing bins, or None for a new summary.
+
+    y : array-like, shape (n_samples,)
+        The new chunk of values.
+
+    max_bins : int
+        The maximum number of bins to keep.
+
+    Returns
+    -------
+    centers : np.ndarray, shape (n_bins,)
+        The merged bin centers, in sorted order.
+
+    weights : np.ndarray, shape (n_bins,)
+        The merged bin weights.
+    """
+    values, counts = np.unique(y, return_counts=True)
+    counts = counts.astype(np.float64)
+
+    if centers is not None:
+        values = np.concatenate([centers, values])
+        counts = np.concatenate([weights, counts])
+        order = np.argsort(values, kind='mergesort')
+        values, counts = values[order], counts[order]
+
+    if values.shape[0] <= max_bins:
+        return values, counts
+
+    # assign each bin to a group by the weight that precedes it, which
+    # yields max_bins consecutive groups of roughly equal weight
+    preceding = np.cumsum(counts) - counts
+    groups = np.floor(preceding * max_bins / counts.sum()).astype(np.int64)
+    starts = np.flatnonzero(np.concatenate([[True],
+                                            groups[1:] != groups[:-1]]))
+
+    pooled = np.add.reduceat(counts, starts)
+    return np.add.reduceat(values * counts, starts) / pooled, pooled
+
+
 def _yj_transform_y(y, lam):
     # should already be a vec, but just gotta be sure
     y = np.asarray(y)
@@ -169,13 +279,156 @@ def _yj_transform_y(y, lam):
     return y
 
 
+def _estimate_lambda(estimation_function, X, i, max_bins):
+    # Only copy out the column being estimated. The block itself is either
+    # shared between threads or memory-mapped for processes, so it is never
+    # pickled on its way to the workers. The column is also summarized so
+    # the transformer can later be updated with partial_fit.
+    y = np.array(X[:, i])
+    centers, weights = _merge_histogram(None, None, y, max_bins)
+    return estimation_function(y), centers, weights
+
+
+def _update_lambda(estimation_function, X, i, max_bins, centers, weights,
+                   lam):
+    # Merge the new column into its summary, and re-estimate lambda from the
+    # summary, starting from the previous lambda (if any)
+    centers, weights = _merge_histogram(centers, weights, X[:, i], max_bins)
+    lam = estimation_function(centers, weights=weights, lam=lam)
+    return lam, centers, weights
+
+
+def _bc_transform_block(Y, lambdas, min_value, out):
+    """Box-Cox transform a block of features.
+
+    Each column of ``Y`` is transformed by its corresponding lambda, which
+    is broadcast down the rows. ``out`` may be ``Y`` itself, in which case
+    the block is transformed in place. The power treatment is computed as
+    ``expm1(lam * log(y)) / lam``, which (unlike ``(y ** lam - 1) / lam``)
+    keeps its precision as lambda approaches zero.
+    """
+    y = np.maximum(Y, min_value)
+
+    # if lam is not "zero", y gets the power treatment. Otherwise it gets
+    # logged (the power lambda is set to 1 just so it's well-defined)
+    power = lambdas > ZERO
+    lam = np.where(power, lambdas, 1.)
+    log_y = np.log(y)
+    res = np.expm1(lam * log_y) / lam
+    np.copyto(res, log_y, where=~power)
+
+    out[...] = res
+    return out
+
+
+def _bc_inverse_block(Y, lambdas, out):
+    """Invert the Box-Cox transformation of a block of features.
+
+    Note that values that were floored at ``min_value`` prior to the
+    transformation cannot be recovered, and are mapped back to
+    ``min_value``. The power treatment is inverted as
+    ``exp(log1p(lam * Y) / lam)`` to keep its precision for small lambdas.
+    """
+    power = lambdas > ZERO
+    lam = np.where(power, lambdas, 1.)
+    res = np.exp(np.log1p(Y * lam) / lam)
+    np.exp(Y, out=res, where=~power)
+
+    out[...] = res
+    return out
+
+
+def _yj_exponents(positive, lambdas):
+    # Get the element-wise exponents for the YJ transformation, and a mask
+    # of the elements that take the log treatment instead. Positive values
+    # are raised to lambda (or logged if lambda is "zero"), and negative
+    # values to 2 - lambda (or logged if lambda is two).
+    lam_gt_zero = lambdas > ZERO
+    lam_eq_two = lambdas == 2.
+
+    logged = np.where(positive, ~lam_gt_zero, lam_eq_two)
+    exponents = np.where(positive, lambdas, 2. - lambdas)
+    exponents[logged] = 1.
+    return exponents, logged
+
+
+def _yj_transform_block(Y, lambdas, out):
+    """Yeo-Johnson transform a block of features.
+
+    This is the vectorized equivalent of ``_yj_transform_y`` applied to each
+    column of ``Y`` with its corresponding lambda. Since every case of the
+    transformation is antisymmetric in the sign of ``y``, it's computed on
+    ``|y| + 1`` and the sign is re-applied afterwards. As for Box-Cox, the
+    power treatment is computed with ``expm1`` and ``log1p`` to keep its
+    precision as the exponent approaches zero.
+    """
+    positive = Y >= 0
+    exponents, logged = _yj_exponents(positive, lambdas)
+
+    log_a = np.log1p(np.abs(Y))  # log(|y| + 1)
+    res = np.expm1(exponents * log_a) / exponents
+    np.copyto(res, log_a, where=logged)
+    np.negative(res, out=res, where=~positive)
+
+    out[...] = res
+    return out
+
+
+def _yj_inverse_block(Y, lambdas, out):
+    """Invert the Yeo-Johnson transformation of a block of features.
+
+    The transformation preserves the sign of its input, so the sign of each
+    transformed value determines which case to invert.
+    """
+    positive = Y >= 0
+    exponents, logged = _yj_exponents(positive, lambdas)
+
+    a = np.abs(Y)
+    res = np.expm1(np.log1p(a * exponents) / exponents)
+    np.expm1(a, out=res, where=logged)
+    np.negative(res, out=res, where=~positive)
+
+    out[...] = res
+    return out
+
+
 class _BaseSkewnessTransformer(six.with_metaclass(ABCMeta, BasePDTransformer)):
-    def __init__(self, cols=None, n_jobs=1, as_df=True):
+    def __init__(self, cols=None, n_jobs=1, as_df=True, chunksize=None,
+                 max_bins=1000, copy=True):
 
         super(_BaseSkewnessTransformer, self).__init__(
             cols=cols, as_df=as_df)
 
         self.n_jobs = n_jobs
+        self.chunksize = chunksize
+        self.max_bins = max_bins
+        self.copy = copy
+
+    def _estimate_columns(self, block, worker, *column_args):
+        # Run the worker over each column in parallel. Workers only receive
+        # column indices into a single numeric block, which is placed into
+        # shared memory once rather than shipped to the workers column by
+        # column. Any per-column args are passed along with the index.
+        n_jobs = self.n_jobs
+        backend = choose_backend(n_jobs, *block.shape)
+
+        with shared_memmap(block, backend) as shared:
+            results = Parallel(n_jobs=n_jobs, backend=backend)(
+                delayed(worker)(shared, i, *args)
+                for i, args in enumerate(zip(*column_args)))
+
+        # unzip the lambdas and the summaries
+        lambdas, centers, weights = (list(r) for r in zip(*results))
+        self.lambda_ = lambdas
+        self.bin_centers_ = centers
+        self.bin_weights_ = weights
+
+    def _validate_max_bins(self):
+        max_bins = self.max_bins
+        if int(max_bins) < 2:
+            raise ValueError("max_bins must be an int >= 2, but got %r"
+                             % max_bins)
+        return int(max_bins)
 
     def _fit(self, X, estimation_function):
         # check on state of X and cols (all cols need to be finite!)
@@ -183,26 +436,102 @@ class _BaseSkewnessTransformer(six.with_metaclass(ABCMeta, BasePDTransformer)):
 
         # ensure enough rows
         validate_multiple_rows(self.__class__.__name__, X)
+        max_bins = self._validate_max_bins()
 
         # Now estimate the lambdas in parallel
-        n_jobs = self.n_jobs
-        self.lambda_ = list(
-            Parallel(n_jobs=n_jobs)(
-                delayed(estimation_function)(X[i])
-                for i in cols))
+        block = np.asarray(X[cols].values, dtype=np.float64)
+        n_features = block.shape[1]
+        self._estimate_columns(
+            block, partial(_estimate_lambda, estimation_function),
+            [max_bins] * n_features)
 
         # set the fit cols
         self.fit_cols_ = cols
+        self.n_samples_seen_ = X.shape[0]
+
+        return self
 
+    def _partial_fit(self, X, estimation_function):
+        # check on state of X and cols (all cols need to be finite!)
+        X, cols = check_dataframe(X, cols=self.cols, assert_all_finite=True)
+        max_bins = self._validate_max_bins()
+
+        # if this is the first chunk, start new summaries
+        if not hasattr(self, 'bin_weights_'):
+            validate_multiple_rows(self.__class__.__name__, X)
+            n_features = len(cols)
+            centers, weights, lambdas = ([None] * n_features,
+                                         [None] * n_features,
+                                         [None] * n_features)
+            self.fit_cols_ = cols
+            self.n_samples_seen_ = 0
+
+        # otherwise update the summaries of the columns we fit on
+        else:
+            cols = self.fit_cols_
+            validate_test_set_columns(cols, X.columns)
+            n_features = len(cols)
+            centers, weights, lambdas = (self.bin_centers_,
+                                         self.bin_weights_,
+                                         self.lambda_)
+
+        block = np.asarray(X[cols].values, dtype=np.float64)
+        self._estimate_columns(
+            block, partial(_update_lambda, estimation_function),
+            [max_bins] * n_features, centers, weights, lambdas)
+
+        self.n_samples_seen_ += X.shape[0]
         return self
 
     @abstractmethod
-    def _transform_vector(self, y, lam):
+    def _transform_block(self, Y, lambdas, out):
+        """An abstract function for box-cox and YJ transformers.
+        This function should transform a block of features given the
+        pre-estimated lambda values (one per column), writing the result
+        into ``out``.
+        """
+
+    @abstractmethod
+    def _inverse_transform_block(self, Y, lambdas, out):
         """An abstract function for box-cox and YJ transformers.
-        This function should transform a vector given the pre-estimated
-        lambda value.
+        This function should invert the transformation of a block of
+        features given the pre-estimated lambda values (one per column),
+        writing the result into ``out``.
         """
 
+    def _apply_block(self, X, kernel):
+        check_is_fitted(self, 'lambda_')
+
+        # check on state of X and cols. If not copying, the transformed
+        # columns are written back into the caller's frame
+        X, _ = check_dataframe(X, cols=self.cols, assert_all_finite=True,
+                               copy=self.copy)
+
+        # validate the test columns
+        cols = self.fit_cols_
+        validate_test_set_columns(cols, X.columns)
+
+        chunksize = self.chunksize
+        if chunksize is not None and int(chunksize) < 1:
+            raise ValueError("chunksize must be a positive int or None, "
+                             "but got %r" % chunksize)
+
+        # we don't care how many samples are in the test set... just need
+        # > 1 for the fit/estimation procedure, but not the test set. The
+        # block is our own copy, so the kernel can work on it in place, one
+        # chunk of rows at a time.
+        block = np.asarray(X[cols].values, dtype=np.float64)
+        lambdas = np.asarray(self.lambda_, dtype=np.float64)
+        n_samples = block.shape[0]
+        step = max(n_samples, 1) if chunksize is None else int(chunksize)
+
+        for start in range(0, n_samples, step):
+            chunk = block[start:start + step]
+            kernel(chunk, lambdas, out=chunk)
+
+        X[cols] = block
+        return X if self.as_df else X.values
+
     def transform(self, X):
         """Apply the transformation to a dataframe.
 
@@ -210,34 +539,38 @@ class _BaseSkewnessTransformer(six.with_metaclass(ABCMeta, BasePDTransformer)):
         ----------
         X : pd.DataFrame, shape=(n_samples, n_features)
             The Pandas frame to transform. The operation will
-            be applied to a copy of the input data, and the result
-            will be returned.
+            be applied to a copy of the input data (unless ``copy`` is
+            False), and the result will be returned.
 
         Returns
         -------
         X : pd.DataFrame or np.ndarray, shape=(n_samples, n_features)
-            The operation is applied to a copy of ``X``,
-            and the result set is returned.
+            The operation is applied to a copy of ``X`` (or to ``X``
+            itself if ``copy`` is False), and the result set is returned.
         """
-        check_is_fitted(self, 'lambda_')
-
-        # check on state of X and cols
-        X, _ = check_dataframe(X, cols=self.cols, assert_all_finite=True)
+        return self._apply_block(X, self._transform_block)
 
-        # validate the test columns
-        cols = self.fit_cols_
-        validate_test_set_columns(cols, X.columns)
+    def inverse_transform(self, X):
+        """Map transformed data back to its original scale.
 
-        # we don't care how many samples are in the test set... just need
-        # > 1 for the fit/estimation procedure, but not the test set.
-        _, n_features = X.shape
-        lambdas_ = self.lambda_
+        The inverse transformation is applied to the fit columns of a copy
+        of ``X`` (or of ``X`` itself if ``copy`` is False), using the same
+        lambdas as the forward transformation.
 
-        # do transformations
-        for nm, lam in zip(cols, lambdas_):
-            X[nm] = self._transform_vector(X[nm], lam)
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The transformed Pandas frame. The operation will
+            be applied to a copy of the input data (unless ``copy`` is
+            False), and the result will be returned.
 
-        return X if self.as_df else X.values
+        Returns
+        -------
+        X : pd.DataFrame or np.ndarray, shape=(n_samples, n_features)
+            The operation is applied to a copy of ``X`` (or to ``X``
+            itself if ``copy`` is False), and the result set is returned.
+        """
+        return self._apply_block(X, self._inverse_transform_block)
 
 
 # A dumb hack bc we cannot pickle functions or instancemethods...
@@ -247,16 +580,16 @@ class _BCEstimator(object):
     def __init__(self, min_val):
         self.min_val = min_val
 
-    def __call__(self, y):
-        return _bc_est_lam(y, self.min_val)
+    def __call__(self, y, weights=None, lam=None):
+        return _bc_est_lam(y, self.min_val, weights=weights, lam=lam)
 
 
 class _YJEstimator(object):
     def __init__(self, brack):
         self.brack = brack
 
-    def __call__(self, y):
-        return _yj_est_lam(y, self.brack)
+    def __call__(self, y, weights=None, lam=None):
+        return _yj_est_lam(y, self.brack, weights=weights, lam=lam)
 
 
 class BoxCoxTransformer(_BaseSkewnessTransformer):
@@ -297,6 +630,10 @@ class BoxCoxTransformer(_BaseSkewnessTransformer):
        (n_cpus + 1 + n_jobs) are used. Thus for n_jobs = -2, all CPUs but
        one are used.
 
+       The numeric block is shared with the workers rather than copied to
+       them. Tall or narrow blocks are estimated with threads, while short,
+       wide blocks are memory-mapped once and estimated in worker processes.
+
     as_df : bool, optional (default=True)
         Whether to return a Pandas ``DataFrame`` in the ``transform``
         method. If False, will return a Numpy ``ndarray`` instead.
@@ -307,6 +644,24 @@ class BoxCoxTransformer(_BaseSkewnessTransformer):
         The minimum value as a ceiling function for values in prescribed
         features. Values below this amount will be set to ``min_value``.
 
+    chunksize : int or None, optional (default=None)
+        The number of rows to process at a time in ``transform`` and
+        ``inverse_transform``. The fit columns are extracted into a single
+        block which is transformed in place, one chunk of rows at a time,
+        bounding the size of any intermediate arrays. If None, the entire
+        block is processed at once.
+
+    max_bins : int, optional (default=1000)
+        The maximum number of bins in the weighted histogram that summarizes
+        each feature for ``partial_fit``. More bins estimate lambda from the
+        summary more precisely, at the cost of memory and estimation time.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` and ``inverse_transform`` should operate on a
+        copy of the input frame. If False, the transformed columns are
+        written back into the input frame itself (which is returned when
+        ``as_df`` is True), so the rest of the frame is not copied.
+
     Attributes
     ----------
     lambda_ : list
@@ -316,12 +671,24 @@ class BoxCoxTransformer(_BaseSkewnessTransformer):
         The list of column names on which the transformer was fit. This
         is used to validate the presence of the features in the test set
         during the ``transform`` stage.
+
+    bin_centers_ : list
+        The sorted bin centers of the weighted histogram summarizing each
+        feature, used to update the lambdas in ``partial_fit``.
+
+    bin_weights_ : list
+        The weights (counts) of the bins in ``bin_centers_``.
+
+    n_samples_seen_ : int
+        The number of samples the transformer has been fit on.
     """
 
-    def __init__(self, cols=None, n_jobs=1, as_df=True, min_value=1e-12):
+    def __init__(self, cols=None, n_jobs=1, as_df=True, min_value=1e-12,
+                 chunksize=None, max_bins=1000, copy=True):
 
         super(BoxCoxTransformer, self).__init__(
-            cols=cols, as_df=as_df, n_jobs=n_jobs)
+            cols=cols, as_df=as_df, n_jobs=n_jobs, chunksize=chunksize,
+            max_bins=max_bins, copy=copy)
 
         self.min_value = min_value
 
@@ -341,16 +708,33 @@ class BoxCoxTransformer(_BaseSkewnessTransformer):
         min_value = self.min_value
         return self._fit(X, estimation_function=_BCEstimator(min_value))
 
-    def _transform_vector(self, vec, lam):
-        # make a np array, make sure we've floored
-        y = np.maximum(np.asarray(vec), self.min_value)
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the transformer on a chunk of data.
+
+        Each feature is summarized as a weighted histogram of at most
+        ``max_bins`` bins. The new chunk is merged into the summaries, and
+        each lambda is re-estimated from its summary, starting from the
+        previous estimate. The cost of each call is proportional to the size
+        of the chunk, rather than to all of the data seen so far.
+
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. If the transformer has already been
+            fit, it must contain the ``fit_cols_``.
+
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
+        min_value = self.min_value
+        return self._partial_fit(
+            X, estimation_function=_BCEstimator(min_value))
 
-        # if lam is not "zero", y gets the power treatment:
-        if lam > ZERO:
-            return (y ** lam - 1.) / lam
+    def _transform_block(self, Y, lambdas, out):
+        return _bc_transform_block(Y, lambdas, self.min_value, out)
 
-        # otherwise, it gets logged
-        return np.log(y)
+    def _inverse_transform_block(self, Y, lambdas, out):
+        return _bc_inverse_block(Y, lambdas, out)
 
 
 class YeoJohnsonTransformer(_BaseSkewnessTransformer):
@@ -393,6 +777,10 @@ class YeoJohnsonTransformer(_BaseSkewnessTransformer):
        (n_cpus + 1 + n_jobs) are used. Thus for n_jobs = -2, all CPUs but
        one are used.
 
+       The numeric block is shared with the workers rather than copied to
+       them. Tall or narrow blocks are estimated with threads, while short,
+       wide blocks are memory-mapped once and estimated in worker processes.
+
     as_df : bool, optional (default=True)
         Whether to return a Pandas ``DataFrame`` in the ``transform``
         method. If False, will return a Numpy ``ndarray`` instead.
@@ -406,6 +794,24 @@ class YeoJohnsonTransformer(_BaseSkewnessTransformer):
         pair (xa, xb) does not always mean the obtained solution will
         satisfy xa <= x <= xb.
 
+    chunksize : int or None, optional (default=None)
+        The number of rows to process at a time in ``transform`` and
+        ``inverse_transform``. The fit columns are extracted into a single
+        block which is transformed in place, one chunk of rows at a time,
+        bounding the size of any intermediate arrays. If None, the entire
+        block is processed at once.
+
+    max_bins : int, optional (default=1000)
+        The maximum number of bins in the weighted histogram that summarizes
+        each feature for ``partial_fit``. More bins estimate lambda from the
+        summary more precisely, at the cost of memory and estimation time.
+
+    copy : bool, optional (default=True)
+        Whether ``transform`` and ``inverse_transform`` should operate on a
+        copy of the input frame. If False, the transformed columns are
+        written back into the input frame itself (which is returned when
+        ``as_df`` is True), so the rest of the frame is not copied.
+
     Attributes
     ----------
     lambda_ : list
@@ -415,11 +821,23 @@ class YeoJohnsonTransformer(_BaseSkewnessTransformer):
         The list of column names on which the transformer was fit. This
         is used to validate the presence of the features in the test set
         during the ``transform`` stage.
+
+    bin_centers_ : list
+        The sorted bin centers of the weighted histogram summarizing each
+        feature, used to update the lambdas in ``partial_fit``.
+
+    bin_weights_ : list
+        The weights (counts) of the bins in ``bin_centers_``.
+
+    n_samples_seen_ : int
+        The number of samples the transformer has been fit on.
     """
-    def __init__(self, cols=None, n_jobs=1, as_df=True, brack=(-2, 2)):
+    def __init__(self, cols=None, n_jobs=1, as_df=True, brack=(-2, 2),
+                 chunksize=None, max_bins=1000, copy=True):
 
         super(YeoJohnsonTransformer, self).__init__(
-            cols=cols, as_df=as_df, n_jobs=n_jobs)
+            cols=cols, as_df=as_df, n_jobs=n_jobs, chunksize=chunksize,
+            max_bins=max_bins, copy=copy)
 
         self.brack = brack
 
@@ -439,5 +857,29 @@ class YeoJohnsonTransformer(_BaseSkewnessTransformer):
         brack = self.brack
         return self._fit(X, estimation_function=_YJEstimator(brack))
 
-    def _transform_vector(self, y, lam):
-        return _yj_transform_y(y, lam)
+    def partial_fit(self, X, y=None):
+        """Incrementally fit the transformer on a chunk of data.
+
+        Each feature is summarized as a weighted histogram of at most
+        ``max_bins`` bins. The new chunk is merged into the summaries, and
+        each lambda is re-estimated from its summary, starting from the
+        previous estimate. The cost of each call is proportional to the size
+        of the chunk, rather than to all of the data seen so far.
+
+        Parameters
+        ----------
+        X : pd.DataFrame, shape=(n_samples, n_features)
+            The chunk of data to fit. If the transformer has already been
+            fit, it must contain the ``fit_cols_``.
+
+        y : array-like or None, shape=(n_samples,), optional (default=None)
+            Pass-through for ``sklearn.pipeline.Pipeline``.
+        """
+        brack = self.brack
+        return self._partial_fit(X, estimation_function=_YJEstimator(brack))
+
+    def _transform_block(self, Y, lambdas, out):
+        return _yj_transform_block(Y, lambdas, out)
+
+    def _inverse_transform_block(self, Y, lambdas, out):
+        return _yj_inverse_block(Y, lambdas, out)
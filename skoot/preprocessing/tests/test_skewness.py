@@ -10,8 +10,14 @@ import numpy as np
 import pandas as pd
 
 from skoot.preprocessing import BoxCoxTransformer, YeoJohnsonTransformer
-from skoot.preprocessing.skewness import _yj_transform_y
+from skoot.preprocessing.skewness import (_yj_transform_y,
+                                          _yj_transform_block,
+                                          _yj_inverse_block,
+                                          _bc_transform_block,
+                                          _bc_inverse_block,
+                                          _merge_histogram)
 from skoot.datasets import load_iris_df
+from skoot.testing import assert_raises
 
 y = np.arange(5).astype(np.float) - 2.  # [-2, -1, 0, 1, 2]
 X = load_iris_df()
@@ -89,3 +95,118 @@ def test_yj_fit_transform():
     x *= signs
 
     YeoJohnsonTransformer().fit(x)
+
+
+def test_parallel_fit_matches_serial():
+    # wide enough to be estimated in worker processes
+    m, n = 1000, 8
+    random_state = check_random_state(42)
+    x = random_state.rand(m, n)
+    signs = np.ones((m, n))
+    signs[random_state.rand(m, n) < 0.5] = -1
+
+    for est, data in ((BoxCoxTransformer, x),
+                      (YeoJohnsonTransformer, x * signs)):
+        frame = pd.DataFrame.from_records(data)
+        serial = est().fit(frame)
+        parallel = est(n_jobs=2).fit(frame)
+        assert_array_almost_equal(serial.lambda_, parallel.lambda_)
+
+
+def test_yj_transform_block():
+    # the vectorized kernel should match the single-vector transformation
+    # for each of the lambda cases
+    lambdas = np.array([0., 2., 0.5, 1.5, -1.])
+    Y = np.tile(y, (lambdas.shape[0], 1)).T  # one column per lambda
+
+    res = _yj_transform_block(Y, lambdas, out=np.empty_like(Y))
+    for j, lam in enumerate(lambdas):
+        assert_array_almost_equal(res[:, j],
+                                  _yj_transform_y(np.array(y), lam))
+
+
+def test_inverse_transform():
+    cols = X.columns[:2]
+
+    for est in (BoxCoxTransformer, YeoJohnsonTransformer):
+        trans = est(cols=cols).fit(X)
+        X_trans = trans.transform(X)
+
+        # chunking should not change the output
+        chunked = est(cols=cols, chunksize=7).fit(X)
+        assert_array_almost_equal(X_trans.values,
+                                  chunked.transform(X).values)
+
+        # round trip back to the original scale
+        inverse = chunked.inverse_transform(X_trans)
+        assert isinstance(inverse, pd.DataFrame)
+        assert_array_almost_equal(X.values, inverse.values)
+
+        # chunksize must be positive
+        assert_raises(ValueError,
+                      est(cols=cols, chunksize=0).fit(X).transform, X)
+
+        # without copying, the input frame is transformed in place
+        in_place = est(cols=cols, copy=False).fit(X)
+        X_copy = X.copy()
+        assert in_place.transform(X_copy) is X_copy
+        assert_array_almost_equal(X_copy.values, X_trans.values)
+        assert in_place.inverse_transform(X_copy) is X_copy
+        assert_array_almost_equal(X_copy.values, X.values)
+
+
+def test_inverse_small_lambdas():
+    # the power treatment must not lose precision as lambda approaches 0,
+    # where it converges to the log treatment
+    rs = check_random_state(42)
+    Y = rs.uniform(0.5, 50., (1000, 3))
+    lambdas = np.array([1e-10, 3e-11, 0.5])
+
+    bc = _bc_transform_block(Y, lambdas, 1e-12, out=np.empty_like(Y))
+    assert_array_almost_equal(bc[:, :2], np.log(Y[:, :2]), decimal=8)
+    assert_array_almost_equal(
+        _bc_inverse_block(bc, lambdas, out=np.empty_like(Y)), Y, decimal=10)
+
+    Y[::2] *= -1.  # YJ handles both signs
+    lambdas = np.array([1e-10, 2. - 1e-10, 1.3])
+    yj = _yj_transform_block(Y, lambdas, out=np.empty_like(Y))
+    assert_array_almost_equal(yj[Y[:, 0] >= 0, 0],
+                              np.log1p(Y[Y[:, 0] >= 0, 0]), decimal=8)
+    assert_array_almost_equal(
+        _yj_inverse_block(yj, lambdas, out=np.empty_like(Y)), Y, decimal=10)
+
+
+def test_merge_histogram():
+    v = check_random_state(42).randn(10000)
+
+    centers, weights = _merge_histogram(None, None, v[:5000], 100)
+    centers, weights = _merge_histogram(centers, weights, v[5000:], 100)
+
+    # the summary is bounded, sorted and preserves the weight and mean
+    assert centers.shape[0] <= 100
+    assert (np.diff(centers) > 0).all()
+    assert weights.sum() == v.shape[0]
+    assert_array_almost_equal(np.average(centers, weights=weights), v.mean())
+
+
+def test_partial_fit():
+    cols = X.columns[:2]
+
+    for est in (BoxCoxTransformer, YeoJohnsonTransformer):
+        full = est(cols=cols).fit(X)
+
+        # iris has fewer unique values than max_bins, so the summaries are
+        # exact, and should produce the same lambdas as the full fit
+        inc = est(cols=cols)
+        for chunk in (X.iloc[:50], X.iloc[50:100], X.iloc[100:]):
+            inc.partial_fit(chunk)
+
+        assert inc.n_samples_seen_ == X.shape[0]
+        assert_array_almost_equal(full.lambda_, inc.lambda_, decimal=4)
+
+        # a fit transformer can be warm-started with new data
+        warm = est(cols=cols).fit(X.iloc[:100]).partial_fit(X.iloc[100:])
+        assert_array_almost_equal(full.lambda_, warm.lambda_, decimal=4)
+
+        # new chunks must contain the fit columns
+        assert_raises(ValueError, warm.partial_fit, X[X.columns[2:]])
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# Author: Taylor Smith <taylor.smith@alkaline-ml.com>
+#
+# Helpers for column-wise parallelism over a single numeric block.
+
+from __future__ import absolute_import
+
+from sklearn.externals.joblib import dump, load
+from contextlib import contextmanager
+
+import tempfile
+import shutil
+import os
+
+__all__ = [
+    'choose_backend',
+    'shared_memmap'
+]
+
+# Above this many rows, per-column work is dominated by numpy kernels that
+# release the GIL, so threads scale without any process startup cost.
+_THREADING_MIN_ROWS = 100000
+
+# With fewer columns than this, there's not enough work to amortize
+# spinning up worker processes.
+_PROCESS_MIN_COLS = 8
+
+
+def choose_backend(n_jobs, n_samples, n_features):
+    """Choose a joblib backend for column-wise parallel work.
+
+    Tall blocks are handled with threads, since the numpy kernels that
+    dominate the per-column work release the GIL. Short, wide blocks spend
+    most of their time in Python-level loops (i.e., optimizers), and are
+    handed to worker processes instead.
+
+    Parameters
+    ----------
+    n_jobs : int
+        The number of jobs requested by the caller.
+
+    n_samples : int
+        The number of rows in the block.
+
+    n_features : int
+        The number of columns in the block (i.e., the number of tasks).
+
+    Returns
+    -------
+    backend : str or unicode
+        Either 'threading' or 'multiprocessing'.
+    """
+    if n_jobs == 1 or n_samples >= _THREADING_MIN_ROWS or \
+            n_features < _PROCESS_MIN_COLS:
+        return 'threading'
+    return 'multiprocessing'
+
+
+@contextmanager
+def shared_memmap(X, backend):
+    """Share a numeric block with parallel workers.
+
+    For the 'multiprocessing' backend, ``X`` is dumped to a temporary file
+    exactly once and re-opened as a read-only memory map. Joblib pickles
+    memory maps by reference, so workers that receive the block (plus a
+    column index) never copy the data through a pipe. For any other backend
+    the block is already shared, and is yielded as-is.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape=(n_samples, n_features)
+        The block to share.
+
+    backend : str or unicode
+        The joblib backend that will consume the block.
+    """
+    if backend != 'multiprocessing':
+        yield X
+        return
+
+    folder = tempfile.mkdtemp(prefix='skoot_')
+    try:
+        filename = os.path.join(folder, 'block.mmap')
+        dump(X, filename)
+        yield load(filename, mmap_mode='r')
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
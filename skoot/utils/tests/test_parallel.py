@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+from numpy.testing import assert_array_equal
+import numpy as np
+
+from skoot.utils._parallel import choose_backend, shared_memmap
+
+
+def test_choose_backend():
+    # serial work never needs processes
+    assert choose_backend(1, 100, 100) == 'threading'
+
+    # tall blocks use threads, short & wide blocks use processes
+    assert choose_backend(4, 1000000, 100) == 'threading'
+    assert choose_backend(4, 1000, 100) == 'multiprocessing'
+
+    # too few columns to amortize process startup
+    assert choose_backend(4, 1000, 2) == 'threading'
+
+
+def test_shared_memmap():
+    X = np.random.rand(50, 4)
+
+    # threads just share the block itself
+    with shared_memmap(X, 'threading') as shared:
+        assert shared is X
+
+    # processes get a read-only memory map of the same data
+    with shared_memmap(X, 'multiprocessing') as shared:
+        assert isinstance(shared, np.memmap)
+        assert_array_equal(shared, X)
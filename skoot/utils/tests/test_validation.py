@@ -73,6 +73,16 @@ def test_check_dataframe_no_cols():
     assert X_copy.columns.tolist() == cols
 
 
+# test check dataframe without copying
+def test_check_dataframe_no_copy():
+    X_same, cols_copy = check_dataframe(X, cols=cols[:2], copy=False)
+    assert X_same is X
+    assert cols_copy == cols[:2]
+
+    X_copy, _ = check_dataframe(X, cols=cols[:2])
+    assert X_copy is not X
+
+
 # test valid check dataframe with subset of cols provided
 def test_check_dataframe_some_cols():
     # a check with all columns present
@@ -6,7 +6,7 @@ from __future__ import absolute_import
 
 import pandas as pd
 import numpy as np
-import copy
+from copy import deepcopy
 
 from .iterables import is_iterable
 
@@ -18,7 +18,8 @@ __all__ = [
 ]
 
 
-def check_dataframe(X, cols=None, assert_all_finite=False, column_diff=False):
+def check_dataframe(X, cols=None, assert_all_finite=False, column_diff=False,
+                    copy=True):
     """Check an input dataframe.
 
     Determine whether an input frame is a Pandas dataframe or whether it can
@@ -50,10 +51,15 @@ def check_dataframe(X, cols=None, assert_all_finite=False, column_diff=False):
         in ``cols``. This is returned as the third element in the output if
         ``column_diff`` is True.
 
+    copy : bool, optional (default=True)
+        Whether to return a copy of ``X``. Callers that never modify the
+        frame can pass False to avoid copying it.
+
     Returns
     -------
     X_copy : pd.DataFrame
-        A copy of the ``X`` dataframe.
+        A copy of the ``X`` dataframe (or ``X`` itself if ``copy`` is
+        False and ``X`` is a DataFrame).
 
     cols : list
         The list of columns on which to apply a function to this dataframe.
@@ -81,7 +87,7 @@ def check_dataframe(X, cols=None, assert_all_finite=False, column_diff=False):
     present_columns = set(X.columns)
     if cols is not None:
         # ensure iterable, or copy if not
-        cols = copy.deepcopy(cols) if is_iterable(cols) else [cols]
+        cols = deepcopy(cols) if is_iterable(cols) else [cols]
 
         # better to use "any" since it will short circuit!
         if any(c not in present_columns for c in cols):
@@ -104,7 +110,7 @@ def check_dataframe(X, cols=None, assert_all_finite=False, column_diff=False):
                          'to be finite')
 
     # get the copy of X to return
-    X_copy = X.copy()
+    X_copy = X.copy() if copy else X
 
     # if column diff is defined, we need to get it...
     if column_diff: